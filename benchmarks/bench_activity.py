@@ -0,0 +1,89 @@
+# benchmarks/bench_activity.py
+"""
+What sleeping idle entities saves.
+
+For each size a scenario battle (game/core/scenarios.py) is stepped twice
+from the same start:
+
+- sleep:  the World's activity system as shipped,
+- awake:  `world.activity.enabled = False`, so every troop is updated
+          every tick (towers still skip their cooldowns).
+
+The two runs play out differently (an awake troop keeps moving while its
+cooldown runs), so the report gives each run's mean `World.step` time
+together with the mean number of awake / asleep troops and towers per
+tick from `world.activity.counts`. `--trace FILE` writes the sleep run's
+per-tick counts as CSV.
+
+Run from the repository root:
+    python -m benchmarks.bench_activity --sizes 200 1000 --ticks 240
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+from game.core.scenarios import LAYOUTS, Scenario, build_world
+from game.core.world import FIXED_DT
+
+COLUMNS = ("tick", "towers_awake", "towers_asleep", "troops_awake", "troops_asleep")
+
+
+def _run(units: int, layout: str, ticks: int, sleep: bool) -> Tuple[float, List[Tuple[int, ...]]]:
+    """Mean step seconds and per-tick activity counts."""
+    world = build_world(Scenario(units=units, layout=layout, seed=3))
+    world.activity.enabled = sleep
+    rows: List[Tuple[int, ...]] = []
+    samples: List[float] = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        world.step(FIXED_DT)
+        samples.append(time.perf_counter() - start)
+        c = world.activity.counts
+        rows.append((world._tick, c.towers_awake, c.towers_asleep, c.troops_awake, c.troops_asleep))
+    return statistics.fmean(samples), rows
+
+
+def _mean(rows: List[Tuple[int, ...]], column: str) -> float:
+    i = COLUMNS.index(column)
+    return statistics.fmean(row[i] for row in rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the effect of sleeping idle entities.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000])
+    parser.add_argument("--ticks", type=int, default=240)
+    parser.add_argument("--layout", choices=sorted(LAYOUTS), default="clustered")
+    parser.add_argument("--trace", default=None, help="CSV of per-tick counts (last size, sleep run)")
+    args = parser.parse_args()
+
+    print(
+        f"{'units':>6} {'sleep ms':>9} {'awake ms':>9} {'speedup':>8} "
+        f"{'troops awake':>13} {'asleep':>7} {'towers awake':>13} {'asleep':>7}"
+    )
+    trace: Optional[List[Tuple[int, ...]]] = None
+    for units in args.sizes:
+        sleep_s, rows = _run(units, args.layout, args.ticks, sleep=True)
+        awake_s, _ = _run(units, args.layout, args.ticks, sleep=False)
+        trace = rows
+        print(
+            f"{units:>6} {sleep_s * 1e3:>9.2f} {awake_s * 1e3:>9.2f} {awake_s / sleep_s:>7.2f}x "
+            f"{_mean(rows, 'troops_awake'):>13.1f} {_mean(rows, 'troops_asleep'):>7.1f} "
+            f"{_mean(rows, 'towers_awake'):>13.2f} {_mean(rows, 'towers_asleep'):>7.2f}",
+            flush=True,
+        )
+
+    if args.trace and trace is not None:
+        with open(args.trace, "w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(COLUMNS)
+            writer.writerows(trace)
+        print(f"wrote {len(trace)} ticks to {args.trace}")
+
+
+if __name__ == "__main__":
+    main()
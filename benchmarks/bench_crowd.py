@@ -0,0 +1,129 @@
+# benchmarks/bench_crowd.py
+"""
+Crowd separation cost vs. unit count.
+
+For each size a scenario world (game/core/scenarios.py) is stepped once so
+units are in motion, then the separation pass is timed on its own:
+
+- grid:  `separate()` with the per-tick spatial hash (what World uses),
+- naive: the same push rules over every pair, for reference.
+
+The grid pass costs O(units x neighbours): the "pairs" column counts the
+candidate pairs it visited and "ns/pair" should stay flat across sizes.
+The arena does not grow with the unit count, so neighbours per unit (and
+with them the grid's us/unit) rise with density, while the naive pass
+always touches every pair. `--layout clustered` packs each lane's units
+into one blob, the worst case for the grid.
+
+Run from the repository root:
+    python -m benchmarks.bench_crowd --sizes 500 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from game.core.scenarios import LAYOUTS, Scenario, build_world
+from game.core.world import FIXED_DT, HUD_HEIGHT, World
+from game.systems import spatial
+from game.systems.spatial import SpatialHash
+
+
+def _naive_separate(troops, width: float, height: float) -> None:
+    """All-pairs version of spatial.separate (same rules, no grid)."""
+    n = len(troops)
+    xs = [t.x for t in troops]
+    ys = [t.y for t in troops]
+    radii = [t.radius for t in troops]
+    flying = [t.is_flying for t in troops]
+    push_x = [0.0] * n
+    push_y = [0.0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            if flying[i] != flying[j]:
+                continue
+            dx = xs[j] - xs[i]
+            dy = ys[j] - ys[i]
+            spacing = radii[i] + radii[j]
+            personal = spacing * spatial.SEPARATION_RANGE
+            dist_sq = dx * dx + dy * dy
+            if dist_sq >= personal * personal:
+                continue
+            dist = dist_sq ** 0.5
+            ux, uy = (dx / dist, dy / dist) if dist > 1e-6 else (1.0, 0.0)
+            push = spatial.SEPARATION_PUSH * (1.0 - dist / personal)
+            if dist < spacing:
+                push += spatial.COLLISION_STIFFNESS * (spacing - dist)
+            push_x[i] -= ux * push
+            push_y[i] -= uy * push
+            push_x[j] += ux * push
+            push_y[j] += uy * push
+    for i, troop in enumerate(troops):
+        troop.x = min(max(xs[i] + push_x[i], 0.0), width)
+        troop.y = min(max(ys[i] + push_y[i], 0.0), height)
+
+
+def _time(fn: Callable[[], None], repeat: int) -> float:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _positions(world: World):
+    return [(t.x, t.y) for t in world.troops]
+
+
+def _restore(world: World, positions) -> None:
+    for troop, (x, y) in zip(world.troops, positions):
+        troop.x, troop.y = x, y
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure crowd separation scaling.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--layout", choices=LAYOUTS, default="spread")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--no-naive", action="store_true", help="skip the all-pairs reference")
+    args = parser.parse_args()
+
+    print(
+        f"{'units':>6} {'pairs':>8} {'grid ms':>9} {'us/unit':>8} {'ns/pair':>8} "
+        f"{'naive ms':>9} {'us/unit':>8} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        world = build_world(Scenario(units=size, layout=args.layout))
+        world.step(FIXED_DT)
+        troops = world.troops
+        width, height = world.screen_width, world.screen_height - HUD_HEIGHT
+        start = _positions(world)
+        grid: SpatialHash[int] = world._crowd_grid
+
+        def run_grid() -> None:
+            _restore(world, start)
+            spatial.separate(troops, grid, width, height)
+
+        grid_s = _time(run_grid, args.repeat)
+        pairs = sum(1 for _ in grid.candidate_pairs())
+        line = (
+            f"{size:>6} {pairs:>8} {grid_s * 1e3:>9.2f} {grid_s * 1e6 / size:>8.2f} "
+            f"{grid_s * 1e9 / max(1, pairs):>8.0f}"
+        )
+
+        if not args.no_naive:
+            def run_naive() -> None:
+                _restore(world, start)
+                _naive_separate(troops, width, height)
+
+            naive_s = _time(run_naive, max(1, args.repeat // 3))
+            line += f" {naive_s * 1e3:>9.2f} {naive_s * 1e6 / size:>8.2f} {naive_s / grid_s:>7.1f}x"
+        print(line, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_env.py
+"""
+Training throughput of the Gym-style environment (game/env.py).
+
+Steps `--envs` environments with random affordable actions for
+`--seconds` per configuration and reports environment steps per second
+(each step is `--frame-skip` simulation ticks) and simulated ticks per
+second:
+
+- single:     one Env stepped in a loop,
+- vector:     VectorEnv in this process,
+- workers=N:  VectorEnv split over N subprocesses, for each `--workers`.
+
+Subprocess workers only pay off with spare cores; the report prints how
+many this machine has.
+
+Run from the repository root:
+    python -m benchmarks.bench_env --envs 16 --workers 2 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from game.env import NUM_ACTIONS, Env, VectorEnv
+
+
+def _bench_single(seconds: float, frame_skip: int) -> float:
+    env = Env(seed=0, frame_skip=frame_skip)
+    env.reset()
+    rng = np.random.default_rng(0)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        action = int(rng.choice(np.flatnonzero(env.action_mask())))
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+        steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def _bench_vector(envs: int, workers: int, seconds: float, frame_skip: int) -> float:
+    rng = np.random.default_rng(0)
+    with VectorEnv(envs, workers=workers, frame_skip=frame_skip) as vec:
+        vec.reset()
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            vec.step(rng.integers(0, NUM_ACTIONS, size=envs))
+            steps += envs
+        return steps / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure environment steps per second.")
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="*", default=[2])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--frame-skip", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}, envs: {args.envs}, frame skip: {args.frame_skip}")
+    print(f"{'config':>12} {'steps/s':>10} {'ticks/s':>10}")
+    runs = [("single", lambda: _bench_single(args.seconds, args.frame_skip))]
+    runs.append(("vector", lambda: _bench_vector(args.envs, 0, args.seconds, args.frame_skip)))
+    for workers in args.workers:
+        runs.append((
+            f"workers={workers}",
+            lambda w=workers: _bench_vector(args.envs, w, args.seconds, args.frame_skip),
+        ))
+    for label, run in runs:
+        rate = run()
+        print(f"{label:>12} {rate:>10.0f} {rate * args.frame_skip:>10.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/bench_projectiles.py
+"""
+Projectile pool cost: simulation pass and batched drawing.
+
+Two measurements:
+- volley: a Peach-heavy scenario battle (game/core/scenarios.py) is
+  stepped and fully rendered every tick with the dummy video driver. It
+  reports shots in flight, and per-tick percentiles for
+  `ProjectilePool.update`, `draw_projectiles` and the whole step + frame.
+  The whole frame is compared with the 16.7 ms budget of 60 FPS.
+- synthetic: the pool is filled with N shots flying at live targets, then
+  only the pool update and the batched draw are timed, to show how they
+  scale with the number of shots.
+
+Run from the repository root:
+    python -m benchmarks.bench_projectiles --units 100 --shots 250 1000 4000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+from typing import Callable, List
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from game.core.scenarios import Scenario, build_world
+from game.core.world import FIXED_DT, HUD_HEIGHT
+
+FRAME_BUDGET_MS = 1000.0 / 60.0
+SCREEN_WIDTH, SCREEN_HEIGHT = 450, 750
+
+
+def _pct(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _timed(fn: Callable, samples: List[float]) -> Callable:
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000.0)
+        return result
+
+    return wrapper
+
+
+def _summary(label: str, samples: List[float]) -> str:
+    return (
+        f"  {label:<18} p50 {_pct(samples, 50):6.2f} ms  p95 {_pct(samples, 95):6.2f} ms  "
+        f"p99 {_pct(samples, 99):6.2f} ms  max {max(samples):6.2f} ms"
+    )
+
+
+def run_volley(units: int, ticks: int) -> None:
+    import pygame
+
+    from game.ui import draw
+    from game.ui.headless import _init_headless
+
+    font_large, font_ui = _init_headless()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    world = build_world(Scenario(units=units, mix={"peach": 3.0, "mario": 1.0}, seed=7))
+
+    update_ms: List[float] = []
+    draw_ms: List[float] = []
+    frame_ms: List[float] = []
+    in_flight: List[int] = []
+    world.projectiles.update = _timed(world.projectiles.update, update_ms)
+    draw.draw_projectiles = _timed(draw.draw_projectiles, draw_ms)
+
+    for _ in range(ticks):
+        start = time.perf_counter()
+        world.step(FIXED_DT)
+        draw.draw_frame(
+            screen, world, draw.DEFAULT_CARD_ORDER, 0,
+            SCREEN_WIDTH, SCREEN_HEIGHT, HUD_HEIGHT, font_large, font_ui,
+        )
+        frame_ms.append((time.perf_counter() - start) * 1000.0)
+        in_flight.append(world.projectiles.count)
+
+    over = sum(1 for ms in frame_ms if ms > FRAME_BUDGET_MS)
+    print(
+        f"volley: {units} units, {ticks} ticks, shots in flight avg {statistics.fmean(in_flight):.0f} "
+        f"max {max(in_flight)}, {world.projectiles.fired} fired"
+    )
+    print(_summary("pool update", update_ms))
+    print(_summary("draw_projectiles", draw_ms))
+    print(_summary("step + frame", frame_ms))
+    print(f"  frames over the {FRAME_BUDGET_MS:.1f} ms budget: {over}/{ticks}")
+
+
+def run_synthetic(shots: List[int], repeat: int) -> None:
+    import pygame
+
+    from game.ui.draw import draw_projectiles
+    from game.ui.headless import _init_headless
+
+    _init_headless()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(0)
+    print(f"{'shots':>7} {'update us':>10} {'ns/shot':>8} {'draw us':>9} {'ns/shot':>8}")
+    for n in shots:
+        world = build_world(Scenario(units=200, seed=1))
+        pool = world.projectiles
+        sources = world.player_troops
+        targets = world.ai_troops + world.ai_towers
+        entities = world.towers + world.troops
+        update_s: List[float] = []
+        draw_s: List[float] = []
+        for _ in range(repeat):
+            pool.clear()
+            for _ in range(n):
+                # Slow shots so none land during the measurement.
+                pool.fire(rng.choice(sources), rng.choice(targets), 1.0, 0.01, homing=rng.random() < 0.5)
+            pool.update(entities)  # flush the queue outside the timing
+            start = time.perf_counter()
+            pool.update(entities)
+            update_s.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            draw_projectiles(screen, pool)
+            draw_s.append(time.perf_counter() - start)
+        upd, drw = statistics.median(update_s), statistics.median(draw_s)
+        print(f"{n:>7} {upd * 1e6:>10.1f} {upd * 1e9 / n:>8.0f} {drw * 1e6:>9.1f} {drw * 1e9 / n:>8.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure projectile simulation and drawing cost.")
+    parser.add_argument("--units", type=int, default=100, help="units in the volley battle")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--shots", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    run_volley(args.units, args.ticks)
+    run_synthetic(args.shots, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_savestate.py
+"""
+Save-state benchmark: savestate.dumps/loads vs. pickling the World.
+
+A mid-match World is built by running an AI-vs-AI match for `--ticks`
+ticks with coins topped up every half second (so the arena is crowded),
+then each method round-trips it `--repeat` times.
+
+Run from the repository root:
+    python -m benchmarks.bench_savestate --ticks 300 --repeat 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import time
+from typing import Callable
+
+from game.ai.policy import choose_ai_action
+from game.core.savestate import dumps, loads
+from game.core.world import COINS_MAX, FIXED_DT, World
+
+
+def _busy_world(ticks: int) -> World:
+    world = World(450, 750)
+    for tick in range(ticks):
+        if tick % 30 == 0:
+            world.player_coins = world.ai_coins = COINS_MAX
+            for perspective, apply in (
+                ("player", world.apply_player_action),
+                ("ai", world.apply_ai_action),
+            ):
+                action = choose_ai_action(world.get_public_state(perspective))
+                if action is not None:
+                    apply(action)
+        world.step(FIXED_DT)
+        if world.game_over:
+            break
+    # Picklable baseline: drop the policy callable reference.
+    world.ai_policy = None
+    return world
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare save-state encodings.")
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    world = _busy_world(args.ticks)
+    blob = dumps(world)
+    pickled = pickle.dumps(world, protocol=pickle.HIGHEST_PROTOCOL)
+    print(
+        f"tick {world._tick}: {len(world.troops)} troops, {len(world.towers)} towers\n"
+        f"{'format':<10}{'bytes':>8}{'save us':>10}{'load us':>10}"
+    )
+    print(
+        f"{'savestate':<10}{len(blob):>8}"
+        f"{_time(lambda: dumps(world), args.repeat):>10.1f}"
+        f"{_time(lambda: loads(blob), args.repeat):>10.1f}"
+    )
+    print(
+        f"{'pickle':<10}{len(pickled):>8}"
+        f"{_time(lambda: pickle.dumps(world, protocol=pickle.HIGHEST_PROTOCOL), args.repeat):>10.1f}"
+        f"{_time(lambda: pickle.loads(pickled), args.repeat):>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
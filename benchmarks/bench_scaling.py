@@ -0,0 +1,116 @@
+# benchmarks/bench_scaling.py
+"""
+Simulation throughput vs. unit count.
+
+For every size, a fresh scenario world (game/core/scenarios.py) is stepped
+with the fixed timestep. Each size runs for `--ticks` ticks or until
+`--max-seconds` have passed (at least `--min-ticks`), and reports:
+
+- ticks per second,
+- per-tick latency percentiles (p50 / p95 / p99, milliseconds),
+- peak traced Python memory while building the world and running
+  `--mem-ticks` ticks (tracemalloc, measured in a separate pass so it does
+  not slow the timing pass).
+
+Results go to stdout as a table and to `--out` as JSON.
+
+Run from the repository root:
+    python -m benchmarks.bench_scaling --sizes 10 100 1000 5000 --layout clustered
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from game.core.scenarios import LAYOUTS, Scenario, build_world
+from game.core.world import FIXED_DT
+
+DEFAULT_SIZES = (10, 50, 100, 500, 1000, 2000, 5000)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(scenario: Scenario, ticks: int, min_ticks: int, max_seconds: float, mem_ticks: int) -> Dict:
+    world = build_world(scenario)
+    latencies: List[float] = []
+    clock = time.perf_counter
+    deadline = clock() + max_seconds
+    for i in range(ticks):
+        start = clock()
+        world.step(FIXED_DT)
+        latencies.append(clock() - start)
+        if i + 1 >= min_ticks and clock() > deadline:
+            break
+    latencies.sort()
+    total = sum(latencies)
+
+    tracemalloc.start()
+    mem_world = build_world(scenario)
+    for _ in range(mem_ticks):
+        mem_world.step(FIXED_DT)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "units": scenario.units,
+        "layout": scenario.layout,
+        "ticks": len(latencies),
+        "ticks_per_second": len(latencies) / total if total > 0 else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000.0,
+        "p95_ms": _percentile(latencies, 95) * 1000.0,
+        "p99_ms": _percentile(latencies, 99) * 1000.0,
+        "mean_ms": statistics.fmean(latencies) * 1000.0,
+        "peak_mem_mb": peak / (1024 * 1024),
+        "alive_at_end": len(world.troops),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure World.step scaling with unit count.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--layout", choices=LAYOUTS, default="spread")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--min-ticks", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="time budget per size")
+    parser.add_argument("--mem-ticks", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=Path("bench_scaling.json"))
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'units':>6} {'ticks':>6} {'ticks/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak MB':>8}")
+    for size in args.sizes:
+        scenario = Scenario(units=size, layout=args.layout, seed=args.seed)
+        r = measure(scenario, args.ticks, args.min_ticks, args.max_seconds, args.mem_ticks)
+        results.append(r)
+        print(
+            f"{r['units']:>6} {r['ticks']:>6} {r['ticks_per_second']:>9.1f} {r['p50_ms']:>8.2f} "
+            f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['peak_mem_mb']:>8.2f}",
+            flush=True,
+        )
+
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "layout": args.layout,
+        "seed": args.seed,
+        "results": results,
+    }
+    args.out.write_text(json.dumps(payload, indent=2) + "\n")
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_spectate.py
+"""
+Spectator bandwidth: bytes per second per spectator.
+
+Two AI-vs-AI matches are published at `--rate` snapshots per second:
+- typical: both sides play on normal coin income,
+- peak: coins are topped up every half second, crowding the arena.
+
+Each spectator decodes every snapshot and acks it immediately, so after
+the first keyframe it receives deltas plus a keyframe every 2 s. The
+report shows average and worst one-second bandwidth, the troop counts the
+match went through, and how many encodes were needed for `--spectators`
+viewers.
+
+Run from the repository root:
+    python -m benchmarks.bench_spectate --spectators 100
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import deque
+
+from game.ai.policy import choose_ai_action
+from game.core.world import COINS_MAX, FIXED_DT, TICK_RATE, World
+from game.net.spectate import SnapshotDecoder, SpectatorPublisher, capture
+
+
+def _run(label: str, peak: bool, seconds: float, rate: int, spectators: int) -> None:
+    world = World(450, 750)
+    publisher = SpectatorPublisher(world)
+    decoders = []
+    for _ in range(spectators):
+        decoder = SnapshotDecoder(450, 750)
+        inbox: deque = deque()
+        sub = publisher.subscribe(inbox.append)
+        decoders.append((decoder, inbox, sub))
+
+    publish_every = max(1, TICK_RATE // rate)
+    per_second = []
+    window = 0
+    troop_counts = []
+    probe_sub = decoders[0][2]
+
+    for tick in range(int(seconds * TICK_RATE)):
+        if tick % 30 == 0:
+            if peak:
+                world.player_coins = world.ai_coins = COINS_MAX
+                action = choose_ai_action(world.get_public_state("ai"))
+                if action is not None:
+                    world.apply_ai_action(action)
+            action = choose_ai_action(world.get_public_state("player"))
+            if action is not None:
+                world.apply_player_action(action)
+        world.step(FIXED_DT)
+        if world.game_over:
+            break
+
+        if world._tick % publish_every == 0:
+            before = probe_sub.bytes_sent
+            publisher.publish()
+            window += probe_sub.bytes_sent - before
+            for decoder, inbox, sub in decoders:
+                while inbox:
+                    acked = decoder.apply(inbox.popleft())
+                    if acked is not None:
+                        publisher.ack(sub, acked)
+            assert decoders[0][0]._snapshots[world._tick] == capture(world)
+            troop_counts.append(len(world.troops))
+
+        if world._tick % TICK_RATE == 0:
+            per_second.append(window)
+            window = 0
+
+    elapsed = world._tick / TICK_RATE
+    total = probe_sub.bytes_sent
+    print(
+        f"{label:<8} {elapsed:5.0f}s  troops avg {sum(troop_counts) / len(troop_counts):4.1f} "
+        f"max {max(troop_counts):3d}  {total / elapsed:7.0f} B/s avg  "
+        f"{max(per_second):6d} B/s peak  "
+        f"{publisher.encodes} encodes for {spectators} spectators"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure spectator bandwidth.")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--rate", type=int, default=30, help="snapshots per second")
+    parser.add_argument("--spectators", type=int, default=10)
+    args = parser.parse_args()
+
+    _run("typical", False, args.seconds, args.rate, args.spectators)
+    _run("peak", True, args.seconds, args.rate, args.spectators)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# benchmarks/bench_splash.py
+"""
+Area damage cost: spatial radius queries vs. scanning every enemy.
+
+A dense siege: `--splashers` player Bowsers surround the AI king tower,
+each splashing on every hit, while `--enemies` AI Marios fill the
+arena. With `spread` they cover the AI half; with `blob` they crowd
+around the tower. Everything is effectively immortal so the fight stays
+dense for the whole run. Each configuration runs twice from the same
+start:
+
+- index: the World's per-team `UnitIndex` (what the game uses),
+- scan:  the same queries answered by a linear scan of the enemy team.
+
+Both runs must end in the same state (checked with `state_hash`). The
+report gives the mean time per tick spent answering splash queries and
+the mean `World._update_combat` time per tick. Troop targeting is still
+a full scan, so in dense fights it dominates the whole tick.
+
+Run from the repository root:
+    python -m benchmarks.bench_splash --splashers 100 --enemies 500 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from typing import List, Tuple
+
+from game.core.savestate import state_hash
+from game.core.world import HUD_HEIGHT, World
+from game.entities.troop import Troop
+from game.systems.aoe import troops_within
+from game.systems.spatial import UnitIndex
+
+IMMORTAL = 1e12
+
+
+class _TimedIndex(UnitIndex):
+    """UnitIndex that adds up the time spent answering queries."""
+
+    seconds = 0.0
+
+    def within(self, x: float, y: float, radius: float) -> List[Troop]:
+        start = time.perf_counter()
+        hits = self._query(x, y, radius)
+        _TimedIndex.seconds += time.perf_counter() - start
+        return hits
+
+    def _query(self, x: float, y: float, radius: float) -> List[Troop]:
+        return UnitIndex.within(self, x, y, radius)
+
+
+class _ScanIndex(_TimedIndex):
+    """Same interface, answered by scanning every troop (the old behaviour)."""
+
+    def _query(self, x: float, y: float, radius: float) -> List[Troop]:
+        return troops_within(self._troops, x, y, radius)
+
+
+def _build(splashers: int, enemies: int, layout: str, seed: int) -> World:
+    rng = random.Random(seed)
+    world = World(450, 750)
+    world.ai_policy = None
+    for tower in world.towers:
+        tower.max_hp = tower.hp = IMMORTAL
+    tx, ty = world.ai_king_tower.get_center()
+
+    for i in range(splashers):
+        angle = 2 * math.pi * i / splashers
+        ring = 60 + 8 * (i % 3)
+        troop = Troop(
+            x=tx + ring * math.cos(angle),
+            y=ty + ring * math.sin(angle),
+            team="player", lane_index=1, stats_idx=1, uid=world._new_uid(),
+        )
+        troop.max_hp = troop.hp = IMMORTAL
+        world.player_troops.append(troop)
+
+    river_y = (world.screen_height - HUD_HEIGHT) / 2
+    for _ in range(enemies):
+        if layout == "blob":
+            x, y = rng.gauss(tx, 60), rng.gauss(ty + 20, 60)
+        else:
+            x, y = rng.uniform(10, world.screen_width - 10), rng.uniform(10, river_y - 10)
+        troop = Troop(x=x, y=y, team="ai", lane_index=1, stats_idx=0, uid=world._new_uid())
+        troop.max_hp = troop.hp = IMMORTAL
+        world.ai_troops.append(troop)
+    return world
+
+
+def _run(world: World, ticks: int, index_cls) -> Tuple[float, float]:
+    """Mean (tick, query) seconds over `ticks` combat updates."""
+    template = world._unit_index["ai"]
+    world._unit_index = {
+        team: index_cls(template.grid.cell_size, template.slack) for team in ("player", "ai")
+    }
+    _TimedIndex.seconds = 0.0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        world._tick += 1
+        world._update_combat()
+    return (time.perf_counter() - start) / ticks, _TimedIndex.seconds / ticks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure splash damage query cost.")
+    parser.add_argument("--splashers", type=int, default=100)
+    parser.add_argument("--enemies", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'layout':<7} {'enemies':>7} {'splash index ms':>16} {'scan ms':>8} {'speedup':>8}"
+        f" {'tick index ms':>14} {'scan ms':>8}"
+    )
+    for layout in ("spread", "blob"):
+        for enemies in args.enemies:
+            indexed = _build(args.splashers, enemies, layout, args.seed)
+            scanned = _build(args.splashers, enemies, layout, args.seed)
+            index_tick, index_query = _run(indexed, args.ticks, _TimedIndex)
+            scan_tick, scan_query = _run(scanned, args.ticks, _ScanIndex)
+            assert state_hash(indexed) == state_hash(scanned), "index and scan runs diverged"
+            print(
+                f"{layout:<7} {enemies:>7} {index_query * 1e3:>16.2f} {scan_query * 1e3:>8.2f} "
+                f"{scan_query / index_query:>7.1f}x {index_tick * 1e3:>14.2f} {scan_tick * 1e3:>8.2f}",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
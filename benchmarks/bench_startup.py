@@ -0,0 +1,122 @@
+# benchmarks/bench_startup.py
+"""
+Startup benchmark: process start -> first World.step / first rendered frame.
+
+Each sample spawns a fresh interpreter (so nothing is warm in sys.modules)
+and measures wall-clock time from spawn until the child reports that the
+milestone was reached; interpreter teardown is not counted.
+
+Targets (median of the runs, on a typical dev laptop):
+- first World.step, simulation only:          <= 150 ms, and pygame must
+                                                 not be imported at all
+- first rendered frame (dummy video driver):  <= 500 ms
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+TARGET_FIRST_STEP_MS = 150.0
+TARGET_FIRST_FRAME_MS = 500.0
+
+BARE_SCRIPT = """
+print("READY", False, flush=True)
+"""
+
+FIRST_STEP_SCRIPT = """
+import sys
+from game.core.world import World, FIXED_DT
+world = World(450, 750)
+world.step(FIXED_DT)
+print("READY", "pygame" in sys.modules, flush=True)
+"""
+
+FIRST_FRAME_SCRIPT = """
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+from game.core.world import World, FIXED_DT
+from game.core.actions import PlayCardAction
+from game.ui.draw import DEFAULT_CARD_ORDER, draw_frame
+pygame.init()
+screen = pygame.display.set_mode((450, 750))
+font_large = pygame.font.SysFont("Arial bold", 24)
+font_ui = pygame.font.Font(None, 20)
+world = World(450, 750)
+world.apply_player_action(PlayCardAction("mario", 1))
+world.step(FIXED_DT)
+draw_frame(screen, world, DEFAULT_CARD_ORDER, 0, 450, 750, 100, font_large, font_ui)
+pygame.display.flip()
+print("READY", True, flush=True)
+"""
+
+
+def _time_child(script: str) -> Dict[str, object]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(REPO_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONWARNINGS"] = "ignore"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", script],
+        cwd=str(REPO_ROOT),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stdout.readline() if proc.stdout is not None else ""
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    _, stderr = proc.communicate()
+
+    if not line.startswith("READY"):
+        raise RuntimeError(f"startup probe failed:\n{stderr}")
+    return {"ms": elapsed_ms, "pygame_loaded": line.split()[1] == "True"}
+
+
+def _summarise(label: str, samples: List[float], target_ms: float) -> bool:
+    median = statistics.median(samples)
+    ok = median <= target_ms
+    print(
+        f"{label:<28} median {median:7.1f} ms   min {min(samples):7.1f} ms   "
+        f"max {max(samples):7.1f} ms   target {target_ms:.0f} ms   "
+        f"{'OK' if ok else 'OVER TARGET'}"
+    )
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start latency.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = [_time_child(BARE_SCRIPT)["ms"] for _ in range(args.runs)]
+    steps = [_time_child(FIRST_STEP_SCRIPT) for _ in range(args.runs)]
+    frames = [_time_child(FIRST_FRAME_SCRIPT) for _ in range(args.runs)]
+
+    print(f"{'bare interpreter':<28} median {statistics.median(baseline):7.1f} ms")
+    ok = _summarise("first World.step", [s["ms"] for s in steps], TARGET_FIRST_STEP_MS)
+    ok &= _summarise("first rendered frame", [f["ms"] for f in frames], TARGET_FIRST_FRAME_MS)
+
+    if any(s["pygame_loaded"] for s in steps):
+        print("FAIL: simulation-only startup imported pygame")
+        ok = False
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,443 @@
+# benchmarks/suite.py
+"""
+Micro-benchmarks for the simulation, AI and render hot paths.
+
+Every case times one call against a fixed fixture, so numbers from
+different branches can be compared directly:
+
+    sim.troop.locked       Troop.update keeping a locked target
+    sim.troop.reacquire    Troop.update searching every enemy for a target
+    sim.troop.yoshi        Troop.update on Yoshi's blocking-troop fallback
+    sim.troop.splash       Troop.update on Bowser hitting a tower plus splash
+    sim.tower.update       Tower.update scanning troops for a shot
+    sim.troop.bridge       Troop.update walking to a bridge via a flow field
+    sim.nav.build_field    building one tower's flow field from scratch
+    sim.update_combat      World._update_combat on a 60-unit battle
+    sim.public_state       World.get_public_state on the same battle
+    ai.choose_action       choose_ai_action with full coins
+    ai.evaluate_state      evaluate_state
+    render.generate_sprites
+    render.arena / entities / card_bar / coins_bar / game_over / frame
+                           each draw_* function (dummy video driver)
+
+Fixture targets have effectively infinite hp so repeated calls keep
+exercising the same branch. Each case is sampled `--repeat` times; a
+sample rebuilds the fixture, then times `number` calls (picked so a sample
+lasts ~20 ms; cases whose fixture evolves, like a whole combat tick, use
+a fixed count). The per-call median and minimum across samples are
+reported; comparisons use the minimum, which is the least disturbed by
+other load on the machine.
+
+    python -m benchmarks.suite                    # run and print
+    python -m benchmarks.suite --save             # store benchmarks/baseline.json (not committed)
+    python -m benchmarks.suite --compare          # flag slowdowns vs. the baseline
+    python -m benchmarks.suite -k sim.troop       # only matching cases
+
+`--compare` exits with status 1 when a case's minimum is more than
+`--threshold` (default 10 %) slower than the baseline, and lists cases
+the baseline has no entry for instead of skipping them silently.
+Baselines are only meaningful on the machine that produced them, so none
+is kept in the repository: run `--save` on a clean checkout on your
+machine, then `--compare` with your change applied.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from game.ai.heuristic import evaluate_state
+from game.ai.policy import choose_ai_action
+from game.core.scenarios import Scenario, build_world
+from game.core.world import COINS_MAX, World
+from game.entities.troop import Troop
+from game.systems.navigation import build_field
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SCREEN_WIDTH, SCREEN_HEIGHT, UI_HEIGHT = 450, 750, 100
+IMMORTAL = 1e12
+
+# setup() -> run; `run` is called repeatedly within one sample.
+Case = Callable[[], Callable[[], object]]
+CASES: Dict[str, Case] = {}
+# Calls per sample for cases whose fixture evolves from call to call, so
+# every sample covers the same stretch of the battle.
+FIXED_NUMBER: Dict[str, int] = {}
+
+
+def case(name: str, number: Optional[int] = None) -> Callable[[Case], Case]:
+    def register(fn: Case) -> Case:
+        CASES[name] = fn
+        if number is not None:
+            FIXED_NUMBER[name] = number
+        return fn
+
+    return register
+
+
+def _world() -> World:
+    world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+    world.ai_policy = None
+    return world
+
+
+def _troop(world: World, team: str, stats_idx: int, x: float, y: float, lane: int = 0) -> Troop:
+    troop = Troop(x=x, y=y, team=team, lane_index=lane, stats_idx=stats_idx, uid=world._new_uid())
+    troop.max_hp = troop.hp = IMMORTAL
+    return troop
+
+
+def _battle() -> World:
+    return build_world(Scenario(units=60, layout="clustered", seed=1))
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+@case("sim.troop.locked")
+def _troop_locked():
+    world = _world()
+    mario = _troop(world, "player", 0, 200, 400)
+    enemy = _troop(world, "ai", 0, 200, 380)
+    enemies = [enemy] + [_troop(world, "ai", 0, 60 + 12 * i, 150) for i in range(20)]
+    towers = world.ai_towers
+    mario.current_target = enemy
+
+    def run():
+        mario.cooling = False
+        mario.update(enemies, towers)
+
+    return run
+
+
+@case("sim.troop.reacquire")
+def _troop_reacquire():
+    world = _world()
+    mario = _troop(world, "player", 0, 200, 400)
+    enemies = [_troop(world, "ai", i % 4, 60 + 10 * (i % 30), 120 + 8 * (i // 30)) for i in range(60)]
+    enemies.append(_troop(world, "ai", 0, 200, 385))
+    towers = world.ai_towers
+
+    def run():
+        mario.current_target = None
+        mario.cooling = False
+        mario.update(enemies, towers)
+
+    return run
+
+
+@case("sim.troop.yoshi")
+def _troop_yoshi():
+    world = _world()
+    yoshi = _troop(world, "player", 3, 225, 420)
+    blockers = [_troop(world, "ai", 0, 215 + 5 * i, 395) for i in range(4)]
+    enemies = blockers + [_troop(world, "ai", 1, 60 + 12 * i, 200) for i in range(20)]
+    towers = world.ai_towers
+
+    def run():
+        yoshi.current_target = None
+        yoshi.cooling = False
+        yoshi.update(enemies, towers)
+
+    return run
+
+
+@case("sim.troop.splash")
+def _troop_splash():
+    world = _world()
+    tower = world.ai_towers[0]
+    tower.max_hp = tower.hp = IMMORTAL
+    tx, ty = tower.get_center()
+    bowser = _troop(world, "player", 1, tx - 20, ty + 30)
+    enemies = [_troop(world, "ai", 0, tx - 30 + 6 * i, ty + 10) for i in range(10)]
+    towers = world.ai_towers
+    bowser.current_target = tower
+
+    def run():
+        bowser.cooling = False
+        bowser.update(enemies, towers)
+
+    return run
+
+
+@case("sim.tower.update")
+def _tower_update():
+    world = _world()
+    tower = world.ai_towers[0]
+    tx, ty = tower.get_center()
+    troops = [_troop(world, "player", i % 4, tx - 100 + 10 * i, ty + 60 + 5 * (i % 3)) for i in range(20)]
+
+    def run():
+        tower.cooling = False
+        tower.update(troops)
+
+    return run
+
+
+@case("sim.troop.bridge")
+def _troop_bridge():
+    world = _world()
+    mario = _troop(world, "player", 0, 225, 420)
+    towers = world.ai_towers
+    navigation = world.navigation
+    navigation.field(towers[0].get_center())  # built outside the timing
+
+    def run():
+        mario.x, mario.y = 225.0, 420.0
+        mario.current_target = towers[0]
+        mario.update([], towers, navigation=navigation)
+
+    return run
+
+
+@case("sim.nav.build_field")
+def _nav_build_field():
+    world = _world()
+    layout = world.navigation.layout
+    goal = world.ai_towers[0].get_center()
+    return lambda: build_field(layout, -1, goal)
+
+
+@case("sim.update_combat", number=60)
+def _update_combat():
+    world = _battle()
+
+    def run():
+        # Advance the tick as World.step does, so cooldown wake-ups come due.
+        world._tick += 1
+        world._update_combat()
+
+    return run
+
+
+@case("sim.public_state")
+def _public_state():
+    world = _battle()
+    return lambda: world.get_public_state("ai")
+
+
+# ---------------------------------------------------------------------------
+# AI
+# ---------------------------------------------------------------------------
+
+def _ai_state():
+    world = _battle()
+    world.ai_coins = COINS_MAX
+    return world.get_public_state("ai")
+
+
+@case("ai.choose_action")
+def _choose_action():
+    state = _ai_state()
+    return lambda: choose_ai_action(state)
+
+
+@case("ai.evaluate_state")
+def _evaluate_state():
+    state = _ai_state()
+    return lambda: evaluate_state(state)
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def _render_fixture():
+    from game.ui.draw import DEFAULT_CARD_ORDER
+    from game.ui.headless import _init_headless
+    import pygame
+
+    font_large, font_ui = _init_headless()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    world = _battle()
+    world.step(1.0 / 60.0)
+    return screen, world, DEFAULT_CARD_ORDER, font_large, font_ui
+
+
+@case("render.generate_sprites")
+def _generate_sprites():
+    from game.entities.troop import generate_sprites
+
+    _render_fixture()
+    return generate_sprites
+
+
+@case("render.arena")
+def _draw_arena():
+    from game.ui.draw import draw_arena_with_bridges
+
+    screen, *_ = _render_fixture()
+    play_height = SCREEN_HEIGHT - UI_HEIGHT
+    return lambda: draw_arena_with_bridges(screen, SCREEN_WIDTH, SCREEN_HEIGHT, play_height)
+
+
+@case("render.entities")
+def _draw_entities():
+    from game.ui.draw import draw_entities
+
+    screen, world, *_ = _render_fixture()
+    info = world.get_render_info(SCREEN_HEIGHT)
+    return lambda: draw_entities(screen, world, info)
+
+
+@case("render.card_bar")
+def _draw_card_bar():
+    from game.ui.draw import draw_card_bar
+
+    screen, world, order, font_large, font_ui = _render_fixture()
+    play_height = SCREEN_HEIGHT - UI_HEIGHT
+    return lambda: draw_card_bar(
+        screen, world, order, 0, SCREEN_WIDTH, UI_HEIGHT, play_height, font_large, font_ui
+    )
+
+
+@case("render.coins_bar")
+def _draw_coins_bar():
+    from game.ui.draw import draw_coins_bar
+
+    screen, world, _, font_large, _ = _render_fixture()
+    play_height = SCREEN_HEIGHT - UI_HEIGHT
+    return lambda: draw_coins_bar(screen, 6.5, COINS_MAX, play_height, font_large)
+
+
+@case("render.game_over")
+def _draw_game_over():
+    from game.ui.draw import draw_game_over_banner
+
+    screen, _, _, font_large, _ = _render_fixture()
+    return lambda: draw_game_over_banner(screen, True, "player", SCREEN_WIDTH, SCREEN_HEIGHT, font_large)
+
+
+@case("render.frame")
+def _draw_frame():
+    from game.ui.draw import draw_frame
+
+    screen, world, order, font_large, font_ui = _render_fixture()
+    return lambda: draw_frame(
+        screen, world, order, 0, SCREEN_WIDTH, SCREEN_HEIGHT, UI_HEIGHT, font_large, font_ui
+    )
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _calibrate(setup: Case, target_seconds: float) -> int:
+    run = setup()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_seconds or number >= 1 << 20:
+            return number
+        number = max(number * 2, int(number * target_seconds / max(elapsed, 1e-9)))
+
+
+def measure(
+    setup: Case, repeat: int, number: Optional[int] = None, target_seconds: float = 0.02
+) -> Dict[str, float]:
+    if number is None:
+        number = _calibrate(setup, target_seconds)
+    per_call: List[float] = []
+    clock = time.perf_counter
+    for _ in range(repeat):
+        run = setup()
+        start = clock()
+        for _ in range(number):
+            run()
+        per_call.append((clock() - start) / number)
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "min_us": min(per_call) * 1e6,
+        "number": number,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[Tuple[str, float]]:
+    """Return (case, ratio) for every case slower than baseline by more than `threshold`."""
+    slower = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["min_us"] / base["min_us"]
+        if ratio > 1.0 + threshold:
+            slower.append((name, ratio))
+    return slower
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks.")
+    parser.add_argument("-k", "--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare against the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.compare:
+        if not args.baseline.exists():
+            parser.error(f"no baseline at {args.baseline}; run with --save first")
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    results: Dict[str, Dict[str, float]] = {}
+    header = f"{'case':<26} {'median us':>11} {'min us':>10}"
+    print(header + (f" {'base min':>10} {'change':>8}" if baseline else ""))
+    for name, setup in CASES.items():
+        if args.filter not in name:
+            continue
+        result = measure(setup, args.repeat, FIXED_NUMBER.get(name))
+        results[name] = result
+        line = f"{name:<26} {result['median_us']:>11.2f} {result['min_us']:>10.2f}"
+        base = baseline.get(name)
+        if base is not None:
+            change = result["min_us"] / base["min_us"] - 1.0
+            flag = "  SLOWER" if change > args.threshold else ""
+            line += f" {base['min_us']:>10.2f} {change:>+7.1%}{flag}"
+        elif baseline:
+            line += f" {'-':>10} {'no base':>8}"
+        print(line, flush=True)
+
+    if args.save:
+        stored = {}
+        if args.filter and args.baseline.exists():
+            stored = json.loads(args.baseline.read_text())["results"]
+        stored.update(results)
+        payload = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": dict(sorted(stored.items())),
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"wrote {args.baseline}")
+
+    if baseline:
+        missing = [name for name in results if name not in baseline]
+        if missing:
+            print(f"{len(missing)} case(s) not in the baseline: {', '.join(missing)}")
+        slower = compare(results, baseline, args.threshold)
+        if slower:
+            print(f"{len(slower)} case(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+        print(f"no case slower than baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
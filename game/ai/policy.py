@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from .state import GameState, LaneView, TroopView
 from .policy_baseline import choose_baseline_action
 from game.core.actions import PlayCardAction
-from game.data.loader import load_cards, load_troops
+from game.data.catalog import Catalog, get_catalog
 
 
 # ---------------------------------------------------------------------------
@@ -22,32 +23,24 @@ class CardInfo:
     role: str  # "tank", "dps", "ranged", "air", "support"
     troop_id: int
     hp: float
-    damage: float
+    damage: float  # per second, so troops with different attack speeds compare
     speed: float
     range: float
 
 
-def _build_ai_card_pool() -> Dict[str, CardInfo]:
+def _build_ai_card_pool(catalog: Catalog) -> Mapping[str, CardInfo]:
     """
-    Build AI-visible card + troop stats from JSON data.
+    Build AI-visible card + troop stats from the shared data catalog.
 
     This keeps AI decisions in sync with troop balance without
     hard-coding numbers in the policy itself.
     """
-    troops_raw = {int(t["id"]): t for t in load_troops()}
-
     pool: Dict[str, CardInfo] = {}
-    for card in load_cards():
-        card_id = str(card["id"])
-        troop_id = int(card["troop_id"])
-        coins_cost = float(card["coins_cost"])
-
-        troop = troops_raw.get(troop_id)
-        if troop is None:
-            continue
+    for card in catalog.cards.values():
+        troop = catalog.troops[card.troop_id]
 
         # Map data-driven role strings into a smaller set for the heuristic.
-        raw_role = str(troop.get("role", "brawler_dps"))
+        raw_role = troop.role
         if "tank" in raw_role:
             role = "tank"
         elif "ranged" in raw_role:
@@ -59,21 +52,33 @@ def _build_ai_card_pool() -> Dict[str, CardInfo]:
         else:
             role = "dps"
 
-        pool[card_id] = CardInfo(
-            card_id=card_id,
-            cost=coins_cost,
+        pool[card.id] = CardInfo(
+            card_id=card.id,
+            cost=card.cost,
             role=role,
-            troop_id=troop_id,
-            hp=float(troop["hp"]),
-            damage=float(troop["damage"]),
-            speed=float(troop["speed"]),
-            range=float(troop["range"]),
+            troop_id=troop.id,
+            hp=troop.hp,
+            damage=troop.dps,
+            speed=troop.speed,
+            range=troop.range,
         )
 
-    return pool
+    # Read-only: the catalog hands the same pool to every caller.
+    return MappingProxyType(pool)
+
+
+def get_ai_card_pool() -> Mapping[str, CardInfo]:
+    """Card pool for the current (possibly hot-reloaded) game data."""
+    return get_catalog().derive(_build_ai_card_pool)
+
 
+def __getattr__(name: str):
+    # `AI_CARD_POOL` used to be built at import time; it is now resolved
+    # lazily so importing the policy does not touch the data files.
+    if name == "AI_CARD_POOL":
+        return get_ai_card_pool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-AI_CARD_POOL: Dict[str, CardInfo] = _build_ai_card_pool()
 
 LANE_INDICES = (0, 1, 2)
 
@@ -136,12 +141,12 @@ def _generate_legal_actions(state: GameState) -> List[PlayCardAction]:
 
     We only look at:
       - AI's coins (state.player_coins – by construction in World.get_public_state)
-      - Known cards in AI_CARD_POOL
+      - Known cards in the AI card pool
       - The 3 standard lanes (0, 1, 2)
     """
     actions: List[PlayCardAction] = []
 
-    for card_id, info in AI_CARD_POOL.items():
+    for card_id, info in get_ai_card_pool().items():
         if state.player_coins < info.cost:
             continue
 
@@ -246,7 +251,7 @@ def _score_action(
     """
     base_score = 0.0
 
-    info = AI_CARD_POOL.get(action.card_id)
+    info = get_ai_card_pool().get(action.card_id)
     if info is None:
         return float("-inf")
 
@@ -290,13 +295,13 @@ def _score_action(
 
         # Offensive push: if we're ahead in this lane, value damage output.
         if lane.pressure < -150:
-            base_score += min(effective_dmg / 4.0, 4.0)
+            base_score += min(effective_dmg / 240.0, 4.0)
 
         # Empty / low-traffic lane: prefer fast, higher-damage pushes.
         if lane.enemy_hp < 50 and lane.my_hp < 50:
             if move_speed > 1.3:
                 base_score += 1.0
-            if effective_dmg > 5:
+            if effective_dmg > 300:
                 base_score += 1.0
 
     # 4) Card role specific tweaks
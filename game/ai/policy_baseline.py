@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 from .state import GameState
 from game.core.actions import PlayCardAction
+from game.data.catalog import Catalog, get_catalog
 
-# Placeholder costs; kept in sync with `game/data/cards.json`.
-CARD_COSTS = {
-    "bowser": 5,
-    "mario": 3,
-    "dry_bones": 3,
-    "red_shell": 4,
-}
+
+def _build_card_costs(catalog: Catalog) -> Mapping[str, float]:
+    return MappingProxyType({card.id: card.cost for card in catalog.cards.values()})
+
+
+def get_card_costs() -> Mapping[str, float]:
+    """Card costs straight from `game/data/cards.json` via the catalog."""
+    return get_catalog().derive(_build_card_costs)
+
+
+def __getattr__(name: str):
+    # `CARD_COSTS` used to be a hand-kept copy of cards.json.
+    if name == "CARD_COSTS":
+        return get_card_costs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def choose_baseline_action(state: GameState) -> Optional[PlayCardAction]:
@@ -28,10 +38,12 @@ def choose_baseline_action(state: GameState) -> Optional[PlayCardAction]:
     if state.player_coins < 2:
         return None
 
+    card_costs = get_card_costs()
+
     # If we don't know about lanes yet (placeholder state), assume lane 0.
     if not state.lanes:
         for cid in ["mario", "dry_bones", "red_shell", "bowser"]:
-            cost = CARD_COSTS.get(cid, 99)
+            cost = card_costs.get(cid, 99)
             if state.player_coins >= cost:
                 return PlayCardAction(card_id=cid, lane_index=0)
         return None
@@ -49,7 +61,7 @@ def choose_baseline_action(state: GameState) -> Optional[PlayCardAction]:
         target_lane = min(range(len(lane_scores)), key=lambda i: lane_scores[i])
 
     def can_play(card_id: str) -> bool:
-        return state.player_coins >= CARD_COSTS.get(card_id, 99)
+        return state.player_coins >= card_costs.get(card_id, 99)
 
     # Defend low base with Bowser
     if state.player_base_hp < 400 and can_play("bowser"):
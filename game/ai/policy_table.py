@@ -0,0 +1,429 @@
+# game/ai/policy_table.py
+"""
+The heuristic policy (game/ai/policy.py) compiled into lookup tables.
+
+`choose_ai_action` scores every (card, lane) pair from a handful of
+features and picks the best. Each score is a sum of two parts that never
+mix:
+
+- a global part that depends only on the card, the coins, which base has
+  more hp, and how many of the card's troop are already out;
+- a lane part that depends only on the card and that lane's metrics
+  (pressure, front-line y, own / enemy hp).
+
+So instead of one table over every combination of three lanes (far too
+big), the compiler evaluates the policy's own scoring function over a
+discretised version of each part:
+
+    global[card][coins bucket][base behind][troop count]
+    lane[card][pressure bucket][enemy y bucket][my hp bucket][enemy hp bucket]
+
+The buckets follow the policy's thresholds, so every term is exact except
+the one continuous term (pressure / 200, capped), which is sampled at
+bucket midpoints (`PRESSURE_STEP` wide). A decision is then one pass over the
+troops to bucket each lane, plus a dozen table reads, with the same
+tie-breaking as the live policy. States the tables do not cover (no lane info, lanes other
+than 0-2, more than `MAX_COUNT` of one troop, a different coin cap or
+different card data) go to the live policy.
+
+The tables for the current game data are built on first use
+(`compiled_policy()`); `DecisionTable.choose` can be used directly as
+`world.ai_policy`. The command line compiles, optionally saves the
+tables as JSON, and reports how often they disagree with the live policy
+on states from AI-vs-AI matches:
+
+    python -m game.ai.policy_table --matches 20 --out policy_table.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .policy import (
+    LANE_INDICES,
+    LaneMetrics,
+    _build_ai_card_pool,
+    _score_action,
+    choose_ai_action,
+)
+from .state import GameState
+from game.core.actions import PlayCardAction
+from game.data.catalog import Catalog, get_catalog
+
+TABLE_VERSION = 1
+
+PRESSURE_STEP = 25.0  # width of the positive pressure buckets
+PRESSURE_CAP = 600.0  # the pressure bonus stops growing here
+_NEG_PRESSURE = (-150.0, -100.0, 0.0)  # <-150, [-150,-100), [-100,0), 0
+_POS_BUCKETS = int(PRESSURE_CAP / PRESSURE_STEP) + 1  # (0,25] ... (575,600], >600
+PRESSURE_BUCKETS = len(_NEG_PRESSURE) + 1 + _POS_BUCKETS
+
+_ENEMY_Y = (200.0, 250.0)  # <200, [200,250), >=250 (or no enemy)
+Y_BUCKETS = len(_ENEMY_Y) + 1
+HP_BUCKETS = 3  # my hp: 0, (0,50), >=50 / enemy hp: <50, [50,150], >150
+MAX_COUNT = 8  # troops of one type on the board the tables cover
+
+LANE_CELLS = PRESSURE_BUCKETS * Y_BUCKETS * HP_BUCKETS * HP_BUCKETS
+NO_LANE = 9999.0  # front-line y of a lane with no troops (see policy.py)
+
+
+# ---------------------------------------------------------------------------
+# Buckets
+# ---------------------------------------------------------------------------
+
+def _pressure_bucket(pressure: float) -> int:
+    if pressure <= 0.0:
+        return bisect_right(_NEG_PRESSURE, pressure) if pressure < 0.0 else len(_NEG_PRESSURE)
+    return len(_NEG_PRESSURE) + min(math.ceil(pressure / PRESSURE_STEP), _POS_BUCKETS)
+
+
+def _pressure_value(bucket: int) -> float:
+    """A pressure inside `bucket` (the midpoint of positive buckets)."""
+    if bucket < len(_NEG_PRESSURE):
+        return (-200.0, -125.0, -50.0)[bucket]
+    k = bucket - len(_NEG_PRESSURE)
+    if k == 0:
+        return 0.0
+    if k == _POS_BUCKETS:
+        return PRESSURE_CAP + PRESSURE_STEP
+    return (k - 0.5) * PRESSURE_STEP
+
+
+def _my_hp_bucket(hp: float) -> int:
+    return 0 if hp <= 0.0 else (1 if hp < 50.0 else 2)
+
+
+def _enemy_hp_bucket(hp: float) -> int:
+    return 0 if hp < 50.0 else (1 if hp <= 150.0 else 2)
+
+
+_MY_HP_VALUES = (0.0, 25.0, 50.0)
+_ENEMY_HP_VALUES = (0.0, 100.0, 200.0)
+_ENEMY_Y_VALUES = (100.0, 225.0, NO_LANE)
+
+
+def lane_cell(my_hp: float, enemy_hp: float, enemy_min_y: float) -> int:
+    """Index of a lane's metrics (see `LaneMetrics`) in a card's lane table."""
+    cell = _pressure_bucket(enemy_hp - my_hp)
+    cell = cell * Y_BUCKETS + bisect_right(_ENEMY_Y, enemy_min_y)
+    cell = cell * HP_BUCKETS + _my_hp_bucket(my_hp)
+    return cell * HP_BUCKETS + _enemy_hp_bucket(enemy_hp)
+
+
+def _lane_cells(state: GameState) -> Tuple[List[int], Dict[int, int]]:
+    """
+    Lane table index per lane, and the viewing side's troop counts by type.
+
+    One pass over the troops doing the work of `_compute_lane_metrics` and
+    `_count_my_troops_by_type`.
+    """
+    cells: List[int] = []
+    counts: Dict[int, int] = {}
+    for lane in state.lanes:
+        my_hp = enemy_hp = 0.0
+        enemy_min_y = NO_LANE
+        for t in lane.troops:
+            if t.owner == "player":
+                my_hp += t.hp
+                try:
+                    key = int(t.troop_id)
+                except (TypeError, ValueError):
+                    continue
+                counts[key] = counts.get(key, 0) + 1
+            else:
+                enemy_hp += t.hp
+                if t.y < enemy_min_y:
+                    enemy_min_y = t.y
+        cells.append(lane_cell(my_hp, enemy_hp, enemy_min_y))
+    return cells, counts
+
+
+def _cell_metrics(lane_index: int, cell: int) -> LaneMetrics:
+    cell, enemy_hp = divmod(cell, HP_BUCKETS)
+    cell, my_hp = divmod(cell, HP_BUCKETS)
+    pressure, enemy_y = divmod(cell, Y_BUCKETS)
+    return LaneMetrics(
+        lane_index=lane_index,
+        my_hp=_MY_HP_VALUES[my_hp],
+        enemy_hp=_ENEMY_HP_VALUES[enemy_hp],
+        pressure=_pressure_value(pressure),
+        enemy_min_y=_ENEMY_Y_VALUES[enemy_y],
+        my_min_y=NO_LANE,
+    )
+
+
+def _coin_edges(costs: Sequence[float], max_coins: float) -> Tuple[float, ...]:
+    """Every coin amount the policy compares against (see `_score_action`)."""
+    edges = {1.0, 5.0, max_coins - 1.0}
+    for cost in costs:
+        edges.update((cost, cost + 1.0))
+    return tuple(sorted(edges))
+
+
+def _fingerprint(catalog: Catalog) -> str:
+    """Identifies the card data the tables were compiled from."""
+    return json.dumps(
+        [[c.card_id, c.cost, c.role, c.troop_id, c.hp, c.damage, c.speed, c.range]
+         for c in _build_ai_card_pool(catalog).values()]
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tables
+# ---------------------------------------------------------------------------
+
+class DecisionTable:
+    """Compiled policy for one card pool and coin cap (see the module docstring)."""
+
+    def __init__(
+        self,
+        cards: Sequence[Tuple[str, int, float]],
+        max_coins: float,
+        coin_edges: Sequence[float],
+        global_scores: List[List[float]],
+        lane_scores: List[List[float]],
+        fingerprint: str,
+    ) -> None:
+        self.cards = tuple((card_id, troop_id, cost) for card_id, troop_id, cost in cards)
+        self.max_coins = max_coins
+        self.coin_edges = tuple(coin_edges)
+        # global_scores[card][(coins bucket * 2 + base behind) * (MAX_COUNT + 1) + count]
+        self.global_scores = global_scores
+        # lane_scores[card][lane_cell(...)]
+        self.lane_scores = lane_scores
+        self.fingerprint = fingerprint
+        self._catalog: Optional[Catalog] = None  # last catalog that matched
+        self.lookups = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def compile(cls, max_coins: float = 10.0) -> "DecisionTable":
+        """Evaluate the live scoring function over every bucket."""
+        catalog = get_catalog()
+        pool = catalog.derive(_build_ai_card_pool)
+        cards = [(info.card_id, info.troop_id, info.cost) for info in pool.values()]
+        edges = _coin_edges([cost for _, _, cost in cards], max_coins)
+        coin_values = (0.0,) + edges
+
+        global_scores: List[List[float]] = []
+        lane_scores: List[List[float]] = []
+        for card_id, troop_id, cost in cards:
+            row: List[float] = []
+            for coins in coin_values:
+                for behind in (False, True):
+                    state = GameState(
+                        player_base_hp=0.0 if behind else 1.0,
+                        ai_base_hp=1.0 if behind else 0.0,
+                        player_coins=coins,
+                        max_coins=max_coins,
+                    )
+                    for count in range(MAX_COUNT + 1):
+                        if coins < cost:
+                            row.append(-math.inf)  # not affordable
+                        else:
+                            action = PlayCardAction(card_id, 0)
+                            row.append(_score_action(state, action, {}, {troop_id: count}))
+            global_scores.append(row)
+
+            # Lane terms: the score with the lane minus the score without it.
+            state = GameState(player_coins=max_coins, max_coins=max_coins)
+            action = PlayCardAction(card_id, 0)
+            base = _score_action(state, action, {}, {})
+            lane_scores.append([
+                _score_action(state, action, {0: _cell_metrics(0, cell)}, {}) - base
+                for cell in range(LANE_CELLS)
+            ])
+
+        return cls(cards, max_coins, edges, global_scores, lane_scores, catalog.derive(_fingerprint))
+
+    # ------------------------------------------------------------------
+    # Runtime
+    # ------------------------------------------------------------------
+    def covers(self, state: GameState) -> bool:
+        """True if the tables answer for `state` (otherwise the live policy does)."""
+        if state.max_coins != self.max_coins or not state.lanes:
+            return False
+        if tuple(lane.index for lane in state.lanes) != LANE_INDICES:
+            return False
+        catalog = get_catalog()
+        if catalog is not self._catalog:
+            if catalog.derive(_fingerprint) != self.fingerprint:
+                return False
+            self._catalog = catalog
+        return True
+
+    def choose(self, state: GameState) -> Optional[PlayCardAction]:
+        """Drop-in replacement for `choose_ai_action`."""
+        if state.is_terminal or state.player_coins < 1.0:
+            return None
+        if not self.covers(state):
+            self.fallbacks += 1
+            return choose_ai_action(state)
+
+        cells, counts = _lane_cells(state)
+        if counts and max(counts.values()) > MAX_COUNT:
+            self.fallbacks += 1
+            return choose_ai_action(state)
+        self.lookups += 1
+
+        behind = 1 if state.player_base_hp < state.ai_base_hp else 0
+        coins = bisect_right(self.coin_edges, state.player_coins)
+        row = (coins * 2 + behind) * (MAX_COUNT + 1)
+
+        # Same order and strict comparison as the live policy, so ties go
+        # to the same (card, lane).
+        best_score = -math.inf
+        best: Optional[Tuple[str, int]] = None
+        for (card_id, troop_id, _), global_row, lane_row in zip(
+            self.cards, self.global_scores, self.lane_scores
+        ):
+            score = global_row[row + counts.get(troop_id, 0)]
+            if score == -math.inf:
+                continue
+            lane_scores = [lane_row[cell] for cell in cells]
+            top = max(lane_scores)
+            if score + top > best_score:
+                best_score = score + top
+                best = (card_id, lane_scores.index(top))
+        return None if best is None else PlayCardAction(*best)
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+    def to_json(self) -> dict:
+        return {
+            "version": TABLE_VERSION,
+            "cards": [list(card) for card in self.cards],
+            "max_coins": self.max_coins,
+            "coin_edges": list(self.coin_edges),
+            "pressure_step": PRESSURE_STEP,
+            "max_count": MAX_COUNT,
+            # JSON has no -inf: unaffordable entries are null
+            "global": [[None if s == -math.inf else s for s in row] for row in self.global_scores],
+            "lane": self.lane_scores,
+            "fingerprint": self.fingerprint,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "DecisionTable":
+        if data.get("version") != TABLE_VERSION:
+            raise ValueError(f"Unsupported decision table version {data.get('version')!r}.")
+        if data["pressure_step"] != PRESSURE_STEP or data["max_count"] != MAX_COUNT:
+            raise ValueError("Decision table was compiled with different buckets.")
+        return cls(
+            [tuple(card) for card in data["cards"]],
+            data["max_coins"],
+            data["coin_edges"],
+            [[-math.inf if s is None else s for s in row] for row in data["global"]],
+            data["lane"],
+            data["fingerprint"],
+        )
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.to_json(), fh, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "DecisionTable":
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_json(json.load(fh))
+
+
+def _compile_default(catalog: Catalog) -> DecisionTable:
+    from game.core.world import COINS_MAX
+
+    return DecisionTable.compile(float(COINS_MAX))
+
+
+def compiled_policy() -> DecisionTable:
+    """Tables for the current (possibly hot-reloaded) game data, built on first use."""
+    return get_catalog().derive(_compile_default)
+
+
+# ---------------------------------------------------------------------------
+# Disagreement report
+# ---------------------------------------------------------------------------
+
+def sample_states(matches: int, max_ticks: int = 180 * 60) -> List[GameState]:
+    """Every state either side's policy saw in `matches` AI-vs-AI matches."""
+    from game.core.scenarios import play_bottom_side
+    from game.core.world import FIXED_DT, World
+
+    states: List[GameState] = []
+    for match in range(matches):
+        world = World(450, 750)
+        live = world.ai_policy
+
+        def ai_policy(state: GameState) -> Optional[PlayCardAction]:
+            states.append(state)
+            return live(state)
+
+        def bottom_policy(state: GameState) -> Optional[PlayCardAction]:
+            states.append(state)
+            return choose_ai_action(state)
+
+        world.ai_policy = ai_policy
+        for _ in range(max_ticks):
+            # Staggered offsets make the matches play out differently.
+            play_bottom_side(world, match * 7, bottom_policy)
+            world.step(FIXED_DT)
+            if world.game_over:
+                break
+    return states
+
+
+def disagreement_report(table: DecisionTable, states: Sequence[GameState]) -> Dict[str, float]:
+    """Compare the table with the live policy on `states`."""
+    differ = 0
+    covered = 0
+    for state in states:
+        if table.covers(state):
+            covered += 1
+        if table.choose(state) != choose_ai_action(state):
+            differ += 1
+
+    def per_call(policy) -> float:
+        start = time.perf_counter()
+        for state in states:
+            policy(state)
+        return (time.perf_counter() - start) / max(len(states), 1) * 1e6
+
+    return {
+        "states": len(states),
+        "covered": covered / max(len(states), 1),
+        "disagreement": differ / max(len(states), 1),
+        "live_us": per_call(choose_ai_action),
+        "table_us": per_call(table.choose),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the AI policy into decision tables.")
+    parser.add_argument("--out", default=None, help="write the tables to this JSON file")
+    parser.add_argument("--matches", type=int, default=10, help="AI-vs-AI matches to check against")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = _compile_default(get_catalog())
+    compile_ms = (time.perf_counter() - start) * 1e3
+    entries = sum(len(row) for row in table.global_scores) + sum(len(row) for row in table.lane_scores)
+    print(f"compiled {len(table.cards)} cards, {entries} entries in {compile_ms:.1f} ms")
+    if args.out:
+        table.save(args.out)
+        print(f"wrote {args.out}")
+
+    report = disagreement_report(table, sample_states(args.matches))
+    print(
+        f"{report['states']} states: {report['covered']:.1%} covered by the tables, "
+        f"{report['disagreement']:.2%} disagree with the live policy"
+    )
+    print(f"per decision: live {report['live_us']:.1f} us, table {report['table_us']:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ from typing import Callable, List, Optional, Tuple
 
 from .state import GameState
 from .heuristic import evaluate_state
-from .policy_baseline import choose_baseline_action, CARD_COSTS
+from .policy_baseline import choose_baseline_action, get_card_costs
 from game.core.actions import PlayCardAction
 
 EnemyPolicy = Callable[[GameState], Optional[PlayCardAction]]
@@ -24,7 +24,7 @@ def get_legal_actions(state: GameState) -> List[Optional[PlayCardAction]]:
     else:
         lane_indices = [lane.index for lane in state.lanes]
 
-    for card_id, cost in CARD_COSTS.items():
+    for card_id, cost in get_card_costs().items():
         if state.player_coins >= cost:
             for lane_idx in lane_indices:
                 actions.append(PlayCardAction(card_id=card_id, lane_index=lane_idx))
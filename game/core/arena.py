@@ -0,0 +1,58 @@
+# game/core/arena.py
+"""
+Arena geometry shared by the simulation and the renderer.
+
+The battlefield (everything above the HUD) is split by a horizontal river;
+ground troops can only cross it on the two wooden bridges. The numbers
+match the smash2.py background, which `game/ui/draw.py` paints from this
+same layout, so what is drawn is what troops walk on. Pure data: no
+pygame import.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+Rect = Tuple[int, int, int, int]  # x, y, w, h
+
+RIVER_HEIGHT = 40
+BRIDGE_WIDTH, BRIDGE_HEIGHT = 40, 50
+BRIDGE_INSET = 60  # bridge distance from the side edges
+BRIDGE_OVERHANG = 5  # bridges stick out this far beyond each river bank
+
+
+@dataclass(frozen=True)
+class ArenaLayout:
+    width: int
+    play_height: int  # battlefield height (screen height minus the HUD)
+    river: Rect
+    bridges: Tuple[Rect, ...]
+
+    @property
+    def river_top(self) -> int:
+        return self.river[1]
+
+    @property
+    def river_bottom(self) -> int:
+        return self.river[1] + self.river[3]
+
+    @property
+    def river_mid(self) -> float:
+        return self.river[1] + self.river[3] / 2.0
+
+
+@lru_cache(maxsize=None)
+def arena_layout(width: int, play_height: int) -> ArenaLayout:
+    river_y = play_height // 2 - RIVER_HEIGHT // 2
+    bridge_y = river_y - BRIDGE_OVERHANG
+    return ArenaLayout(
+        width=width,
+        play_height=play_height,
+        river=(0, river_y, width, RIVER_HEIGHT),
+        bridges=(
+            (BRIDGE_INSET, bridge_y, BRIDGE_WIDTH, BRIDGE_HEIGHT),
+            (width - BRIDGE_INSET - BRIDGE_WIDTH, bridge_y, BRIDGE_WIDTH, BRIDGE_HEIGHT),
+        ),
+    )
@@ -0,0 +1,338 @@
+# game/core/replay.py
+"""
+Deterministic match replays.
+
+A replay stores:
+- a small JSON header (arena size, fixed timestep, number mode,
+  keyframe interval, card table and the data-catalog fingerprint),
+- every applied PlayCardAction for both sides, stamped with its tick,
+- full-state keyframes every `keyframe_seconds`, each with a state hash.
+
+Playback re-simulates headless at full speed, substituting the recorded
+AI decisions for the live policy. Seeking restores the nearest keyframe at
+or before the target tick and simulates forward from there, so a seek
+costs at most one keyframe interval. Whenever playback reaches a keyframe
+tick the live state hash is compared against the recorded one and a
+mismatch raises ReplayDesyncError.
+
+Recording a match:
+    world = World(450, 750)
+    recorder = ReplayRecorder(world)
+    ... world.step(FIXED_DT) ...
+    recorder.finish().save("match.replay")
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from game.core.actions import PlayCardAction
+from game.core.savestate import dumps, loads, state_hash
+from game.core.world import FIXED_DT, World
+from game.data.catalog import get_catalog
+
+REPLAY_MAGIC = b"SRRP"
+REPLAY_VERSION = 2
+DEFAULT_KEYFRAME_SECONDS = 5.0
+
+_HEADER = struct.Struct("<4sHI")
+_COUNT = struct.Struct("<I")
+# tick, flags (bit0 = ai team, bit1 = chosen inside World.step), card index, lane
+_ACTION = struct.Struct("<IBBB")
+_KEYFRAME = struct.Struct("<I16sI")
+
+
+class ReplayError(ValueError):
+    """The replay file is malformed or was recorded against other data."""
+
+
+# Header fields ReplayPlayer needs; read() rejects files missing any.
+_HEADER_FIELDS = ("screen_width", "screen_height", "dt", "cards", "catalog")
+
+
+class ReplayDesyncError(RuntimeError):
+    """Re-simulation diverged from the recorded match."""
+
+
+@dataclass(frozen=True)
+class ReplayAction:
+    tick: int  # World._tick when the action was applied
+    team: str  # "player" or "ai"
+    card_id: str
+    lane_index: int
+    in_step: bool  # True when chosen by World.ai_policy during step()
+
+
+@dataclass(frozen=True)
+class Keyframe:
+    tick: int
+    state_hash: bytes
+    state: bytes  # zlib-compressed savestate.dumps()
+
+    def decode(self) -> bytes:
+        return zlib.decompress(self.state)
+
+
+@dataclass
+class Replay:
+    header: Dict[str, Any]
+    actions: List[ReplayAction] = field(default_factory=list)
+    keyframes: List[Keyframe] = field(default_factory=list)
+
+    @property
+    def start_tick(self) -> int:
+        return self.keyframes[0].tick
+
+    @property
+    def end_tick(self) -> int:
+        return self.keyframes[-1].tick
+
+    # ------------------------------------------------------------------
+    # Serialisation
+    # ------------------------------------------------------------------
+    def write(self, f: BinaryIO) -> None:
+        cards: List[str] = list(self.header["cards"])
+        header = json.dumps(self.header, sort_keys=True).encode("utf-8")
+
+        f.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, len(header)))
+        f.write(header)
+
+        f.write(_COUNT.pack(len(self.actions)))
+        for a in self.actions:
+            flags = (1 if a.team == "ai" else 0) | (2 if a.in_step else 0)
+            f.write(_ACTION.pack(a.tick, flags, cards.index(a.card_id), a.lane_index))
+
+        f.write(_COUNT.pack(len(self.keyframes)))
+        for kf in self.keyframes:
+            f.write(_KEYFRAME.pack(kf.tick, kf.state_hash, len(kf.state)))
+            f.write(kf.state)
+
+    def save(self, path) -> None:
+        with open(path, "wb") as f:
+            self.write(f)
+
+    @classmethod
+    def read(cls, f: BinaryIO) -> "Replay":
+        def take(n: int) -> bytes:
+            data = f.read(n)
+            if len(data) != n:
+                raise ReplayError("truncated replay file")
+            return data
+
+        magic, version, header_len = _HEADER.unpack(take(_HEADER.size))
+        if magic != REPLAY_MAGIC:
+            raise ReplayError("not a replay file")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        raw_header = take(header_len)
+        try:
+            header = json.loads(raw_header)
+        except ValueError as exc:  # includes UnicodeDecodeError
+            raise ReplayError(f"corrupt replay header: {exc}") from exc
+        if not isinstance(header, dict):
+            raise ReplayError("corrupt replay header: expected an object")
+        missing = [name for name in _HEADER_FIELDS if name not in header]
+        if missing:
+            raise ReplayError(f"corrupt replay header: missing {', '.join(missing)}")
+        cards = header["cards"]
+        if not isinstance(cards, list) or not all(isinstance(c, str) for c in cards):
+            raise ReplayError("corrupt replay header: 'cards' must be a list of card ids")
+
+        actions: List[ReplayAction] = []
+        (count,) = _COUNT.unpack(take(_COUNT.size))
+        for _ in range(count):
+            tick, flags, card_index, lane = _ACTION.unpack(take(_ACTION.size))
+            if card_index >= len(cards):
+                raise ReplayError(f"replay action at tick {tick} uses unknown card {card_index}")
+            actions.append(
+                ReplayAction(
+                    tick=tick,
+                    team="ai" if flags & 1 else "player",
+                    card_id=cards[card_index],
+                    lane_index=lane,
+                    in_step=bool(flags & 2),
+                )
+            )
+
+        keyframes: List[Keyframe] = []
+        (count,) = _COUNT.unpack(take(_COUNT.size))
+        for _ in range(count):
+            tick, digest, size = _KEYFRAME.unpack(take(_KEYFRAME.size))
+            keyframes.append(Keyframe(tick=tick, state_hash=digest, state=take(size)))
+
+        if not keyframes:
+            raise ReplayError("replay has no keyframes")
+        return cls(header=header, actions=actions, keyframes=keyframes)
+
+    @classmethod
+    def load(cls, path) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.read(f)
+
+
+# ---------------------------------------------------------------------------
+# Recording
+# ---------------------------------------------------------------------------
+
+class ReplayRecorder:
+    """
+    Attaches to a World and records its actions and keyframes.
+
+    The World must be stepped with the fixed timestep `dt` for the replay
+    to be reproducible. The first keyframe is taken immediately, so
+    scenario setups (pre-spawned troops, custom coins) are captured too.
+    """
+
+    def __init__(
+        self,
+        world: World,
+        dt: float = FIXED_DT,
+        keyframe_seconds: float = DEFAULT_KEYFRAME_SECONDS,
+    ) -> None:
+        self.world = world
+        self.dt = dt
+        self.keyframe_interval = max(1, int(round(keyframe_seconds / dt)))
+
+        catalog = get_catalog()
+        self.replay = Replay(
+            header={
+                "screen_width": world.screen_width,
+                "screen_height": world.screen_height,
+                "dt": dt,
+                "fixed_point": world.fixed_point,
+                "keyframe_interval": self.keyframe_interval,
+                "cards": sorted(catalog.cards),
+                "catalog": catalog.fingerprint,
+            }
+        )
+
+        world.recorder = self
+        self._keyframe()
+
+    def _keyframe(self) -> None:
+        data = dumps(self.world)
+        self.replay.keyframes.append(
+            Keyframe(
+                tick=self.world._tick,
+                state_hash=state_hash(self.world, data),
+                state=zlib.compress(data),
+            )
+        )
+
+    def record_action(self, tick: int, team: str, card_id: str, lane_index: int, in_step: bool) -> None:
+        self.replay.actions.append(ReplayAction(tick, team, card_id, lane_index, in_step))
+
+    def on_tick(self, world: World) -> None:
+        if world._tick % self.keyframe_interval == 0 or world.game_over:
+            self._keyframe()
+
+    def finish(self) -> Replay:
+        """Detach from the World and return the replay (ending on a keyframe)."""
+        if self.replay.keyframes[-1].tick != self.world._tick:
+            self._keyframe()
+        self.world.recorder = None
+        return self.replay
+
+
+# ---------------------------------------------------------------------------
+# Playback
+# ---------------------------------------------------------------------------
+
+class ReplayPlayer:
+    """
+    Re-simulates a Replay headless.
+
+        player = ReplayPlayer(Replay.load("match.replay"))
+        player.seek(3600)          # jump to t = 60 s
+        world = player.play_to_end()
+    """
+
+    def __init__(self, replay: Replay, verify: bool = True) -> None:
+        header = replay.header
+        if header["catalog"] != get_catalog().fingerprint:
+            raise ReplayError(
+                "replay was recorded with different game data "
+                f"(catalog {header['catalog'][:12]}, current {get_catalog().fingerprint[:12]})"
+            )
+
+        self.replay = replay
+        self.verify = verify
+        self.dt = float(header["dt"])
+        self.world = World(
+            int(header["screen_width"]),
+            int(header["screen_height"]),
+            bool(header.get("fixed_point", False)),
+        )
+        self.world.ai_policy = self._recorded_ai_policy
+
+        self._external: Dict[int, List[ReplayAction]] = {}
+        self._in_step: Dict[int, ReplayAction] = {}
+        for action in replay.actions:
+            if action.in_step:
+                self._in_step[action.tick] = action
+            else:
+                self._external.setdefault(action.tick, []).append(action)
+        self._keyframes = {kf.tick: kf for kf in replay.keyframes}
+
+        self._restore(replay.keyframes[0])
+
+    @property
+    def tick(self) -> int:
+        return self.world._tick
+
+    @property
+    def finished(self) -> bool:
+        return self.world._tick >= self.replay.end_tick
+
+    def _recorded_ai_policy(self, _state) -> Optional[PlayCardAction]:
+        action = self._in_step.get(self.world._tick)
+        if action is None:
+            return None
+        return PlayCardAction(card_id=action.card_id, lane_index=action.lane_index)
+
+    def _restore(self, keyframe: Keyframe) -> None:
+        loads(keyframe.decode(), self.world)
+
+    def step(self) -> None:
+        """Simulate one tick, applying recorded actions and verifying keyframes."""
+        world = self.world
+        for action in self._external.get(world._tick, ()):
+            play = PlayCardAction(card_id=action.card_id, lane_index=action.lane_index)
+            if action.team == "player":
+                world.apply_player_action(play)
+            else:
+                world.apply_ai_action(play)
+
+        world.step(self.dt)
+
+        keyframe = self._keyframes.get(world._tick)
+        if self.verify and keyframe is not None and state_hash(world) != keyframe.state_hash:
+            raise ReplayDesyncError(
+                f"state hash mismatch at tick {world._tick}: "
+                "the rules or data no longer reproduce this replay"
+            )
+
+    def seek(self, tick: int) -> World:
+        """Jump to `tick` via the nearest earlier keyframe."""
+        if not self.replay.start_tick <= tick <= self.replay.end_tick:
+            raise ValueError(
+                f"tick {tick} outside replay range "
+                f"[{self.replay.start_tick}, {self.replay.end_tick}]"
+            )
+
+        base = max(kf.tick for kf in self.replay.keyframes if kf.tick <= tick)
+        if not base <= self.world._tick <= tick:
+            self._restore(self._keyframes[base])
+
+        while self.world._tick < tick:
+            self.step()
+        return self.world
+
+    def play_to_end(self) -> World:
+        while not self.finished:
+            self.step()
+        return self.world
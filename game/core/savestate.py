@@ -0,0 +1,327 @@
+# game/core/savestate.py
+"""
+Compact binary save / load of a whole World.
+
+`dumps()` writes everything the simulation needs to continue bit-for-bit
+(world scalars and clock, coin and AI timers, every tower and troop with
+its cooldown and target lock) into a versioned, fixed-layout little-endian
+record stream. `loads()` rebuilds a World from it. Target references are
+stored as indices into the combined entity order (towers first, then
+troops); -1 means no target. A tower or troop that died and left the
+World's lists is still saved (unlisted) while someone is locked onto it,
+so the lock survives a reload exactly.
+
+Layout (version 4):
+
+    header   <4sHHH20s  magic "SRSV", version, screen w/h, catalog sha1
+    world    <IIddddddBBBiiHHI
+             tick, next_uid, player/ai coins, clock ms, player/ai coin
+             due ms, AI decision due ms, game_over, winner (0 none,
+             1 player, 2 ai), fixed_point, player/ai king index, tower
+             count, troop count, projectile count
+    tower    <IddBBBBdI  x tower count
+             uid, x, y, team, is_king, dead, listed, hp, ready tick
+    troop    <IddBBBdBBBiI  x troop count
+             uid, x, y, team, lane, stats_idx, hp, state, facing_right,
+             dead (0 alive, 1 dead, 2 dead and unlisted), target index,
+             ready tick
+    shot     <ddddddIIBB  x projectile count
+             x, y, aim x, aim y, speed, damage, target uid, source uid,
+             homing, team (see game/systems/projectiles.py)
+
+Per-type stats (max hp, damage, range, ...) are not stored; they come from
+the data catalog, whose fingerprint is checked on load. The World's timer
+queues (game/systems/timers.py) are rebuilt from the due times and ready
+ticks on load.
+
+`state_hash()` digests the same bytes, so two Worlds that will evolve
+identically always hash identically.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from typing import List, Optional
+
+from game.data.catalog import get_catalog
+from game.entities.tower import Tower
+from game.entities.troop import Troop
+from game.systems.projectiles import ProjectilePool
+
+SAVE_MAGIC = b"SRSV"
+SAVE_VERSION = 4
+
+TEAMS = ("player", "ai")
+WINNERS = (None, "player", "ai")
+STATES = ("move", "attack", "idle", "dead")
+_TEAM_CODE = {name: i for i, name in enumerate(TEAMS)}
+_STATE_CODE = {name: i for i, name in enumerate(STATES)}
+
+_HEADER = struct.Struct("<4sHHH20s")
+_WORLD = struct.Struct("<IIddddddBBBiiHHI")
+_TOWER = struct.Struct("<IddBBBBdI")
+_TROOP = struct.Struct("<IddBBBdBBBiI")
+_SHOT = struct.Struct("<ddddddIIBB")
+
+
+class SaveStateError(ValueError):
+    """The save is malformed, from another version, or from other game data."""
+
+
+def _all_towers(world, troops: List[Troop]) -> List[Tower]:
+    """
+    Listed towers in update order, then king towers and targeted towers
+    no longer listed.
+    """
+    towers: List[Tower] = list(world.player_towers) + list(world.ai_towers)
+    listed = {id(t) for t in towers}
+    unlisted = [world.player_king_tower, world.ai_king_tower]
+    unlisted += [t.current_target for t in troops if isinstance(t.current_target, Tower)]
+    for tower in unlisted:
+        if id(tower) not in listed:
+            towers.append(tower)
+            listed.add(id(tower))
+    return towers
+
+
+def _all_troops(world) -> List[Troop]:
+    """Listed troops in update order, then dead troops some troop still targets."""
+    troops: List[Troop] = world.player_troops + world.ai_troops
+    listed = {id(t) for t in troops}
+    fallen: List[Troop] = []
+    for troop in troops:
+        target = troop.current_target
+        if isinstance(target, Troop) and id(target) not in listed:
+            fallen.append(target)
+            listed.add(id(target))
+    return troops + fallen
+
+
+def dumps(world) -> bytes:
+    from game.core.world import AI_COINS, AI_DECISION, PLAYER_COINS  # avoid cycles
+
+    troops = _all_troops(world)
+    towers = _all_towers(world, troops)
+    n_listed = len(world.player_towers) + len(world.ai_towers)
+    n_listed_troops = len(world.player_troops) + len(world.ai_troops)
+
+    index_of = {id(e): i for i, e in enumerate(towers)}
+    index_of.update({id(e): len(towers) + i for i, e in enumerate(troops)})
+    shots = world.projectiles.rows() if world.projectiles is not None else []
+    due = world._timer_due()
+
+    out = bytearray(
+        _HEADER.pack(
+            SAVE_MAGIC,
+            SAVE_VERSION,
+            world.screen_width,
+            world.screen_height,
+            bytes.fromhex(get_catalog().fingerprint),
+        )
+    )
+    out += _WORLD.pack(
+        world._tick,
+        world._next_uid,
+        world.player_coins,
+        world.ai_coins,
+        world._clock_ms,
+        due[PLAYER_COINS],
+        due[AI_COINS],
+        due[AI_DECISION],
+        world.game_over,
+        WINNERS.index(world.winner),
+        world.fixed_point,
+        index_of[id(world.player_king_tower)],
+        index_of[id(world.ai_king_tower)],
+        len(towers),
+        len(troops),
+        len(shots),
+    )
+
+    pack_tower = _TOWER.pack
+    for i, t in enumerate(towers):
+        out += pack_tower(
+            t.uid,
+            t.x,
+            t.y,
+            _TEAM_CODE[t.team],
+            t.is_king,
+            t.dead,
+            i < n_listed,
+            t.hp,
+            t.ready_tick,
+        )
+
+    pack_troop = _TROOP.pack
+    for i, t in enumerate(troops):
+        target = t.current_target
+        out += pack_troop(
+            t.uid,
+            t.x,
+            t.y,
+            _TEAM_CODE[t.team],
+            t.lane_index,
+            t.stats_idx,
+            t.hp,
+            _STATE_CODE[t.state],
+            t.facing_right,
+            2 if i >= n_listed_troops else bool(getattr(t, "dead", False)),
+            index_of.get(id(target), -1) if target is not None else -1,
+            t.ready_tick,
+        )
+
+    pack_shot = _SHOT.pack
+    for shot in shots:
+        out += pack_shot(*shot)
+    return bytes(out)
+
+
+def loads(data: bytes, world=None):
+    """
+    Rebuild a World from `dumps()` output.
+
+    Pass `world` to restore into an existing instance (keeping its
+    ai_policy, recorder and telemetry hooks); it must use the saved number
+    mode (`fixed_point`). Otherwise a new World is created with the saved
+    screen size and mode.
+    """
+    from game.core.world import AI_COINS, AI_DECISION, PLAYER_COINS, World  # avoid cycles
+
+    view = memoryview(data)
+    try:
+        magic, version, width, height, fingerprint = _HEADER.unpack_from(view, 0)
+        if magic != SAVE_MAGIC:
+            raise SaveStateError("not a save state")
+        if version != SAVE_VERSION:
+            raise SaveStateError(f"unsupported save state version {version}")
+        if fingerprint.hex() != get_catalog().fingerprint:
+            raise SaveStateError("save state was written with different game data")
+
+        (
+            tick,
+            next_uid,
+            player_coins,
+            ai_coins,
+            clock_ms,
+            player_coins_due,
+            ai_coins_due,
+            ai_decision_due,
+            game_over,
+            winner,
+            fixed_point,
+            player_king,
+            ai_king,
+            n_towers,
+            n_troops,
+            n_shots,
+        ) = _WORLD.unpack_from(view, _HEADER.size)
+        offset = _HEADER.size + _WORLD.size
+        fixed_point = bool(fixed_point)
+        if world is not None and world.fixed_point != fixed_point:
+            mode = "fixed-point" if fixed_point else "floating-point"
+            raise SaveStateError(f"save state is from a {mode} World")
+
+        expected = (
+            offset + n_towers * _TOWER.size + n_troops * _TROOP.size + n_shots * _SHOT.size
+        )
+        if len(view) != expected:
+            raise SaveStateError(f"save state is {len(view)} bytes, expected {expected}")
+
+        towers: List[Tower] = []
+        listed: List[bool] = []
+        for uid, x, y, team, is_king, dead, is_listed, hp, ready_tick in _TOWER.iter_unpack(
+            view[offset : offset + n_towers * _TOWER.size]
+        ):
+            tower = Tower(
+                x, y, team=TEAMS[team], is_king=bool(is_king), uid=uid, fixed_point=fixed_point
+            )
+            tower.hp = hp
+            tower.ready_tick = ready_tick
+            tower.dead = bool(dead)
+            towers.append(tower)
+            listed.append(bool(is_listed))
+        offset += n_towers * _TOWER.size
+
+        troops: List[Troop] = []
+        troops_listed: List[bool] = []
+        targets: List[int] = []
+        for (
+            uid, x, y, team, lane, stats_idx, hp, state, facing, dead, target, ready_tick
+        ) in _TROOP.iter_unpack(view[offset : offset + n_troops * _TROOP.size]):
+            troop = Troop(
+                x=x,
+                y=y,
+                team=TEAMS[team],
+                lane_index=lane,
+                stats_idx=stats_idx,
+                uid=uid,
+                fixed_point=fixed_point,
+            )
+            troop.hp = hp
+            troop.state = STATES[state]
+            troop.facing_right = bool(facing)
+            troop.ready_tick = ready_tick
+            if dead:
+                troop.dead = True
+            troops.append(troop)
+            troops_listed.append(dead != 2)
+            targets.append(target)
+        offset += n_troops * _TROOP.size
+
+        shots = [
+            (x, y, tx, ty, speed, damage, target, source, bool(homing), team)
+            for x, y, tx, ty, speed, damage, target, source, homing, team in _SHOT.iter_unpack(
+                view[offset:]
+            )
+        ]
+
+        # Indices into what was just read; checked here so a bad byte is a
+        # SaveStateError rather than an IndexError (or a wrong entity) below.
+        if not all(-1 <= target < n_towers + n_troops for target in targets):
+            raise SaveStateError("corrupt save state: target index out of range")
+        if not (0 <= player_king < n_towers and 0 <= ai_king < n_towers):
+            raise SaveStateError("corrupt save state: king tower index out of range")
+        if winner >= len(WINNERS):
+            raise SaveStateError(f"corrupt save state: unknown winner {winner}")
+    except (struct.error, IndexError, KeyError) as exc:
+        raise SaveStateError(f"corrupt save state: {exc}") from exc
+
+    entities: List[object] = towers + troops
+    for troop, target in zip(troops, targets):
+        troop.current_target = entities[target] if target >= 0 else None
+
+    if world is None:
+        world = World(width, height, fixed_point)
+    world._tick = tick
+    world._next_uid = next_uid
+    world.player_coins = player_coins
+    world.ai_coins = ai_coins
+    world._clock_ms = clock_ms
+    world._set_timers({
+        PLAYER_COINS: player_coins_due,
+        AI_COINS: ai_coins_due,
+        AI_DECISION: ai_decision_due,
+    })
+    world.game_over = bool(game_over)
+    world.winner = WINNERS[winner]
+
+    world.player_king_tower = towers[player_king]
+    world.ai_king_tower = towers[ai_king]
+    world.player_towers = [t for t, ok in zip(towers, listed) if ok and t.team == "player"]
+    world.ai_towers = [t for t, ok in zip(towers, listed) if ok and t.team == "ai"]
+    world.player_troops = [t for t, ok in zip(troops, troops_listed) if ok and t.team == "player"]
+    world.ai_troops = [t for t, ok in zip(troops, troops_listed) if ok and t.team == "ai"]
+    world._reset_wakeups()
+    if world.projectiles is None and shots:
+        world.projectiles = ProjectilePool(fixed_point=fixed_point)
+    if world.projectiles is not None:
+        world.projectiles.load(shots)
+    return world
+
+
+def state_hash(world, data: Optional[bytes] = None) -> bytes:
+    """16-byte digest of `dumps(world)` (render-only fields are never saved)."""
+    if data is None:
+        data = dumps(world)
+    return hashlib.blake2b(data, digest_size=16).digest()
@@ -0,0 +1,145 @@
+# game/core/scenarios.py
+"""
+Stress scenarios: arenas pre-filled with many troops.
+
+Cards and coins limit a normal match to a handful of troops, so scaling
+work needs a way to start from a big battle directly:
+
+    world = build_world(Scenario(units=2000, layout="clustered", lanes=(1,)))
+
+Units are spawned straight into the World (no coins, no cards) using a
+seeded RNG, so the same Scenario always produces the same arena.
+
+`play_bottom_side()` is the shared driver for AI-vs-AI matches (the
+headless renderer, `main.py --watch`, the profiler and the policy table
+sampler): the heuristic policy plays the bottom side once a second.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence
+
+from game.ai.policy import choose_ai_action
+from game.core.world import HUD_HEIGHT, TICK_RATE, World
+from game.data.catalog import get_catalog
+from game.entities.troop import Troop
+from game.systems import fixed
+
+if TYPE_CHECKING:
+    from game.ai.state import GameState
+    from game.core.actions import PlayCardAction
+
+LAYOUTS = ("spread", "clustered")
+
+
+def _default_mix() -> Dict[str, float]:
+    return {"mario": 1.0, "bowser": 1.0, "peach": 1.0, "yoshi": 1.0}
+
+
+@dataclass
+class Scenario:
+    """
+    - `mix` maps troop keys (see troops.json) to relative weights.
+    - `lanes` / `teams` restrict where units go; units are dealt
+      round-robin over every (team, lane) pair.
+    - "spread" scatters units over the team's half of each lane;
+      "clustered" packs them in a tight blob just behind the river.
+    - `tower_hp` overrides king tower hp so huge battles do not end on
+      the first tick (None keeps the normal value).
+    - `fixed_point` builds a bit-exact fixed-point World (see
+      game/systems/fixed.py).
+    """
+
+    units: int = 100
+    mix: Dict[str, float] = field(default_factory=_default_mix)
+    lanes: Sequence[int] = (0, 1, 2)
+    teams: Sequence[str] = ("player", "ai")
+    layout: str = "spread"
+    seed: int = 0
+    tower_hp: Optional[float] = 1e9
+    builtin_ai: bool = False
+    fixed_point: bool = False
+
+
+def populate(world: World, scenario: Scenario) -> None:
+    """Add the scenario's units to `world`, bypassing coins."""
+    if scenario.layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {scenario.layout!r}; expected one of {LAYOUTS}.")
+
+    by_key = {troop.key: troop.id for troop in get_catalog().troops.values()}
+    unknown = sorted(set(scenario.mix) - set(by_key))
+    if unknown:
+        raise ValueError(f"Unknown troop keys in mix: {unknown}")
+
+    rng = random.Random(scenario.seed)
+    kinds = [by_key[key] for key in scenario.mix]
+    weights = [scenario.mix[key] for key in scenario.mix]
+
+    play_height = world.screen_height - HUD_HEIGHT
+    river_y = play_height // 2
+    slots = [(team, lane) for team in scenario.teams for lane in scenario.lanes]
+
+    for i in range(scenario.units):
+        team, lane_index = slots[i % len(slots)]
+        lane = world.get_lane(lane_index)
+        stats_idx = rng.choices(kinds, weights)[0]
+
+        # Each team's half, kept clear of the river and the king towers.
+        if team == "player":
+            near, far = river_y + 40, play_height - 110
+        else:
+            near, far = river_y - 40, 110
+
+        if scenario.layout == "spread":
+            x = rng.uniform(lane.x + 8, lane.x + lane.width - 8)
+            y = rng.uniform(min(near, far), max(near, far))
+        else:
+            x = rng.gauss(lane.x + lane.width / 2, lane.width / 10)
+            y = rng.gauss(near + (20 if team == "player" else -20), 15)
+            x = min(max(x, lane.x + 4), lane.x + lane.width - 4)
+
+        troop = Troop(
+            x=float(x),
+            y=float(y),
+            team=team,
+            lane_index=lane_index,
+            stats_idx=stats_idx,
+            uid=world._new_uid(),
+            fixed_point=world.fixed_point,
+        )
+        (world.player_troops if team == "player" else world.ai_troops).append(troop)
+
+    if scenario.tower_hp is not None:
+        hp = fixed.quantize(scenario.tower_hp) if world.fixed_point else scenario.tower_hp
+        for tower in world.towers:
+            tower.max_hp = tower.hp = hp
+
+
+def build_world(scenario: Scenario, screen_width: int = 450, screen_height: int = 750) -> World:
+    world = World(screen_width, screen_height, scenario.fixed_point)
+    if not scenario.builtin_ai:
+        world.ai_policy = None
+    populate(world, scenario)
+    return world
+
+
+def play_bottom_side(
+    world: World,
+    offset: int = 0,
+    policy: Optional[Callable[["GameState"], Optional["PlayCardAction"]]] = None,
+) -> None:
+    """
+    Let `policy` (the built-in heuristic by default) play the bottom side.
+
+    Call before every `world.step()`. The policy decides once a second, on
+    the tick where `world._tick % TICK_RATE == offset % TICK_RATE`; giving
+    otherwise identical matches different offsets makes them play out
+    differently.
+    """
+    if world._tick % TICK_RATE != offset % TICK_RATE:
+        return
+    action = (policy or choose_ai_action)(world.get_public_state("player"))
+    if action is not None:
+        world.apply_player_action(action)
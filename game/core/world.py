@@ -1,18 +1,74 @@
-import pygame
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, List, Mapping, Optional, Tuple
 
 from game.core.actions import PlayCardAction
 from game.entities.tower import Tower
-from game.entities.troop import Troop, generate_sprites
+from game.entities.troop import Troop, sprite_size
 from game.ai.policy import choose_ai_action
 from game.ai.state import GameState, LaneView, TroopView
-from game.data.loader import load_cards, load_troops
+from game.data.catalog import Catalog, get_catalog
+from game.systems.activity import Activity, y_extent
+from game.systems.navigation import Navigator, navigator_for
+from game.systems.projectiles import ProjectilePool
+from game.systems.spatial import (
+    SpatialHash, UnitIndex, crowd_cell_size, separate, separate_fixed,
+)
+from game.systems.telemetry import NO_ENTITY, SPAWN, EventBus
+from game.systems.timers import TimerQueue
+
+if TYPE_CHECKING:  # only get_render_info() needs pygame at runtime
+    import pygame
 
 
 COINS_MAX = 10
 COINS_REGEN_MS = 700  # match smash2.py pacing
+AI_DECISION_MS = 1000  # AI plays at most one card per second
 HUD_HEIGHT = 100  # Height of bottom UI/card bar (matches main.py UI_HEIGHT)
+TICK_RATE = 60  # simulation ticks per second (main.py caps the loop at 60 FPS)
+FIXED_DT = 1.0 / TICK_RATE  # timestep used by offline / headless runs
+
+# World timers on the simulation clock, in the order they fire when due together.
+PLAYER_COINS, AI_COINS, AI_DECISION = "player_coins", "ai_coins", "ai_decision"
+TIMERS = (PLAYER_COINS, AI_COINS, AI_DECISION)
+_TIMER_RANK = {name: rank for rank, name in enumerate(TIMERS)}
+
+
+def _crowd_cell_size(catalog: Catalog) -> float:
+    return crowd_cell_size(max(sprite_size(t.scale) // 2 for t in catalog.troops.values()))
+
+
+def _splash_index_params(catalog: Catalog) -> Tuple[float, float]:
+    """(cell size, slack) for the per-team splash indexes."""
+    radii = [t.splash.radius for t in catalog.troops.values() if t.splash is not None]
+    slack = max((t.speed for t in catalog.troops.values()), default=0.0) + 1.0
+    return (max(radii, default=48.0) + slack, slack)
+
+
+def _attack_ticks(catalog: Catalog) -> Mapping[int, int]:
+    """Troop stats_idx -> ticks between hits (troops.json `attack_interval`)."""
+    return MappingProxyType({
+        idx: max(1, round(troop.attack_interval * TICK_RATE))
+        for idx, troop in catalog.troops.items()
+    })
+
+
+def _build_card_defs(catalog: Catalog) -> Mapping[str, Mapping[str, int | float]]:
+    """Card id -> {"stats_idx", "cost"}; see `game/data/cards.json`."""
+    return MappingProxyType({
+        card.id: MappingProxyType({"stats_idx": card.troop_id, "cost": card.cost})
+        for card in catalog.cards.values()
+    })
+
+
+def _alive(entities: List) -> List:
+    """`entities` without the dead ones; the same list if nobody died."""
+    for entity in entities:
+        if getattr(entity, "dead", False):
+            return [t for t in entities if not getattr(t, "dead", False)]
+    return entities
 
 
 @dataclass
@@ -35,11 +91,17 @@ class World:
 
     This is a modularised port of the original smash2.py game rules,
     with AI control delegated through GameState + PlayCardAction.
+
+    `fixed_point=True` runs the bit-exact simulation mode: positions, hit
+    points and damage stay on a 1/256 grid and all geometry is integer
+    arithmetic (see game/systems/fixed.py), so the same inputs give the
+    same state hash on any machine.
     """
 
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, fixed_point: bool = False):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.fixed_point = fixed_point
 
         # Lanes
         self.lanes: List[Lane] = self._create_lanes()
@@ -50,27 +112,70 @@ class World:
         self.player_towers: List[Tower] = []
         self.ai_towers: List[Tower] = []
 
-        # Coins + timers
+        # Crowd separation grid, rebuilt every tick (see game/systems/spatial.py)
+        self._crowd_grid: SpatialHash[int] = SpatialHash(
+            get_catalog().derive(_crowd_cell_size)
+        )
+
+        # Per-team troop indexes for area damage queries, refreshed each tick
+        cell_size, slack = get_catalog().derive(_splash_index_params)
+        self._unit_index = {
+            "player": UnitIndex(cell_size, slack),
+            "ai": UnitIndex(cell_size, slack),
+        }
+
+        # Flow fields that route ground troops over the bridges (see
+        # game/systems/navigation.py); None lets them walk straight.
+        self.navigation: Optional[Navigator] = navigator_for(
+            screen_width, screen_height - HUD_HEIGHT, fixed_point
+        )
+
+        # Shots in flight for ranged troops and towers (see
+        # game/systems/projectiles.py); None makes every hit instant.
+        self.projectiles: Optional[ProjectilePool] = ProjectilePool(fixed_point=fixed_point)
+
+        # Coins
         self.player_coins: float = 5.0
         self.ai_coins: float = 5.0
-        self._player_coins_timer: float = 0.0
-        self._ai_coins_timer: float = 0.0
 
-        # AI decision timer
-        self._ai_decision_timer: float = 0.0
+        # Scheduled events (see game/systems/timers.py). `_timers` holds
+        # coin regeneration and AI decisions on the simulation clock
+        # (`_clock_ms`); `_wakeups` holds the tick each cooling tower or
+        # troop may attack again. Nothing is counted down per tick.
+        self._clock_ms: float = 0.0
+        self._timers: TimerQueue[str] = TimerQueue()
+        self._wakeups: TimerQueue[object] = TimerQueue()
+
+        # Towers and troops with nothing to do are skipped until something
+        # wakes them (see game/systems/activity.py); `activity.counts` has
+        # this tick's awake / asleep totals.
+        self.activity = Activity()
+        self._set_timers({
+            PLAYER_COINS: COINS_REGEN_MS,
+            AI_COINS: COINS_REGEN_MS,
+            AI_DECISION: AI_DECISION_MS,
+        })
+
+        # `ai_policy` maps the AI's GameState to an action; replays and
+        # network play swap it out (None disables it).
         self._tick: int = 0
+        self.ai_policy: Optional[Callable[[GameState], Optional[PlayCardAction]]] = choose_ai_action
+
+        # Optional replay recorder (see game/core/replay.py)
+        self.recorder = None
+        self._in_step: bool = False
+
+        # Optional telemetry bus (see game/systems/telemetry.py)
+        self.events: Optional[EventBus] = None
+
+        # Optional per-tick state export (see game/net/shared_state.py)
+        self.state_export = None
+        self._next_uid: int = 1
 
         # Game over state
         self.game_over: bool = False
         self.winner: str | None = None  # "player" or "ai"
 
-        # Card → troop mapping, now data‑driven from JSON.
-        # See `game/data/cards.json` and `game/data/troops.json`.
-        self.card_defs: Dict[str, Dict[str, int | float]] = self._build_card_defs()
-
-        # Initialise sprites (requires pygame to be initialised already)
-        generate_sprites()
-
         self._create_king_towers()
 
     # ------------------------------------------------------------------
@@ -131,39 +236,27 @@ class World:
         player_y = min(player_y, battlefield_bottom - tower_radius - vertical_margin)
         ai_y = max(ai_y, battlefield_top + tower_radius + vertical_margin)
 
-        self.player_king_tower = Tower(cx, player_y, team="player", is_king=True)
-        self.ai_king_tower = Tower(cx, ai_y, team="ai", is_king=True)
+        fixed_point = self.fixed_point
+        self.player_king_tower = Tower(
+            cx, player_y, team="player", is_king=True, uid=self._new_uid(), fixed_point=fixed_point
+        )
+        self.ai_king_tower = Tower(
+            cx, ai_y, team="ai", is_king=True, uid=self._new_uid(), fixed_point=fixed_point
+        )
 
         self.player_towers = [self.player_king_tower]
         self.ai_towers = [self.ai_king_tower]
 
-    def _build_card_defs(self) -> Dict[str, Dict[str, int | float]]:
+    @property
+    def card_defs(self) -> Mapping[str, Mapping[str, int | float]]:
         """
-        Build per-card metadata from JSON.
+        Per-card metadata, shared by every World through the data catalog.
 
         Each card knows:
         - which troop stats index it spawns (stats_idx),
         - how many coins it costs to play (cost).
         """
-        # Map troop_id -> stats_idx so card data does not need to repeat it.
-        troops = {int(t["id"]): t for t in load_troops()}
-
-        card_defs: Dict[str, Dict[str, int | float]] = {}
-        for card in load_cards():
-            card_id = str(card["id"])
-            troop_id = int(card["troop_id"])
-            coins_cost = float(card["coins_cost"])
-
-            if troop_id not in troops:
-                # If data is inconsistent, skip rather than crash the whole game.
-                continue
-
-            card_defs[card_id] = {
-                "stats_idx": troop_id,
-                "cost": coins_cost,
-            }
-
-        return card_defs
+        return get_catalog().derive(_build_card_defs)
 
     def get_lane(self, index: int) -> Lane:
         if index < 0 or index >= len(self.lanes):
@@ -178,6 +271,11 @@ class World:
     def towers(self) -> List[Tower]:
         return self.player_towers + self.ai_towers
 
+    def _new_uid(self) -> int:
+        uid = self._next_uid
+        self._next_uid += 1
+        return uid
+
     def _spawn_troop(self, lane_index: int, team: str, stats_idx: int) -> None:
         lane = self.get_lane(lane_index)
         x = lane.x + lane.width // 2
@@ -188,12 +286,24 @@ class World:
         else:
             y = self.ai_king_tower.get_center()[1] + 60
 
-        troop = Troop(x=float(x), y=float(y), team=team, lane_index=lane_index, stats_idx=stats_idx)
+        troop = Troop(
+            x=float(x),
+            y=float(y),
+            team=team,
+            lane_index=lane_index,
+            stats_idx=stats_idx,
+            uid=self._new_uid(),
+            fixed_point=self.fixed_point,
+        )
         if team == "player":
             self.player_troops.append(troop)
         else:
             self.ai_troops.append(troop)
 
+        if self.events is not None:
+            self.events.tick = self._tick
+            self.events.emit(SPAWN, troop.uid, NO_ENTITY, stats_idx, troop.x, troop.y)
+
     # ------------------------------------------------------------------
     # Actions
     # ------------------------------------------------------------------
@@ -220,6 +330,11 @@ class World:
         lane_index = max(0, min(len(self.lanes) - 1, action.lane_index))
         self._spawn_troop(lane_index=lane_index, team=team, stats_idx=stats_idx)
 
+        if self.recorder is not None:
+            self.recorder.record_action(
+                self._tick, team, action.card_id, lane_index, in_step=self._in_step
+            )
+
     def apply_player_action(self, action: PlayCardAction) -> None:
         """Called when the human plays a card."""
         if self.game_over:
@@ -233,42 +348,162 @@ class World:
         self._apply_action_generic(action, team="ai")
 
     # ------------------------------------------------------------------
-    # Simulation
+    # Timers
     # ------------------------------------------------------------------
-    def _regen_coins(self, dt: float) -> None:
-        ms = dt * 1000.0
+    def _set_timers(self, due: Mapping[str, float]) -> None:
+        """Replace the world timers with `due` (timer name -> clock ms)."""
+        self._timers.clear()
+        for name in TIMERS:
+            self._timers.schedule(due[name], name, _TIMER_RANK[name])
+
+    def _timer_due(self) -> Mapping[str, float]:
+        """Timer name -> clock ms it fires at next (see `TIMERS`)."""
+        return {name: due for due, name in self._timers.entries()}
+
+    def _reset_wakeups(self) -> None:
+        """Rebuild the wake-up queue and sleep state from every entity's `ready_tick`."""
+        self._wakeups.clear()
+        for entity in self.towers + self.troops:
+            entity.cooling = entity.ready_tick > self._tick
+            if entity.cooling:
+                self._wakeups.schedule(entity.ready_tick, entity)
+        self.activity.reset(self.towers, self.troops)
+
+    def _cool_down(self, entity, ticks: int) -> None:
+        """`entity` just attacked; wake it `ticks` ticks from now."""
+        entity.ready_tick = self._tick + ticks
+        self._wakeups.schedule(entity.ready_tick, entity)
+
+    def _run_timers(self) -> None:
+        """Fire every world timer that is due on the simulation clock."""
+        timers = self._timers
+        for due, name in timers.pop_due(self._clock_ms):
+            if name == AI_DECISION:
+                # Next decision a full interval after this one was made.
+                timers.schedule(self._clock_ms + AI_DECISION_MS, name, _TIMER_RANK[name])
+                if not self.game_over:
+                    self._run_ai_policy()
+                continue
 
-        self._player_coins_timer += ms
-        self._ai_coins_timer += ms
+            # Coin timers repeat on a fixed grid and catch up after long steps.
+            timers.schedule(due + COINS_REGEN_MS, name, _TIMER_RANK[name])
+            self._regen_coins(name)
 
-        while self._player_coins_timer >= COINS_REGEN_MS:
+    def _regen_coins(self, timer: str) -> None:
+        if timer == PLAYER_COINS:
             if self.player_coins < COINS_MAX:
                 self.player_coins += 1
-            self._player_coins_timer -= COINS_REGEN_MS
+        elif self.ai_coins < COINS_MAX:
+            self.ai_coins += 1
 
-        while self._ai_coins_timer >= COINS_REGEN_MS:
-            if self.ai_coins < COINS_MAX:
-                self.ai_coins += 1
-            self._ai_coins_timer -= COINS_REGEN_MS
+    def _run_ai_policy(self) -> None:
+        if self.ai_policy is None:
+            return
+        state = self.get_public_state()
+        action = self.ai_policy(state)
+        if action is not None:
+            self._in_step = True
+            try:
+                self.apply_ai_action(action)
+            finally:
+                self._in_step = False
 
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
     def _update_combat(self) -> None:
-        # Towers attack first
-        for tower in list(self.player_towers):
-            tower.update(self.ai_troops)
-        for tower in list(self.ai_towers):
-            tower.update(self.player_troops)
-
-        # Troops fight troops + towers
-        for troop in list(self.player_troops):
-            troop.update(self.ai_troops, self.ai_towers)
-        for troop in list(self.ai_troops):
-            troop.update(self.player_troops, self.player_towers)
-
-        # Remove dead entities
-        self.player_troops = [t for t in self.player_troops if not getattr(t, "dead", False)]
-        self.ai_troops = [t for t in self.ai_troops if not getattr(t, "dead", False)]
-        self.player_towers = [t for t in self.player_towers if not getattr(t, "dead", False)]
-        self.ai_towers = [t for t in self.ai_towers if not getattr(t, "dead", False)]
+        """
+        One tick of fighting, as separately profiled phases (see game/profile.py):
+        towers, troops, projectiles, then cleanup.
+        """
+        # Towers and troops whose cooldown ends this tick may attack again
+        activity = self.activity
+        for _, entity in self._wakeups.pop_due(self._tick):
+            activity.wake(entity)
+
+        self._update_towers()
+        self._update_troops()
+        self._update_projectiles()
+        self._cleanup()
+
+    def _update_towers(self) -> None:
+        """Towers attack first, if an enemy is inside their wake band."""
+        events = self.events
+        projectiles = self.projectiles
+        activity = self.activity
+        player_towers = activity.awake_towers(self.player_towers, y_extent(self.ai_troops))
+        ai_towers = activity.awake_towers(self.ai_towers, y_extent(self.player_troops))
+        for tower in player_towers:
+            if tower.update(self.ai_troops, events, projectiles):
+                self._cool_down(tower, tower.shot_ticks)
+        for tower in ai_towers:
+            if tower.update(self.player_troops, events, projectiles):
+                self._cool_down(tower, tower.shot_ticks)
+
+        counts = activity.counts
+        counts.towers_awake = len(player_towers) + len(ai_towers)
+        counts.towers_asleep = len(self.player_towers) + len(self.ai_towers) - counts.towers_awake
+
+    def _update_troops(self) -> None:
+        """Awake troops fight troops + towers."""
+        events = self.events
+        projectiles = self.projectiles
+        activity = self.activity
+        player_index = self._unit_index["player"]
+        ai_index = self._unit_index["ai"]
+        player_index.reset(self.player_troops)
+        ai_index.reset(self.ai_troops)
+
+        # Sleep state only changes for the troop being updated, so the
+        # lists are walked in place rather than filtered first.
+        attack_ticks = get_catalog().derive(_attack_ticks)
+        navigation = self.navigation
+        awake = 0
+        for troop in self.player_troops:
+            if troop.asleep:
+                continue
+            awake += 1
+            if troop.update(self.ai_troops, self.ai_towers, events, projectiles, ai_index, navigation):
+                self._cool_down(troop, attack_ticks[troop.stats_idx])
+            activity.settle(troop)
+        for troop in self.ai_troops:
+            if troop.asleep:
+                continue
+            awake += 1
+            if troop.update(
+                self.player_troops, self.player_towers, events, projectiles, player_index, navigation
+            ):
+                self._cool_down(troop, attack_ticks[troop.stats_idx])
+            activity.settle(troop)
+
+        counts = activity.counts
+        counts.troops_awake = awake
+        counts.troops_asleep = len(self.player_troops) + len(self.ai_troops) - counts.troops_awake
+
+    def _update_projectiles(self) -> None:
+        """Shots in flight move and land."""
+        if self.projectiles is not None and self.projectiles.active:
+            self.projectiles.update(self.towers + self.troops, self.events)
+
+    def _cleanup(self) -> None:
+        """Drop the dead, spread the crowd and check for a winner."""
+        # Sleepers whose target died this tick look for a new one next tick
+        self.activity.wake_orphans()
+
+        # Remove dead entities (the lists are only rebuilt on a death)
+        self.player_troops = _alive(self.player_troops)
+        self.ai_troops = _alive(self.ai_troops)
+        self.player_towers = _alive(self.player_towers)
+        self.ai_towers = _alive(self.ai_towers)
+
+        # Keep survivors from stacking on each other
+        (separate_fixed if self.fixed_point else separate)(
+            self.player_troops + self.ai_troops,
+            self._crowd_grid,
+            self.screen_width,
+            self.screen_height - HUD_HEIGHT,
+            self.navigation.walkable if self.navigation is not None else None,
+        )
 
         # Win/loss conditions: king towers destroyed
         if not any(getattr(t, "is_king", False) for t in self.player_towers) and not self.game_over:
@@ -284,77 +519,100 @@ class World:
             return
 
         self._tick += 1
-        self._regen_coins(dt)
+        self._clock_ms += dt * 1000.0
+        if self.events is not None:
+            self.events.tick = self._tick
         self._update_combat()
 
-        # AI decision once per ~1 second
-        self._ai_decision_timer += dt
-        if self._ai_decision_timer >= 1.0 and not self.game_over:
-            self._ai_decision_timer = 0.0
-            state = self.get_public_state()
-            action = choose_ai_action(state)
-            if action is not None:
-                self.apply_ai_action(action)
+        # Coin regeneration and AI decisions that fell due during this step.
+        # Coins used to regenerate before combat; nothing in combat reads
+        # them, and coins still come before the AI decision, so moving them
+        # here changes no outcome.
+        if self._timers.next_due() <= self._clock_ms:
+            self._run_timers()
+
+        if self.recorder is not None:
+            self.recorder.on_tick(self)
+        if self.events is not None:
+            self.events.end_tick()
+        if self.state_export is not None:
+            self.state_export.publish(self)
 
     # ------------------------------------------------------------------
     # AI state view
     # ------------------------------------------------------------------
-    def _build_lane_views_from_ai_perspective(self) -> List[LaneView]:
+    def _build_lane_views(self, perspective: str) -> List[LaneView]:
         lanes: List[List[TroopView]] = [[] for _ in self.lanes]
 
-        def add_troops(source: List[Troop], owner_label: str) -> None:
+        # The policy assumes its own base is at the top of the arena, so the
+        # player's view is mirrored vertically around the battlefield.
+        mirror_y = perspective == "player"
+        battlefield_bottom = float(self.screen_height - HUD_HEIGHT)
+
+        def add_troops(source: List[Troop]) -> None:
             for troop in source:
                 lane_idx = max(0, min(len(self.lanes) - 1, troop.lane_index))
-                # From the AI policy's perspective, it is always "player"
-                owner = "player" if owner_label == "ai" else "ai"
+                # From the viewing side's perspective, it is always "player"
+                owner = "player" if troop.team == perspective else "ai"
+                y = battlefield_bottom - float(troop.y) if mirror_y else float(troop.y)
                 lanes[lane_idx].append(
                     TroopView(
                         owner=owner,  # type: ignore[arg-type]
                         lane_index=lane_idx,
-                        y=float(troop.y),
+                        y=y,
                         hp=float(troop.hp),
                         max_hp=float(troop.max_hp),
                         troop_id=str(troop.stats_idx),
                     )
                 )
 
-        add_troops(self.player_troops, "player")
-        add_troops(self.ai_troops, "ai")
+        add_troops(self.player_troops)
+        add_troops(self.ai_troops)
 
         return [
             LaneView(index=i, troops=lane_troops)
             for i, lane_troops in enumerate(lanes)
         ]
 
-    def get_public_state(self) -> GameState:
+    def get_public_state(self, perspective: str = "ai") -> GameState:
         """
-        Return an abstract game state view for the AI.
+        Return an abstract game state view for one side (the AI by default).
 
-        IMPORTANT: we present the world from the AI's perspective as the
-        "player" in GameState so that the baseline policy can be reused
-        without modification.
+        IMPORTANT: the viewing side is always presented as the "player" in
+        GameState so that the baseline policy can be reused without
+        modification. `perspective="player"` gives the human side the same
+        view (mirrored vertically), which lets bots drive either team.
         """
-        lanes = self._build_lane_views_from_ai_perspective()
+        if perspective not in ("player", "ai"):
+            raise ValueError(f"Unknown perspective {perspective!r}.")
 
-        player_base_hp = float(self.ai_king_tower.hp)
-        ai_base_hp = float(self.player_king_tower.hp)
+        lanes = self._build_lane_views(perspective)
+
+        if perspective == "ai":
+            my_tower, enemy_tower = self.ai_king_tower, self.player_king_tower
+            my_coins, enemy_coins = self.ai_coins, self.player_coins
+        else:
+            my_tower, enemy_tower = self.player_king_tower, self.ai_king_tower
+            my_coins, enemy_coins = self.player_coins, self.ai_coins
 
         return GameState(
-            player_base_hp=player_base_hp,
-            ai_base_hp=ai_base_hp,
-            player_coins=float(self.ai_coins),
-            ai_coins=float(self.player_coins),
+            player_base_hp=float(my_tower.hp),
+            ai_base_hp=float(enemy_tower.hp),
+            player_coins=float(my_coins),
+            ai_coins=float(enemy_coins),
             max_coins=float(COINS_MAX),
             lanes=lanes,
             tick=self._tick,
             is_terminal=self.game_over,
-            winner=("player" if self.winner == "ai" else "ai") if self.winner else None,
+            winner=("player" if self.winner == perspective else "ai") if self.winner else None,
         )
 
     # ------------------------------------------------------------------
     # Rendering info
     # ------------------------------------------------------------------
     def get_render_info(self, screen_height: int) -> WorldRenderInfo:
+        import pygame
+
         lane_rects = [
             pygame.Rect(lane.x, 0, lane.width, screen_height) for lane in self.lanes
         ]
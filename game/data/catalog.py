@@ -0,0 +1,347 @@
+# game/data/catalog.py
+"""
+Typed, validated view of `cards.json` + `troops.json`.
+
+The catalog is parsed once per process and shared by World, Troop and the
+AI. `get_catalog()` re-stats the JSON files at most once per
+`RELOAD_CHECK_INTERVAL` seconds and transparently reloads when either
+mtime changes, so balance edits show up without a restart.
+
+Consumers that need the data in a different shape (e.g. the AI card pool)
+should build it through `Catalog.derive()`, which memoises the result on
+the catalog instance and therefore rebuilds it automatically after a
+reload.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+from game.data.loader import DATA_DIR
+
+CARDS_FILE = "cards.json"
+TROOPS_FILE = "troops.json"
+
+RELOAD_CHECK_INTERVAL = 1.0  # seconds between mtime checks
+
+TARGET_PREFS = ("all", "building")
+SPLASH_TRIGGERS = ("building", "troop", "any")  # what the main hit must land on
+
+T = TypeVar("T")
+
+
+class CatalogError(ValueError):
+    """Raised when the game data files are malformed or inconsistent."""
+
+
+@dataclass(frozen=True)
+class SplashDef:
+    """
+    Area damage around a troop's main target, applied on each hit that
+    matches `trigger`. Enemy troops strictly within `radius` of the target
+    take `damage_ratio` x the hit's damage, scaled down linearly by up to
+    `falloff` (0 = flat, 1 = nothing at the edge) with distance.
+    """
+
+    radius: float
+    damage_ratio: float
+    falloff: float = 0.0
+    trigger: str = "any"
+
+
+@dataclass(frozen=True)
+class TroopDef:
+    id: int
+    key: str
+    name: str
+    role: str
+    hp: float
+    damage: float
+    speed: float
+    range: float
+    target: str
+    is_flying: bool
+    can_hit_air: bool
+    scale: float
+    projectile_speed: float = 0.0  # px per tick; 0 = instant hits
+    homing: bool = True
+    splash: Optional[SplashDef] = None
+    attack_interval: float = 1.0  # seconds between hits; `damage` is per hit
+
+    @property
+    def dps(self) -> float:
+        """Damage per second of sustained attacks."""
+        return self.damage / self.attack_interval
+
+
+@dataclass(frozen=True)
+class CardDef:
+    id: str
+    name: str
+    cost: float
+    troop_id: int
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """
+    Immutable snapshot of all game data.
+
+    `cards.json` is authoritative for card costs; the `coins_cost` entries
+    in `troops.json` are informational only.
+    """
+
+    troops: Mapping[int, TroopDef]
+    cards: Mapping[str, CardDef]
+    fingerprint: str  # sha1 of the raw JSON bytes, stable across machines
+    _derived: Dict[Callable[["Catalog"], Any], Any] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def troop_for_card(self, card_id: str) -> TroopDef:
+        return self.troops[self.cards[card_id].troop_id]
+
+    def derive(self, builder: Callable[["Catalog"], T]) -> T:
+        """Return `builder(self)`, computed once per catalog instance."""
+        try:
+            return self._derived[builder]
+        except KeyError:
+            value = builder(self)
+            self._derived[builder] = value
+            return value
+
+
+# ---------------------------------------------------------------------------
+# Parsing + validation
+# ---------------------------------------------------------------------------
+
+def _require(entry: Mapping[str, Any], key: str, where: str) -> Any:
+    if key not in entry:
+        raise CatalogError(f"{where}: missing required field {key!r}")
+    return entry[key]
+
+
+def _number(
+    entry: Mapping[str, Any],
+    key: str,
+    where: str,
+    minimum: float = 0.0,
+    default: Optional[float] = None,
+) -> float:
+    """`entry[key]` as a float >= `minimum`; optional fields pass a `default`."""
+    if default is not None and key not in entry:
+        return default
+    value = _require(entry, key, where)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise CatalogError(f"{where}: {key!r} must be a number, got {value!r}")
+    if value < minimum:
+        raise CatalogError(f"{where}: {key!r} must be >= {minimum}, got {value!r}")
+    return float(value)
+
+
+def _flag(entry: Mapping[str, Any], key: str, where: str, default: bool = False) -> bool:
+    value = entry.get(key, default)
+    if not isinstance(value, bool):
+        raise CatalogError(f"{where}: {key!r} must be true/false, got {value!r}")
+    return value
+
+
+def _parse_splash(raw: Any, where: str) -> Optional[SplashDef]:
+    if raw is None:
+        return None
+    if not isinstance(raw, dict):
+        raise CatalogError(f"{where}: expected an object")
+    trigger = str(raw.get("trigger", "any"))
+    if trigger not in SPLASH_TRIGGERS:
+        raise CatalogError(f"{where}: 'trigger' must be one of {SPLASH_TRIGGERS}, got {trigger!r}")
+    falloff = _number(raw, "falloff", where, default=0.0)
+    if not 0.0 <= falloff <= 1.0:
+        raise CatalogError(f"{where}: 'falloff' must be between 0 and 1, got {falloff!r}")
+    radius = _number(raw, "radius", where)
+    if radius <= 0:
+        raise CatalogError(f"{where}: 'radius' must be positive")
+    return SplashDef(
+        radius=radius,
+        damage_ratio=_number(raw, "damage_ratio", where),
+        falloff=falloff,
+        trigger=trigger,
+    )
+
+
+def _parse_troops(raw: Any) -> Dict[int, TroopDef]:
+    if not isinstance(raw, list):
+        raise CatalogError(f"{TROOPS_FILE}: expected a list of troops")
+
+    troops: Dict[int, TroopDef] = {}
+    for pos, entry in enumerate(raw):
+        where = f"{TROOPS_FILE}[{pos}]"
+        if not isinstance(entry, dict):
+            raise CatalogError(f"{where}: expected an object")
+
+        troop_id = _require(entry, "id", where)
+        if isinstance(troop_id, bool) or not isinstance(troop_id, int):
+            raise CatalogError(f"{where}: 'id' must be an integer, got {troop_id!r}")
+        if troop_id in troops:
+            raise CatalogError(f"{where}: duplicate troop id {troop_id}")
+
+        target = str(entry.get("target", "all"))
+        if target not in TARGET_PREFS:
+            raise CatalogError(f"{where}: 'target' must be one of {TARGET_PREFS}, got {target!r}")
+
+        troops[troop_id] = TroopDef(
+            id=troop_id,
+            key=str(entry.get("key", troop_id)),
+            name=str(entry.get("name", f"Troop {troop_id}")),
+            role=str(entry.get("role", "brawler_dps")),
+            hp=_number(entry, "hp", where, minimum=1.0),
+            damage=_number(entry, "damage", where),
+            speed=_number(entry, "speed", where),
+            range=_number(entry, "range", where),
+            target=target,
+            is_flying=_flag(entry, "is_flying", where),
+            can_hit_air=_flag(entry, "can_hit_air", where),
+            scale=_number(entry, "scale", where, default=2.5),
+            projectile_speed=_number(entry, "projectile_speed", where, default=0.0),
+            homing=_flag(entry, "homing", where, default=True),
+            splash=_parse_splash(entry.get("splash"), f"{where}.splash"),
+            attack_interval=_number(entry, "attack_interval", where, default=1.0),
+        )
+        if troops[troop_id].scale <= 0:
+            raise CatalogError(f"{where}: 'scale' must be positive")
+        if troops[troop_id].attack_interval <= 0:
+            raise CatalogError(f"{where}: 'attack_interval' must be positive")
+        if troops[troop_id].splash is not None and troops[troop_id].projectile_speed > 0:
+            # Splash is resolved with instant hits only; a shot lands later.
+            raise CatalogError(f"{where}: 'splash' cannot be combined with 'projectile_speed'")
+    return troops
+
+
+def _parse_cards(raw: Any, troops: Mapping[int, TroopDef]) -> Dict[str, CardDef]:
+    if not isinstance(raw, list):
+        raise CatalogError(f"{CARDS_FILE}: expected a list of cards")
+
+    cards: Dict[str, CardDef] = {}
+    for pos, entry in enumerate(raw):
+        where = f"{CARDS_FILE}[{pos}]"
+        if not isinstance(entry, dict):
+            raise CatalogError(f"{where}: expected an object")
+
+        card_id = str(_require(entry, "id", where))
+        if card_id in cards:
+            raise CatalogError(f"{where}: duplicate card id {card_id!r}")
+
+        troop_id = _require(entry, "troop_id", where)
+        if troop_id not in troops:
+            raise CatalogError(f"{where}: card {card_id!r} references unknown troop {troop_id!r}")
+
+        cost = _number(entry, "coins_cost", where)
+        if cost <= 0:
+            raise CatalogError(f"{where}: 'coins_cost' must be positive")
+
+        cards[card_id] = CardDef(
+            id=card_id,
+            name=str(entry.get("name", card_id)),
+            cost=cost,
+            troop_id=int(troop_id),
+        )
+    return cards
+
+
+def parse_catalog(cards_bytes: bytes, troops_bytes: bytes) -> Catalog:
+    """Build a Catalog from raw JSON bytes, raising CatalogError on bad data."""
+    try:
+        raw_troops = json.loads(troops_bytes)
+        raw_cards = json.loads(cards_bytes)
+    except ValueError as exc:
+        raise CatalogError(f"invalid JSON in game data: {exc}") from exc
+
+    troops = _parse_troops(raw_troops)
+    cards = _parse_cards(raw_cards, troops)
+
+    digest = hashlib.sha1()
+    digest.update(cards_bytes)
+    digest.update(b"\0")
+    digest.update(troops_bytes)
+
+    return Catalog(
+        troops=MappingProxyType(troops),
+        cards=MappingProxyType(cards),
+        fingerprint=digest.hexdigest(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache with mtime-based reload
+# ---------------------------------------------------------------------------
+
+_lock = threading.Lock()
+_catalog: Optional[Catalog] = None
+_mtimes: Tuple[int, int] = (0, 0)
+_next_check: float = 0.0
+
+
+def _stat_mtimes(data_dir: Path) -> Tuple[int, int]:
+    return (
+        (data_dir / CARDS_FILE).stat().st_mtime_ns,
+        (data_dir / TROOPS_FILE).stat().st_mtime_ns,
+    )
+
+
+def _read_catalog(data_dir: Path) -> Catalog:
+    cards_bytes = (data_dir / CARDS_FILE).read_bytes()
+    troops_bytes = (data_dir / TROOPS_FILE).read_bytes()
+    return parse_catalog(cards_bytes, troops_bytes)
+
+
+def get_catalog() -> Catalog:
+    """
+    Return the shared catalog, loading it on first use.
+
+    A failed hot reload (e.g. a half-saved JSON edit) keeps serving the
+    previous catalog and emits a warning; a failed first load raises.
+    """
+    global _catalog, _mtimes, _next_check
+
+    now = time.monotonic()
+    catalog = _catalog
+    if catalog is not None and now < _next_check:
+        return catalog
+
+    with _lock:
+        if _catalog is not None and now < _next_check:
+            return _catalog
+        _next_check = now + RELOAD_CHECK_INTERVAL
+
+        mtimes = _stat_mtimes(DATA_DIR)
+        if _catalog is not None and mtimes == _mtimes:
+            return _catalog
+
+        try:
+            loaded = _read_catalog(DATA_DIR)
+        except (CatalogError, OSError) as exc:
+            if _catalog is None:
+                raise
+            warnings.warn(f"Keeping previous game data; reload failed: {exc}")
+            _mtimes = mtimes
+            return _catalog
+
+        _catalog = loaded
+        _mtimes = mtimes
+        return loaded
+
+
+def reload_catalog() -> Catalog:
+    """Force a reload on the next access (e.g. after writing the JSON files)."""
+    global _next_check, _mtimes
+    with _lock:
+        _next_check = 0.0
+        _mtimes = (0, 0)
+    return get_catalog()
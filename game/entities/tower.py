@@ -2,9 +2,17 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import pygame
+from game.systems import fixed
+from game.systems.telemetry import ATTACK, record_hit
+
+if TYPE_CHECKING:  # pygame is only imported once something is drawn
+    import pygame
+
+    from game.entities.troop import Troop
+    from game.systems.projectiles import ProjectilePool
+    from game.systems.telemetry import EventBus
 
 BLACK = (20, 20, 20)
 GREEN_HP = (50, 205, 50)
@@ -34,11 +42,16 @@ class Tower:
     hp: int = 2500
     range: float = 150.0
     damage: float = 4.0
-    max_cooldown: int = 20
+    max_cooldown: int = 20  # idle ticks after each shot (see `shot_ticks`)
+    projectile_speed: float = 9.0  # px per tick when a projectile pool is attached
 
     # Runtime state (not part of constructor API)
-    attack_cooldown: int = 0
+    ready_tick: int = 0  # tick the next shot is allowed on (scheduled by World)
+    cooling: bool = False  # between shots; cleared by World's wake-up timer
+    asleep: bool = False  # skipped by World this tick (see game/systems/activity.py)
     dead: bool = False
+    uid: int = 0  # assigned by World; stable id for telemetry / saves
+    fixed_point: bool = False  # integer geometry on a 1/256 grid (game/systems/fixed.py)
 
     # Rendering helpers
     radius: int = 35
@@ -60,58 +73,95 @@ class Tower:
             self._size = 70
 
         self.radius = self._size // 2
-        self._rect = pygame.Rect(0, 0, self._size, self._size)
-        self._rect.center = (int(self.x), int(self.y))
+
+        if self.fixed_point:
+            q = fixed.quantize
+            self.x, self.y = q(self.x), q(self.y)
+            self.range, self.damage = q(self.range), q(self.damage)
+            self.projectile_speed = q(self.projectile_speed)
+
+    @property
+    def shot_ticks(self) -> int:
+        """
+        Ticks from one shot to the next: the shot itself plus `max_cooldown`
+        idle ticks, the cadence of the old per-tick countdown.
+        """
+        return self.max_cooldown + 1
 
     # ------------------------------------------------------------------
     # Simulation
     # ------------------------------------------------------------------
-    def update(self, enemy_troops: List["Troop"]) -> None:
+    def update(
+        self,
+        enemy_troops: List["Troop"],
+        events: Optional["EventBus"] = None,
+        projectiles: Optional["ProjectilePool"] = None,
+    ) -> bool:
         """
-        Attack the closest enemy troop in range, if any.
+        Attack the closest enemy troop in range, if any; True if it did.
 
-        Pure game logic – no drawing calls here.
+        Pure game logic – no drawing calls here. Hits are reported to
+        `events` when a telemetry bus is attached. With a projectile pool
+        the tower fires a homing shot instead of hitting instantly.
+        After an attack the tower is `cooling` and skips its scan until
+        World's timer queue wakes it `shot_ticks` ticks later.
         """
         self._last_attack_line = None
 
         if self.hp <= 0:
             self.dead = True
-            return
-
-        if self.attack_cooldown > 0:
-            self.attack_cooldown -= 1
-            return
+            return False
 
-        if not enemy_troops:
-            return
+        if self.cooling or not enemy_troops:
+            return False
 
-        my_cx, my_cy = self._rect.center
+        my_cx, my_cy = self.get_center()
         closest = None
         min_dist = float("inf")
 
-        for troop in enemy_troops:
-            tx, ty = troop.get_center()
-            dist = math.hypot(tx - my_cx, ty - my_cy)
-            if dist < self.range and dist < min_dist and troop.hp > 0:
-                min_dist = dist
-                closest = troop
+        if self.fixed_point:
+            # Squared integer distances against the squared range
+            min_sq = self.range * self.range
+            for troop in enemy_troops:
+                tx, ty = troop.get_center()
+                dx, dy = tx - my_cx, ty - my_cy
+                d2 = dx * dx + dy * dy
+                if d2 < min_sq and troop.hp > 0:
+                    min_sq = d2
+                    closest = troop
+        else:
+            for troop in enemy_troops:
+                tx, ty = troop.get_center()
+                dist = math.hypot(tx - my_cx, ty - my_cy)
+                if dist < self.range and dist < min_dist and troop.hp > 0:
+                    min_dist = dist
+                    closest = troop
 
         if closest is None:
-            return
+            return False
+
+        self.cooling = True
+        if projectiles is not None:
+            projectiles.fire(self, closest, self.damage, self.projectile_speed)
+            return True
 
         # Apply damage
         closest.hp -= self.damage
         if closest.hp <= 0:
             closest.dead = True
+        if events is not None:
+            record_hit(events, ATTACK, self, closest, self.damage)
 
         # Remember line to draw during render
-        self._last_attack_line = (self._rect.center, closest.get_center())
-        self.attack_cooldown = self.max_cooldown
+        self._last_attack_line = (self.get_center(), closest.get_center())
+        return True
 
     # ------------------------------------------------------------------
     # Rendering helpers
     # ------------------------------------------------------------------
     def _draw_health_bar(self, screen: pygame.Surface) -> None:
+        import pygame
+
         if self.hp >= self.max_hp:
             return
 
@@ -137,6 +187,12 @@ class Tower:
         pygame.draw.rect(screen, GREEN_HP, hp_rect)
 
     def draw(self, screen: pygame.Surface) -> None:
+        import pygame
+
+        if self._rect is None:
+            self._rect = pygame.Rect(0, 0, self._size, self._size)
+            self._rect.center = self.get_center()
+
         # Core body with darker outline for better readability
         base_color = TEAM_PLAYER if self.team == "player" else TEAM_ENEMY
         outline_color = (20, 60, 120) if self.team == "player" else (120, 20, 20)
@@ -186,17 +242,18 @@ class Tower:
     # Public snapshots
     # ------------------------------------------------------------------
     def get_center(self) -> Tuple[int, int]:
-        return self._rect.center
+        return (int(self.x), int(self.y))
 
     def to_render_dict(self) -> dict:
         """
         Return a small, JSON-serialisable snapshot for UI/AI if needed.
         """
+        cx, cy = self.get_center()
         return {
-            "x": float(self._rect.x),
-            "y": float(self._rect.y),
-            "width": int(self._rect.width),
-            "height": int(self._rect.height),
+            "x": float(cx - self._size // 2),
+            "y": float(cy - self._size // 2),
+            "width": int(self._size),
+            "height": int(self._size),
             "team": self.team,
             "hp": float(self.hp),
             "max_hp": float(self.max_hp),
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple
 
-import pygame
-
-from game.data.loader import load_troops
+from game.data.catalog import Catalog, get_catalog
+from game.systems import fixed
+from game.systems.aoe import apply_splash
+from game.systems.telemetry import ATTACK, TARGET, record_hit
 
 BLACK = (20, 20, 20)
 GREEN_HP = (50, 205, 50)
@@ -20,6 +22,15 @@ TEAM_ENEMY = (255, 50, 50)
 TINT_PLAYER = (100, 150, 255)
 TINT_ENEMY = (255, 100, 100)
 
+if TYPE_CHECKING:  # pygame is only imported once something is drawn
+    import pygame
+
+    from game.data.catalog import SplashDef
+    from game.systems.navigation import Navigator
+    from game.systems.projectiles import ProjectilePool
+    from game.systems.spatial import UnitIndex
+    from game.systems.telemetry import EventBus
+
 
 # ---------------------------------------------------------------------------
 # Pixel-art based sprites + stats, ported from smash2.py
@@ -113,9 +124,9 @@ UNIT_PALETTES: Dict[int, Dict[int, Tuple[int, int, int]]] = {
     },
 }
 
-def _build_unit_stats_from_data() -> Dict[int, Dict[str, float | int | str | bool]]:
+def _build_unit_stats(catalog: Catalog) -> Mapping[int, Mapping[str, float | int | str | bool]]:
     """
-    Load troop stats from `game/data/troops.json` so balance is data-driven.
+    Legacy dict-shaped troop stats, derived from the shared data catalog.
 
     Balance philosophy (high level):
     - Mario: mid-cost melee brawler / general-purpose DPS.
@@ -123,64 +134,107 @@ def _build_unit_stats_from_data() -> Dict[int, Dict[str, float | int | str | boo
     - Peach: cheap-ish, fragile ranged support with air targeting.
     - Yoshi: fast flying building-hunter for split pushes.
     """
-    unit_stats: Dict[int, Dict[str, float | int | str | bool]] = {}
-    for entry in load_troops():
-        idx = int(entry["id"])
-        unit_stats[idx] = {
-            "name": entry.get("name", f"Troop {idx}"),
-            "hp": float(entry["hp"]),
-            "dmg": float(entry["damage"]),
-            "speed": float(entry["speed"]),
-            "range": float(entry["range"]),
-            "target": str(entry.get("target", "all")),
-            "is_flying": bool(entry.get("is_flying", False)),
-            "can_hit_air": bool(entry.get("can_hit_air", False)),
-            "scale": float(entry.get("scale", 2.5)),
+    unit_stats: Dict[int, Mapping[str, float | int | str | bool]] = {}
+    for idx, troop in catalog.troops.items():
+        unit_stats[idx] = MappingProxyType({
+            "name": troop.name,
+            "hp": troop.hp,
+            "dmg": troop.damage,
+            "speed": troop.speed,
+            "range": troop.range,
+            "target": troop.target,
+            "is_flying": troop.is_flying,
+            "can_hit_air": troop.can_hit_air,
+            "scale": troop.scale,
             # Coins cost + role are intentionally ignored here and consumed
             # by World / AI instead of the Troop simulation itself.
-        }
-    return unit_stats
+        })
+    return MappingProxyType(unit_stats)
 
 
-UNIT_STATS: Dict[int, Dict[str, float | int | str | bool]] = _build_unit_stats_from_data()
+def __getattr__(name: str):
+    # `UNIT_STATS` is kept for older callers; it always reflects the
+    # current (possibly hot-reloaded) catalog.
+    if name == "UNIT_STATS":
+        return get_catalog().derive(_build_unit_stats)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 SPRITE_ASSETS: Dict[str, Dict[int, pygame.Surface]] = {}
 
+SPRITE_GRID_SIZE = 12  # PIXEL_GRIDS are 12x12
+
+
+def sprite_size(scale: float) -> int:
+    """Side length in pixels of a unit sprite drawn at `scale`."""
+    return int(SPRITE_GRID_SIZE * scale)
+
+
+def get_sprite_assets() -> Dict[str, Dict[int, pygame.Surface]]:
+    """Return SPRITE_ASSETS, filling it from the sprite atlas on first use."""
+    if not SPRITE_ASSETS:
+        generate_sprites()
+    return SPRITE_ASSETS
+
 
 def generate_sprites() -> None:
     """
-    Generate the per-unit, per-team sprite surfaces.
+    Populate the per-unit, per-team sprite table from the baked atlas.
+
+    Pixel painting now happens once at bake time (see game/ui/atlas.py);
+    this only exposes the shared, already-converted atlas frames.
 
-    Must be called once after pygame.init() and before any Troop is drawn.
-    
     Sprites are kept fully opaque and vibrant with distinct character colors.
     Team identification is handled via colored base circles in Troop.draw(), 
     NOT via tinting the sprites themselves.
     """
-    base_sprites: Dict[int, pygame.Surface] = {}
-    for idx, grid in PIXEL_GRIDS.items():
-        surf = pygame.Surface((12, 12), pygame.SRCALPHA)
-        palette = UNIT_PALETTES[idx]
-        for r in range(12):
-            for c in range(12):
-                val = grid[r][c]
-                if val > 0:
-                    color = palette[val]
-                    # Ensure fully opaque pixels
-                    surf.set_at((c, r), (*color, 255))
-        base_sprites[idx] = surf
+    from game.ui.atlas import get_atlas
 
+    atlas = get_atlas()
     for team in ["player", "ai"]:
         SPRITE_ASSETS[team] = {}
+        for idx in PIXEL_GRIDS:
+            sprite = atlas.unit(idx)
+            if sprite is not None:
+                SPRITE_ASSETS[team][idx] = sprite
 
-        for idx, base_surf in base_sprites.items():
-            scale = float(UNIT_STATS[idx]["scale"])
-            new_size = (int(12 * scale), int(12 * scale))
-            scaled_surf = pygame.transform.scale(base_surf, new_size)
 
-            # NO heavy tint; keep pixels as-is for vibrant character colors
-            # Team identity comes from base circles, not sprite tinting
-            SPRITE_ASSETS[team][idx] = scaled_surf
+def _nearest_fixed(
+    cx: int, cy: int, towers: Sequence[object], troops: Sequence[object], can_hit_air: bool
+) -> Tuple[Optional[object], float]:
+    """
+    Troop targeting on the fixed-point grid: the tower or troop whose edge
+    is nearest to (cx, cy), towers first so they win ties, and that gap.
+
+    Gaps are `fixed.distance` minus the radius, so with `best` the best
+    gap so far, a candidate at squared distance d2 with radius r only wins
+    if d2 < (best + r)². Both sides are exact, so losers cost one integer
+    comparison and only a new best takes a square root.
+    """
+    shift = 2 * fixed.SHIFT
+    scale = fixed.SCALE
+    isqrt = math.isqrt
+    target = None
+    best = math.inf
+    for t in towers:
+        tx, ty = t.get_center()
+        dx, dy = tx - cx, ty - cy
+        d2 = dx * dx + dy * dy
+        bound = best + t.radius
+        if bound > 0 and d2 < bound * bound:
+            best = isqrt(d2 << shift) / scale - t.radius
+            target = t
+    for t in troops:
+        if t.is_flying and not can_hit_air:
+            continue
+        tx, ty = t.get_center()
+        dx, dy = tx - cx, ty - cy
+        d2 = dx * dx + dy * dy
+        bound = best + t.radius
+        if bound > 0 and d2 < bound * bound:
+            best = isqrt(d2 << shift) / scale - t.radius
+            target = t
+    return target, best
 
 
 @dataclass
@@ -206,66 +260,94 @@ class Troop:
     target_pref: str = "all"
     is_flying: bool = False
     can_hit_air: bool = False
+    projectile_speed: float = 0.0  # px per tick; 0 = damage lands instantly
+    homing: bool = True
+    splash: Optional[SplashDef] = None  # area damage around the main target
 
     state: str = "move"
+    ready_tick: int = 0  # tick the next hit is allowed on (scheduled by World)
+    cooling: bool = False  # between hits; cleared by World's wake-up timer
+    asleep: bool = False  # skipped by World until woken (see game/systems/activity.py)
     facing_right: bool = True
+    uid: int = 0  # assigned by World; stable id for telemetry / saves
+    fixed_point: bool = False  # integer geometry on a 1/256 grid (game/systems/fixed.py)
 
     # Target locking
     current_target: Optional[object] = None
     _target_lock_margin: float = 20.0  # Extra range margin before breaking lock
 
-    # rendering
+    # rendering (created lazily by draw(); the simulation never needs pygame)
     _base_image: Optional[pygame.Surface] = None
+    _flipped_image: Optional[pygame.Surface] = None
     _image: Optional[pygame.Surface] = None
     _rect: Optional[pygame.Rect] = None
     radius: int = 20
     _last_attack_line: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
 
     def __post_init__(self) -> None:
-        stats = UNIT_STATS[self.stats_idx]
-
-        self.max_hp = self.hp = float(stats["hp"])
-        self.speed = float(stats["speed"])
-        self.damage = float(stats["dmg"])
-        self.range = float(stats["range"])
-        self.target_pref = str(stats["target"])
-        self.is_flying = bool(stats["is_flying"])
-        self.can_hit_air = bool(stats["can_hit_air"])
-
-        # Attach sprite
-        self._base_image = SPRITE_ASSETS.get(self.team, {}).get(self.stats_idx)
-        if self._base_image is None:
-            # Fallback: simple rectangle
-            size = 32
-            surf = pygame.Surface((size, size), pygame.SRCALPHA)
-            surf.fill(TEAM_PLAYER if self.team == "player" else TEAM_ENEMY)
-            self._base_image = surf
-
-        self._image = self._base_image
-        self._rect = self._base_image.get_rect(center=(int(self.x), int(self.y)))
-        self.radius = self._rect.width // 2
+        stats = get_catalog().troops[self.stats_idx]
+
+        self.max_hp = self.hp = stats.hp
+        self.speed = stats.speed
+        self.damage = stats.damage
+        self.range = stats.range
+        self.target_pref = stats.target
+        self.is_flying = stats.is_flying
+        self.can_hit_air = stats.can_hit_air
+        self.projectile_speed = stats.projectile_speed
+        self.homing = stats.homing
+        self.splash = stats.splash
+
+        # Collision radius matches the drawn sprite's half-width.
+        self.radius = sprite_size(stats.scale) // 2
+
+        if self.fixed_point:
+            q = fixed.quantize
+            self.x, self.y = q(self.x), q(self.y)
+            self.max_hp = self.hp = q(self.hp)
+            self.speed, self.damage, self.range = q(self.speed), q(self.damage), q(self.range)
+            self.projectile_speed = q(self.projectile_speed)
 
     # ------------------------------------------------------------------
     # Simulation
     # ------------------------------------------------------------------
-    def update(self, enemy_units: List["Troop"], enemy_towers: List["Tower"]) -> None:
+    def update(
+        self,
+        enemy_units: List["Troop"],
+        enemy_towers: List["Tower"],
+        events: Optional["EventBus"] = None,
+        projectiles: Optional["ProjectilePool"] = None,
+        enemy_index: Optional["UnitIndex"] = None,
+        navigation: Optional["Navigator"] = None,
+    ) -> bool:
         """
-        Update movement & combat vs. enemy units and towers.
+        Update movement & combat vs. enemy units and towers; True if it attacked.
         
         Implements target locking: once a troop locks onto a target (especially a tower),
         it will continue attacking that target until it dies or goes out of range.
         Units with target_pref="building" ignore regular troops entirely.
+        Combat events go to `events` when a telemetry bus is attached.
+        Ranged troops with a projectile speed launch shots into `projectiles`
+        (damage lands on impact); without a pool every hit is instant.
+        Splash victims are looked up in `enemy_index` when given (the
+        World's per-tick spatial index of `enemy_units`), else by a scan.
+        Ground troops follow `navigation`'s flow fields over the bridges
+        when given; otherwise (and when flying) they walk straight.
+        After a hit the troop is `cooling`: it keeps its target and stance
+        but does not strike again until World's timer queue wakes it
+        (`attack_interval` in troops.json).
+        With `fixed_point` every distance and step is integer arithmetic
+        (see game/systems/fixed.py).
         """
-        from game.entities.tower import Tower  # local import to avoid cycles
-
         self._last_attack_line = None
 
         if self.hp <= 0:
             self.state = "dead"
             self.current_target = None
-            return
+            return False
 
         my_cx, my_cy = self.get_center()
+        previous_target = self.current_target
 
         # Check if current target is still valid
         if self.current_target is not None:
@@ -280,41 +362,39 @@ class Troop:
                     else (self.current_target.x, self.current_target.y)
                 )
                 target_radius = getattr(self.current_target, "radius", 0)
-                dist = math.hypot(tx - my_cx, ty - my_cy) - target_radius
+                if self.fixed_point:
+                    # Squared distance against the squared reach (range + radius)
+                    dx, dy = tx - my_cx, ty - my_cy
+                    dist_sq = dx * dx + dy * dy
+                    reach = self.range + target_radius
+                    locked = dist_sq <= (reach + self._target_lock_margin) ** 2
+                    in_range = dist_sq <= reach * reach
+                else:
+                    dist = math.hypot(tx - my_cx, ty - my_cy) - target_radius
+                    locked = dist <= self.range + self._target_lock_margin
+                    in_range = dist <= self.range
                 
                 # If still in range (with margin), keep attacking this target
-                if dist <= self.range + self._target_lock_margin:
+                if locked:
                     target = self.current_target
                     # In range: attack
-                    if dist <= self.range:
+                    attacked = instant = False
+                    if in_range:
                         self.state = "attack"
-                        target.hp -= self.damage
-                        if target.hp <= 0:
-                            target.dead = True
-                            self.current_target = None
-                        
-                        # Bowser splash damage: when attacking a tower, deal splash to nearby enemy troops
-                        if isinstance(target, Tower) and self.target_pref == "building" and self.stats_idx == 1:
-                            tx, ty = target.get_center()
-                            splash_radius = 45
-                            splash_damage = self.damage * 0.4
-                            for e in enemy_units:
-                                if e.hp > 0 and not getattr(e, "dead", False):
-                                    ex, ey = e.get_center()
-                                    if math.hypot(ex - tx, ey - ty) < splash_radius:
-                                        e.hp -= splash_damage
-                                        if e.hp <= 0:
-                                            e.dead = True
+                        if not self.cooling:
+                            attacked = True
+                            instant = self._strike(target, events, projectiles)
+
+                            # Area damage around the target (troops.json "splash")
+                            if self.splash is not None and instant:
+                                apply_splash(
+                                    self, self.splash, target, enemy_index or enemy_units, events,
+                                    self.fixed_point,
+                                )
                     else:
                         # Out of immediate range but within lock margin: move toward it
                         self.state = "move"
-                        dx = tx - my_cx
-                        dy = ty - my_cy
-                        move_dist = math.hypot(dx, dy)
-                        if move_dist > 0:
-                            self.x += (dx / move_dist) * self.speed
-                            self.y += (dy / move_dist) * self.speed
-                            self._rect.center = (int(self.x), int(self.y))
+                        self._move_toward(target, tx - my_cx, ty - my_cy, navigation)
                     
                     # Update facing
                     if tx < my_cx:
@@ -322,10 +402,10 @@ class Troop:
                     else:
                         self.facing_right = True
                     
-                    if self.range > 40 and dist <= self.range:
+                    if self.range > 40 and instant:
                         self._last_attack_line = (self.get_center(), (int(tx), int(ty)))
                     
-                    return
+                    return attacked
                 else:
                     # Target out of range: break lock
                     self.current_target = None
@@ -334,37 +414,45 @@ class Troop:
                 self.current_target = None
 
         # No valid current target: find a new one
-        # Choose potential targets based on target_pref
-        possible_targets: List[object] = []
-        
-        # Always include towers
-        possible_targets.extend(enemy_towers)
+        # Choose potential targets based on target_pref: towers always,
+        # plus the troops in `troop_targets`. Both are scanned in place
+        # below rather than copied into a fresh list every tick.
+        troop_targets: Sequence[object] = ()
 
         # Only include troops if target_pref is "all"
         if self.target_pref == "all":
-            for e in enemy_units:
-                if e.is_flying and not self.can_hit_air:
-                    continue
-                possible_targets.append(e)
+            troop_targets = enemy_units
         # Special case for Yoshi (id=3): if no building in range, allow targeting blocking troops
         elif self.target_pref == "building" and self.stats_idx == 3:
             # First, check if any tower is in range or close
             nearest_tower = None
             nearest_tower_dist = float("inf")
+            hypot = fixed.distance if self.fixed_point else math.hypot
             for tower in enemy_towers:
                 tx, ty = tower.get_center()
                 tower_radius = getattr(tower, "radius", 0)
-                d = math.hypot(tx - my_cx, ty - my_cy) - tower_radius
+                d = hypot(tx - my_cx, ty - my_cy) - tower_radius
                 if d < nearest_tower_dist:
                     nearest_tower_dist = d
                     nearest_tower = tower
             
             # If no tower is close enough (within reasonable distance), allow targeting blocking troops
             if nearest_tower is None or nearest_tower_dist > 100:
+                blocking: List[object] = []
+                troop_targets = blocking
+                reach_sq = (50 if nearest_tower is not None else 60) ** 2
                 for e in enemy_units:
                     if e.is_flying and not self.can_hit_air:
                         continue
                     ex, ey = e.get_center()
+                    if self.fixed_point:
+                        # Same test in integers: the reaches below are whole pixels,
+                        # and a blocker that close is always nearer than the tower.
+                        dx_enemy = ex - my_cx
+                        dy_enemy = ey - my_cy
+                        if dx_enemy * dx_enemy + dy_enemy * dy_enemy < reach_sq:
+                            blocking.append(e)
+                        continue
                     # Check if this troop is between Yoshi and the nearest tower (if any)
                     if nearest_tower is not None:
                         tx, ty = nearest_tower.get_center()
@@ -379,59 +467,64 @@ class Troop:
                         if dist_to_enemy < 50:  # Close blocking troop
                             # Simple check: if enemy is closer than tower and roughly in same direction
                             if dist_to_enemy < nearest_tower_dist:
-                                possible_targets.append(e)
+                                blocking.append(e)
                     else:
                         # No tower found, allow targeting any nearby troop
                         dist_to_enemy = math.hypot(ex - my_cx, ey - my_cy)
                         if dist_to_enemy < 60:
-                            possible_targets.append(e)
+                            blocking.append(e)
         # If target_pref is "building" (and not Yoshi), we only have towers (already added above)
 
-        if not possible_targets:
-            self.state = "idle"
-            self.current_target = None
-            return
-
-        # Find closest target
+        # Find closest target (towers first, so they win ties)
         target: Optional[object] = None
         min_dist = float("inf")
 
-        for t in possible_targets:
-            tx, ty = (t.get_center() if hasattr(t, "get_center") else (t.x, t.y))
-            radius = getattr(t, "radius", 0)
-            d = math.hypot(tx - my_cx, ty - my_cy) - radius
-            if d < min_dist:
-                min_dist = d
-                target = t
+        if self.fixed_point:
+            target, min_dist = _nearest_fixed(
+                my_cx, my_cy, enemy_towers, troop_targets, self.can_hit_air
+            )
+        else:
+            for t in enemy_towers:
+                tx, ty = t.get_center()
+                d = math.hypot(tx - my_cx, ty - my_cy) - t.radius
+                if d < min_dist:
+                    min_dist = d
+                    target = t
+            can_hit_air = self.can_hit_air
+            for t in troop_targets:
+                if t.is_flying and not can_hit_air:
+                    continue
+                tx, ty = t.get_center()
+                d = math.hypot(tx - my_cx, ty - my_cy) - t.radius
+                if d < min_dist:
+                    min_dist = d
+                    target = t
 
         if target is None:
             self.state = "idle"
             self.current_target = None
-            return
+            return False
 
         # Lock onto the new target
         self.current_target = target
+        if events is not None and target is not previous_target:
+            events.emit(TARGET, self.uid, target.uid, min_dist, target.x, target.y)
 
+        attacked = False
         if min_dist <= self.range:
             # In range: attack
             self.state = "attack"
-            target.hp -= self.damage
-            if target.hp <= 0:
-                target.dead = True
-                self.current_target = None
-            
-            # Bowser splash damage: when attacking a tower, deal splash to nearby enemy troops
-            if isinstance(target, Tower) and self.target_pref == "building" and self.stats_idx == 1:
-                tx, ty = target.get_center()
-                splash_radius = 45
-                splash_damage = self.damage * 0.4
-                for e in enemy_units:
-                    if e.hp > 0 and not getattr(e, "dead", False):
-                        ex, ey = e.get_center()
-                        if math.hypot(ex - tx, ey - ty) < splash_radius:
-                            e.hp -= splash_damage
-                            if e.hp <= 0:
-                                e.dead = True
+            instant = False
+            if not self.cooling:
+                attacked = True
+                instant = self._strike(target, events, projectiles)
+
+                # Area damage around the target (troops.json "splash")
+                if self.splash is not None and instant:
+                    apply_splash(
+                        self, self.splash, target, enemy_index or enemy_units, events,
+                        self.fixed_point,
+                    )
 
             tx, ty = (
                 target.get_center() if hasattr(target, "get_center") else (target.x, target.y)
@@ -441,7 +534,7 @@ class Troop:
             else:
                 self.facing_right = True
 
-            if self.range > 40:
+            if self.range > 40 and instant:
                 self._last_attack_line = (self.get_center(), (int(tx), int(ty)))
         else:
             # Move toward target
@@ -451,22 +544,110 @@ class Troop:
             )
             dx = tx - my_cx
             dy = ty - my_cy
-            dist = math.hypot(dx, dy)
 
             if dx < 0:
                 self.facing_right = False
             elif dx > 0:
                 self.facing_right = True
 
+            self._move_toward(target, dx, dy, navigation)
+        return attacked
+
+    def _move_toward(self, target, dx: float, dy: float, navigation: Optional["Navigator"]) -> None:
+        """Step toward `target` (offset dx, dy from our centre), via a bridge if needed."""
+        if self.fixed_point:
+            self._move_toward_fixed(target, dx, dy, navigation)
+            return
+        if navigation is None or self.is_flying:
+            dist = math.hypot(dx, dy)
             if dist > 0:
                 self.x += (dx / dist) * self.speed
                 self.y += (dy / dist) * self.speed
-                self._rect.center = (int(self.x), int(self.y))
+            return
+
+        heading = navigation.steer(self.x, self.y, target)
+        if heading is not None:
+            self.x += heading[0] * self.speed
+            self.y += heading[1] * self.speed
+            return
+        dist = math.hypot(dx, dy)
+        if dist > 0:
+            x = self.x + (dx / dist) * self.speed
+            y = self.y + (dy / dist) * self.speed
+            if not navigation.walkable(x, y) and navigation.walkable(self.x, self.y):
+                y = self.y  # stay on the bank, sliding along it
+                if not navigation.walkable(x, y):
+                    return
+            self.x, self.y = x, y
+
+    def _move_toward_fixed(self, target, dx: int, dy: int, navigation: Optional["Navigator"]) -> None:
+        """`_move_toward` in whole steps of the fixed-point grid."""
+        if navigation is None or self.is_flying:
+            self.x, self.y = fixed.step_toward(self.x, self.y, dx, dy, self.speed)
+            return
+
+        heading = navigation.steer(self.x, self.y, target)
+        if heading is not None:
+            # Grid heading times grid speed has at most 2 * SHIFT fraction
+            # bits, so the product is exact and round() picks the step.
+            speed = self.speed * fixed.SCALE
+            self.x += round(heading[0] * speed) / fixed.SCALE
+            self.y += round(heading[1] * speed) / fixed.SCALE
+            return
+        x, y = fixed.step_toward(self.x, self.y, dx, dy, self.speed)
+        if not navigation.walkable(x, y) and navigation.walkable(self.x, self.y):
+            y = self.y  # stay on the bank, sliding along it
+            if not navigation.walkable(x, y):
+                return
+        self.x, self.y = x, y
+
+    def _strike(
+        self,
+        target,
+        events: Optional["EventBus"],
+        projectiles: Optional["ProjectilePool"],
+    ) -> bool:
+        """Hit `target` now, or launch a projectile at it; True if the hit was instant."""
+        self.cooling = True
+        if projectiles is not None and self.projectile_speed > 0:
+            projectiles.fire(self, target, self.damage, self.projectile_speed, self.homing)
+            return False
+        target.hp -= self.damage
+        if target.hp <= 0:
+            target.dead = True
+            self.current_target = None
+        if events is not None:
+            record_hit(events, ATTACK, self, target, self.damage)
+        return True
 
     # ------------------------------------------------------------------
     # Rendering
     # ------------------------------------------------------------------
+    def _sync_render_state(self) -> None:
+        """Attach the sprite on first draw and move the rect to our position."""
+        import pygame
+
+        if self._base_image is None:
+            from game.ui.atlas import get_atlas
+
+            atlas = get_atlas()
+            self._base_image = atlas.unit(self.stats_idx, facing_right=True)
+            self._flipped_image = atlas.unit(self.stats_idx, facing_right=False)
+            if self._base_image is None:
+                # Fallback: simple rectangle
+                size = 32
+                surf = pygame.Surface((size, size), pygame.SRCALPHA)
+                surf.fill(TEAM_PLAYER if self.team == "player" else TEAM_ENEMY)
+                self._base_image = surf
+                self._flipped_image = surf
+            self._image = self._base_image
+            self._rect = self._base_image.get_rect()
+
+        self._rect.center = self.get_center()
+
     def _draw_health(self, screen: pygame.Surface) -> None:
+        import pygame
+
         if self.hp >= self.max_hp:
             return
 
@@ -485,6 +666,10 @@ class Troop:
         pygame.draw.rect(screen, GREEN_HP, hp_rect)
 
     def draw(self, screen: pygame.Surface) -> None:
+        import pygame
+
+        self._sync_render_state()
+
         # Team base / plate for team identity
         base_color = TEAM_PLAYER if self.team == "player" else TEAM_ENEMY
         base_y = self._rect.bottom - 3 if not self.is_flying else self._rect.bottom - 6
@@ -501,11 +686,8 @@ class Troop:
             pygame.draw.ellipse(shadow_surf, SHADOW, (0, 0, self._rect.width, 12))
             screen.blit(shadow_surf, (self._rect.x, self._rect.bottom - 6))
 
-        # Orientation
-        if self.facing_right:
-            self._image = self._base_image
-        else:
-            self._image = pygame.transform.flip(self._base_image, True, False)
+        # Orientation (both facings are pre-baked in the atlas)
+        self._image = self._base_image if self.facing_right else self._flipped_image
 
         screen.blit(self._image, self._rect)
         self._draw_health(screen)
@@ -526,7 +708,8 @@ class Troop:
     # Public snapshots
     # ------------------------------------------------------------------
     def get_center(self) -> Tuple[int, int]:
-        return self._rect.center
+        # Same integer pixel the sprite rect is centred on.
+        return (int(self.x), int(self.y))
 
     def to_render_dict(self) -> dict:
         """Small snapshot for AI / UI layers."""
@@ -0,0 +1,359 @@
+# game/env.py
+"""
+Gym-style environment for training agents against the built-in AI.
+
+The agent plays the bottom ("player") side of a headless World; the top
+side is the heuristic policy from game/ai/policy.py:
+
+    env = Env(seed=0)
+    obs = env.reset()
+    while True:
+        obs, reward, done, info = env.step(action)
+        if done:
+            break
+
+Actions are integers in `[0, NUM_ACTIONS)`: 0 is a no-op, every other
+action plays one card in one lane (`ACTIONS[a]` gives the (card id, lane)
+pair). A card the agent cannot afford is ignored and flagged with
+`info["invalid_action"]`; `action_mask()` lists the affordable ones.
+One `step` is `frame_skip` simulation ticks (a quarter second by
+default), the action being played before the first of them.
+
+Observations are float32 vectors of `OBS_SIZE`, always from the agent's
+side (its own troops first, then the enemy's):
+
+    occupancy  [2, lanes, LANE_BINS]  troop count per lane and stretch of
+                                      lane (bin 0 at the enemy's end)
+    hp         [2, lanes, LANE_BINS]  summed troop hp / HP_SCALE
+    towers     [2]                    own / enemy king tower hp fraction
+    coins      [2]                    own / enemy coins / COINS_MAX
+    time       [1]                    tick / max_ticks
+
+They are written into a buffer the environment allocates once, so the
+array `reset` / `step` return is overwritten by the next call: copy it to
+keep it. Rewards are the change in king tower hp fractions (enemy damage
+minus own damage) plus +1 / -1 when the match is won / lost. A match cut
+off at `max_ticks` ends with `info["truncated"]`.
+
+`seed` makes the opponent play a random affordable card instead of its
+own choice on a fraction (`opponent_noise`) of its decisions, so training
+sees more than one line of play. The same seed replays the same match.
+
+`VectorEnv` steps many environments per call, in this process or spread
+over subprocess workers that write straight into shared observation
+buffers. `python -m benchmarks.bench_env` reports steps per second.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import random
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from game.ai.policy import choose_ai_action
+from game.ai.state import GameState
+from game.core.actions import PlayCardAction
+from game.core.world import COINS_MAX, FIXED_DT, HUD_HEIGHT, TICK_RATE, World
+from game.data.catalog import get_catalog
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 450, 750  # same arena as main.py
+NUM_LANES = 3
+LANE_BINS = 6
+HP_SCALE = 1000.0
+
+# Action index -> (card id, lane index); index 0 is the no-op.
+ACTIONS: Tuple[Optional[Tuple[str, int]], ...] = (None,) + tuple(
+    (card.id, lane) for card in get_catalog().cards.values() for lane in range(NUM_LANES)
+)
+NUM_ACTIONS = len(ACTIONS)
+NOOP = 0
+
+_GRID = 2 * NUM_LANES * LANE_BINS
+OBS_SIZE = 2 * _GRID + 5
+
+Step = Tuple[np.ndarray, float, bool, Dict[str, Any]]
+
+
+class Env:
+    def __init__(
+        self,
+        seed: Optional[int] = 0,
+        frame_skip: int = 15,
+        max_ticks: int = 180 * TICK_RATE,
+        opponent_noise: float = 0.1,
+    ) -> None:
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be at least 1, got {frame_skip}.")
+        self.frame_skip = frame_skip
+        self.max_ticks = max_ticks
+        self.opponent_noise = opponent_noise
+        self._rng = random.Random(seed)
+        self._obs = np.zeros(OBS_SIZE, dtype=np.float32)
+        self._play_height = float(SCREEN_HEIGHT - HUD_HEIGHT)
+        self._costs = {
+            card.id: float(card.cost) for card in get_catalog().cards.values()
+        }
+        self.world: World = self._new_world()
+        self._score = 0.0
+
+    # ------------------------------------------------------------------
+    # Gym API
+    # ------------------------------------------------------------------
+    def reset(self, seed: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Start a new match; `seed` reseeds the opponent noise."""
+        if seed is not None:
+            self._rng.seed(seed)
+        self.world = self._new_world()
+        self._score = self._tower_score()
+        return self.observe(out)
+
+    def step(self, action: int, out: Optional[np.ndarray] = None) -> Step:
+        world = self.world
+        if world.game_over:
+            raise RuntimeError("step() called on a finished match; call reset() first.")
+
+        invalid = False
+        play = ACTIONS[action]
+        if play is not None:
+            card_id, lane = play
+            invalid = world.player_coins < self._costs[card_id]
+            if not invalid:
+                world.apply_player_action(PlayCardAction(card_id, lane))
+
+        for _ in range(self.frame_skip):
+            world.step(FIXED_DT)
+            if world.game_over or world._tick >= self.max_ticks:
+                break
+
+        score = self._tower_score()
+        reward = score - self._score
+        self._score = score
+        if world.winner is not None:
+            reward += 1.0 if world.winner == "player" else -1.0
+        truncated = not world.game_over and world._tick >= self.max_ticks
+        info = {
+            "tick": world._tick,
+            "winner": world.winner,
+            "invalid_action": invalid,
+            "truncated": truncated,
+        }
+        return self.observe(out), reward, world.game_over or truncated, info
+
+    # ------------------------------------------------------------------
+    # Observations
+    # ------------------------------------------------------------------
+    def observe(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Write the current observation into `out` (default: the env's own buffer)."""
+        obs = self._obs if out is None else out
+        obs[:] = 0.0
+        world = self.world
+        bins = LANE_BINS / self._play_height
+        for side, troops in enumerate((world.player_troops, world.ai_troops)):
+            base = side * NUM_LANES * LANE_BINS
+            for troop in troops:
+                b = min(max(int(troop.y * bins), 0), LANE_BINS - 1)
+                lane = min(max(troop.lane_index, 0), NUM_LANES - 1)
+                i = base + lane * LANE_BINS + b
+                obs[i] += 1.0
+                obs[_GRID + i] += troop.hp / HP_SCALE
+        tail = 2 * _GRID
+        own, enemy = world.player_king_tower, world.ai_king_tower
+        obs[tail] = max(own.hp, 0) / own.max_hp
+        obs[tail + 1] = max(enemy.hp, 0) / enemy.max_hp
+        obs[tail + 2] = world.player_coins / COINS_MAX
+        obs[tail + 3] = world.ai_coins / COINS_MAX
+        obs[tail + 4] = world._tick / self.max_ticks
+        return obs
+
+    def action_mask(self) -> np.ndarray:
+        """bool[NUM_ACTIONS]: the no-op plus every card the agent can afford."""
+        coins = self.world.player_coins
+        return np.array(
+            [play is None or coins >= self._costs[play[0]] for play in ACTIONS], dtype=bool
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _new_world(self) -> World:
+        world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+        world.ai_policy = self._opponent
+        return world
+
+    def _tower_score(self) -> float:
+        own, enemy = self.world.player_king_tower, self.world.ai_king_tower
+        return max(own.hp, 0) / own.max_hp - max(enemy.hp, 0) / enemy.max_hp
+
+    def _opponent(self, state: GameState) -> Optional[PlayCardAction]:
+        if self._rng.random() >= self.opponent_noise:
+            return choose_ai_action(state)
+        affordable = [card for card, cost in self._costs.items() if state.player_coins >= cost]
+        if not affordable:
+            return None
+        return PlayCardAction(self._rng.choice(affordable), self._rng.randrange(NUM_LANES))
+
+
+# ----------------------------------------------------------------------
+# Vectorised environments
+# ----------------------------------------------------------------------
+class _Buffers:
+    """obs [n, OBS_SIZE] float32, reward [n] float32, done [n] bool, over one block."""
+
+    def __init__(self, n: int, buf=None) -> None:
+        if buf is None:
+            buf = bytearray(self.nbytes(n))
+        self.buf = buf
+        self.obs = np.ndarray((n, OBS_SIZE), dtype=np.float32, buffer=buf)
+        offset = self.obs.nbytes
+        self.reward = np.ndarray((n,), dtype=np.float32, buffer=buf, offset=offset)
+        offset += self.reward.nbytes
+        self.done = np.ndarray((n,), dtype=np.bool_, buffer=buf, offset=offset)
+
+    @staticmethod
+    def nbytes(n: int) -> int:
+        return n * (OBS_SIZE * 4 + 4 + 1)
+
+
+def _step_slice(envs: Sequence[Env], actions: Sequence[int], start: int, buffers: _Buffers) -> List[dict]:
+    """Step envs[i] with actions[i] into buffer rows start + i, resetting finished ones."""
+    infos = []
+    for i, (env, action) in enumerate(zip(envs, actions)):
+        row = start + i
+        _, reward, done, info = env.step(int(action), out=buffers.obs[row])
+        if done:
+            info["final_observation"] = buffers.obs[row].copy()
+            env.reset(out=buffers.obs[row])
+        buffers.reward[row] = reward
+        buffers.done[row] = done
+        infos.append(info)
+    return infos
+
+
+def _worker(conn, shm_name: str, num_envs: int, start: int, seeds: Sequence[int], env_kwargs: dict) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buffers = _Buffers(num_envs, shm.buf)
+    try:
+        envs = [Env(seed=seed, **env_kwargs) for seed in seeds]
+        while True:
+            command, payload = conn.recv()
+            if command == "step":
+                conn.send(_step_slice(envs, payload, start, buffers))
+            elif command == "reset":
+                for i, env in enumerate(envs):
+                    seed = None if payload is None else payload + start + i
+                    env.reset(seed, out=buffers.obs[start + i])
+                conn.send(None)
+            elif command == "close":
+                break
+    finally:
+        del buffers
+        shm.close()
+        conn.close()
+
+
+class VectorEnv:
+    """
+    `num_envs` environments stepped together; finished ones reset themselves.
+
+    `step(actions)` returns (obs [n, OBS_SIZE], reward [n], done [n], infos).
+    The arrays are buffers reused by the next call. When a match ends, its
+    row already holds the first observation of the next one, and the last
+    observation of the finished match is in `infos[i]["final_observation"]`.
+
+    With `workers` > 0 the environments are split over that many
+    subprocesses, which write into one shared memory block; it is copied
+    into this process's arrays in one go after each call, so they stay
+    valid after `close()`. Otherwise the environments are stepped in this
+    process. Environment i is seeded `seed + i`.
+    """
+
+    def __init__(self, num_envs: int, workers: int = 0, seed: int = 0, **env_kwargs: Any) -> None:
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be at least 1, got {num_envs}.")
+        self.num_envs = num_envs
+        self.workers = min(workers, num_envs)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._procs: List[Tuple[Any, Any, int, int]] = []  # (process, conn, start, count)
+
+        if self.workers <= 0:
+            self._buffers = _Buffers(num_envs)
+            self.envs = [Env(seed=seed + i, **env_kwargs) for i in range(num_envs)]
+            return
+
+        self.envs = []
+        self._buffers = _Buffers(num_envs)
+        self._shm = shared_memory.SharedMemory(create=True, size=_Buffers.nbytes(num_envs))
+        self._shared = _Buffers(num_envs, self._shm.buf)
+        per_worker, extra = divmod(num_envs, self.workers)
+        start = 0
+        for w in range(self.workers):
+            count = per_worker + (1 if w < extra else 0)
+            parent, child = multiprocessing.Pipe()
+            seeds = [seed + start + i for i in range(count)]
+            proc = multiprocessing.Process(
+                target=_worker,
+                args=(child, self._shm.name, num_envs, start, seeds, env_kwargs),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._procs.append((proc, parent, start, count))
+            start += count
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """Start every match over (environment i reseeded `seed + i` if given)."""
+        if not self._procs:
+            for i, env in enumerate(self.envs):
+                env.reset(None if seed is None else seed + i, out=self._buffers.obs[i])
+        else:
+            for _, conn, _, _ in self._procs:
+                conn.send(("reset", seed))
+            for _, conn, _, _ in self._procs:
+                conn.recv()
+            self._collect()
+        return self._buffers.obs
+
+    def step(self, actions: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]:
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}.")
+        b = self._buffers
+        if not self._procs:
+            infos = _step_slice(self.envs, actions, 0, b)
+        else:
+            for _, conn, start, count in self._procs:
+                conn.send(("step", [int(a) for a in actions[start : start + count]]))
+            infos = []
+            for _, conn, _, _ in self._procs:
+                infos.extend(conn.recv())
+            self._collect()
+        return b.obs, b.reward, b.done, infos
+
+    def _collect(self) -> None:
+        """Copy what the workers wrote into the arrays handed to callers."""
+        # Callers never see views of the shared block: close() unmaps it.
+        size = len(self._buffers.buf)
+        self._buffers.buf[:] = self._shm.buf[:size]
+
+    def close(self) -> None:
+        for proc, conn, _, _ in self._procs:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+            proc.join(timeout=5)
+            conn.close()
+        self._procs = []
+        if self._shm is not None:
+            del self._shared
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "VectorEnv":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -1,19 +1,68 @@
+import argparse
 import sys
+import time
+from typing import Callable, Optional
 
 import pygame
 
-from game.core.world import World, COINS_MAX
+from game.core.scenarios import play_bottom_side
+from game.core.world import FIXED_DT, World
 from game.core.actions import PlayCardAction
-from game.ui.draw import (
-    draw_arena_with_bridges,
-    draw_entities,
-    draw_card_bar,
-    draw_coins_bar,
-    draw_game_over_banner,
-)
+from game.core.replay import Replay, ReplayPlayer, ReplayRecorder
+from game.net.lockstep import LockstepError, LockstepSession, TcpTransport, UdpTransport
+from game.ui.draw import DEFAULT_CARD_ORDER, draw_frame
+
+# Simulation ticks per 60 FPS frame; None = "max": step as fast as the CPU
+# allows and only render MAX_SPEED_FPS frames per second.
+TIME_SCALES = (1, 2, 8, None)
+SPEED_CHOICES = {"1": 1, "2": 2, "8": 8, "max": None}
+MAX_SPEED_FPS = 30
+SPEED_COLOR = (255, 255, 255)
+
+
+def _open_session(args, screen_width: int, screen_height: int) -> LockstepSession:
+    """Connect to the other player; the host plays the bottom side."""
+    if args.host:
+        port, team = args.host, "player"
+        peer_host = "127.0.0.1"
+    else:
+        peer_host, _, port_text = args.join.rpartition(":")
+        port, team = int(port_text), "ai"
+
+    if args.udp:
+        local_port, peer_port = (port, port + 1) if team == "player" else (port + 1, port)
+        transport = UdpTransport(("0.0.0.0", local_port), (peer_host, peer_port))
+    elif team == "player":
+        print(f"Waiting for the other player on port {port}...")
+        transport = TcpTransport.listen(port, host="0.0.0.0")
+    else:
+        transport = TcpTransport.connect(peer_host, port)
+
+    world = World(screen_width, screen_height)
+    return LockstepSession(world, transport, team=team, input_delay=args.input_delay)
+
+
+def _speed_label(scale: Optional[int]) -> str:
+    return "MAX" if scale is None else f"{scale}x"
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Smash Royale")
+    parser.add_argument("--record", metavar="PATH", help="save a replay of the match to PATH")
+    parser.add_argument("--host", metavar="PORT", type=int, help="host a two-player match (bottom side)")
+    parser.add_argument("--join", metavar="HOST:PORT", help="join a two-player match (top side)")
+    parser.add_argument("--udp", action="store_true", help="use UDP ports PORT and PORT+1 instead of TCP")
+    parser.add_argument("--input-delay", type=int, default=4, help="lockstep input delay in ticks")
+    parser.add_argument("--watch", action="store_true", help="watch an AI-vs-AI match")
+    parser.add_argument("--replay", metavar="PATH", help="watch a recorded replay")
+    parser.add_argument(
+        "--speed", choices=list(SPEED_CHOICES), default="1",
+        help="initial time scale; change it in game with [ and ] (not in two-player matches)",
+    )
+    args = parser.parse_args()
+
+    session = _open_session(args, 450, 750) if args.host or args.join else None
+
     pygame.init()
 
     # Match smash2.py exactly for window setup.
@@ -22,7 +71,37 @@ def main() -> None:
     pygame.display.set_caption("Smash Royale")
     clock = pygame.time.Clock()
 
-    world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+    replay = ReplayPlayer(Replay.load(args.replay)) if args.replay else None
+    if session is not None:
+        world = session.world
+    elif replay is not None:
+        world = replay.world
+    else:
+        world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+    recorder = ReplayRecorder(world) if args.record else None
+    local_team = session.team if session is not None else "player"
+    pending_time = 0.0
+
+    # One fixed simulation tick of whatever is being played or watched
+    advance: Callable[[], None]
+    if replay is not None:
+        advance = replay.step
+    elif args.watch:
+
+        def advance() -> None:
+            # AI-vs-AI: the heuristic policy plays the bottom side too.
+            play_bottom_side(world)
+            world.step(FIXED_DT)
+
+    else:
+        advance = lambda: world.step(FIXED_DT)  # noqa: E731
+    interactive = replay is None and not args.watch
+
+    def finished() -> bool:
+        return world.game_over or (replay is not None and replay.finished)
+
+    # Time scale: lockstep matches always run in real time
+    scale_index = TIME_SCALES.index(SPEED_CHOICES[args.speed]) if session is None else 0
 
     # UI layout (mirrors smash2.py)
     UI_HEIGHT = 100
@@ -34,18 +113,32 @@ def main() -> None:
     font_ui = pygame.font.Font(None, 20)
 
     # Card selection state (Mario-style cards)
-    card_order = ["mario", "bowser", "dry_bones", "red_shell"]
+    card_order = list(DEFAULT_CARD_ORDER)
     selected_index = 0
 
     running = True
     while running:
-        # Fixed 60 FPS just like smash2.py
-        dt = clock.tick(60) / 1000.0
+        scale = TIME_SCALES[scale_index]
+        # Fixed 60 FPS just like smash2.py; MAX_SPEED_FPS at max speed, where
+        # the update below fills each frame with ticks (and the cap keeps a
+        # finished match from redrawing as fast as the CPU allows)
+        dt = clock.tick(60 if scale is not None else MAX_SPEED_FPS) / 1000.0
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            # Time scale: [ slower, ] faster
+            if event.type == pygame.KEYDOWN and session is None:
+                if event.key in (pygame.K_RIGHTBRACKET, pygame.K_EQUALS):
+                    scale_index = min(scale_index + 1, len(TIME_SCALES) - 1)
+                elif event.key in (pygame.K_LEFTBRACKET, pygame.K_MINUS):
+                    scale_index = max(scale_index - 1, 0)
+                    pending_time = 0.0
+
+            if not interactive:
+                continue
+
             # Card selection + play (player only)
             if event.type == pygame.KEYDOWN and not world.game_over:
                 if event.key == pygame.K_1:
@@ -66,51 +159,68 @@ def main() -> None:
                     idx = int(mx // card_width)
                     if 0 <= idx < len(card_order):
                         selected_index = idx
-                # Click in the player's half of the arena to play a card
-                elif my > PLAY_HEIGHT // 2:
+                # Click in your own half of the arena to play a card
+                elif (my > PLAY_HEIGHT // 2) == (local_team == "player"):
                     lane_width = SCREEN_WIDTH // 3
                     lane_index = max(0, min(2, mx // lane_width))
                     card_id = card_order[selected_index]
                     action = PlayCardAction(card_id=card_id, lane_index=lane_index)
-                    world.apply_player_action(action)
-
-        # UPDATE
-        world.step(dt)
+                    if session is not None:
+                        session.queue_local(action)
+                    else:
+                        world.apply_player_action(action)
+
+        # UPDATE (replays and lockstep need the fixed timestep to stay exact)
+        if session is not None:
+            # Catch up with the wall clock while the peer's inputs are known;
+            # otherwise stall and wait for them.
+            pending_time = min(pending_time + dt, 0.25)
+            try:
+                session.poll()
+                while pending_time >= FIXED_DT and session.step():
+                    pending_time -= FIXED_DT
+            except LockstepError as exc:  # desync or peer left
+                print(f"Match aborted: {exc}", file=sys.stderr)
+                running = False
+        elif scale is None:
+            # Max speed: simulate until the next frame is due, then draw it
+            deadline = time.perf_counter() + 1.0 / MAX_SPEED_FPS
+            while not finished() and time.perf_counter() < deadline:
+                advance()
+        elif scale == 1 and interactive:
+            world.step(FIXED_DT if recorder is not None else dt)
+        else:
+            # `scale` fixed ticks per frame of wall time; only the last is
+            # drawn. Falling behind drops time rather than stalling frames.
+            pending_time = min(pending_time + dt * scale, 0.25 * scale)
+            while pending_time >= FIXED_DT and not finished():
+                advance()
+                pending_time -= FIXED_DT
 
         # RENDER arena, entities, and HUD to visually match smash2.py
-        render_info = world.get_render_info(SCREEN_HEIGHT)
-
-        draw_arena_with_bridges(screen, SCREEN_WIDTH, SCREEN_HEIGHT, PLAY_HEIGHT)
-        draw_entities(screen, world, render_info)
-        draw_card_bar(
+        draw_frame(
             screen,
             world,
             card_order,
             selected_index,
             SCREEN_WIDTH,
+            SCREEN_HEIGHT,
             UI_HEIGHT,
-            PLAY_HEIGHT,
             font_large,
             font_ui,
+            local_team,
         )
-        draw_coins_bar(
-            screen,
-            world.player_coins,
-            COINS_MAX,
-            PLAY_HEIGHT,
-            font_large,
-        )
-        draw_game_over_banner(
-            screen,
-            world.game_over,
-            world.winner,
-            SCREEN_WIDTH,
-            SCREEN_HEIGHT,
-            font_large,
-        )
+        if scale != 1:
+            label = font_small.render(_speed_label(scale), True, SPEED_COLOR)
+            screen.blit(label, (8, 8))
 
         pygame.display.flip()
 
+    if recorder is not None:
+        recorder.finish().save(args.record)
+    if session is not None:
+        session.transport.close()
+
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,175 @@
+# game/net/client.py
+"""
+Client for the match host, plus a load-test bot.
+
+    client = await HostClient.connect("127.0.0.1", 8765)
+    match_id = await client.new_match()
+    client.play(match_id, "player", lane_index=1, card_id="mario")
+
+Load test (starts an in-process host on the same event loop, i.e. one
+core, unless --port is given):
+
+    python -m game.net.client --matches 300 --seconds 20
+
+The report shows simulated ticks per second and the tick lag; the host is
+keeping up while the lag stays within a few ticks, and ticks per second
+divided by 60 is the number of real-time matches one core sustains.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import Callable, Dict, Optional
+
+from game.data.catalog import get_catalog
+from game.net import protocol
+from game.net.host import MatchHost
+
+StatusCallback = Callable[[int, int, int, int, int], None]
+OverCallback = Callable[[int, int, Optional[str]], None]
+
+
+class HostClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._next_tag = 1
+        self._created: Dict[int, asyncio.Future] = {}
+        self._stats: Optional[asyncio.Future] = None
+        self.on_status: Optional[StatusCallback] = None
+        self.on_match_over: Optional[OverCallback] = None
+        self.errors: list = []
+        self._task = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = 8765) -> "HostClient":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def close(self) -> None:
+        self._writer.close()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def new_match(self, builtin_ai: bool = True) -> int:
+        tag = self._next_tag
+        self._next_tag += 1
+        future = asyncio.get_running_loop().create_future()
+        self._created[tag] = future
+        self._writer.write(protocol.encode_new_match(tag, builtin_ai))
+        return await future
+
+    def play(self, match_id: int, team: str, lane_index: int, card_id: str) -> None:
+        self._writer.write(protocol.encode_play(match_id, team, lane_index, card_id))
+
+    def end_match(self, match_id: int) -> None:
+        self._writer.write(protocol.encode_match_id(protocol.END_MATCH, match_id))
+
+    async def stats(self) -> dict:
+        self._stats = asyncio.get_running_loop().create_future()
+        self._writer.write(protocol.frame(protocol.GET_STATS))
+        return await self._stats
+
+    async def _read_loop(self) -> None:
+        try:
+            while True:
+                msg_type, payload = await protocol.read_frame(self._reader)
+                if msg_type == protocol.STATUS:
+                    if self.on_status is not None:
+                        self.on_status(*protocol.decode_status(payload))
+                elif msg_type == protocol.MATCH_OVER:
+                    if self.on_match_over is not None:
+                        self.on_match_over(*protocol.decode_match_over(payload))
+                elif msg_type == protocol.MATCH_CREATED:
+                    tag, match_id = protocol.decode_match_created(payload)
+                    future = self._created.pop(tag, None)
+                    if future is not None:
+                        future.set_result(match_id)
+                elif msg_type == protocol.STATS:
+                    if self._stats is not None and not self._stats.done():
+                        self._stats.set_result(json.loads(payload))
+                elif msg_type == protocol.ERROR:
+                    self.errors.append(payload.decode("utf-8", "replace"))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Load test
+# ---------------------------------------------------------------------------
+
+class _Bot:
+    """Plays the cheapest affordable card from a fixed rotation, lanes round-robin."""
+
+    def __init__(self, client: HostClient, team: str = "player") -> None:
+        catalog = get_catalog()
+        self.client = client
+        self.team = team
+        self.rotation = sorted(catalog.cards)
+        self.costs = {card_id: card.cost for card_id, card in catalog.cards.items()}
+        self.turn: Dict[int, int] = {}
+
+    def on_status(self, match_id: int, tick: int, player_coins: int, ai_coins: int, lag: int) -> None:
+        turn = self.turn.get(match_id, 0)
+        card_id = self.rotation[turn % len(self.rotation)]
+        coins = player_coins if self.team == "player" else ai_coins
+        if coins >= self.costs[card_id]:
+            self.client.play(match_id, self.team, turn % 3, card_id)
+            self.turn[match_id] = turn + 1
+
+
+async def run_load_test(matches: int, seconds: float, host: str, port: Optional[int]) -> dict:
+    local_host: Optional[MatchHost] = None
+    if port is None:
+        local_host = MatchHost()
+        port = await local_host.start(host, 0)
+
+    client = await HostClient.connect(host, port)
+    bot = _Bot(client)
+    client.on_status = bot.on_status
+
+    replacements = []
+
+    def on_match_over(match_id: int, tick: int, winner) -> None:
+        # Keep the population constant: every finished match is replaced.
+        bot.turn.pop(match_id, None)
+        replacements.append(asyncio.ensure_future(client.new_match()))
+
+    client.on_match_over = on_match_over
+
+    await asyncio.gather(*(client.new_match() for _ in range(matches)))
+    await asyncio.sleep(seconds)
+    stats = await client.stats()
+
+    await client.close()
+    for task in replacements:
+        task.cancel()
+    if local_host is not None:
+        await local_host.close()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drive many matches on a match host.")
+    parser.add_argument("--matches", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="existing host (default: in-process)")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load_test(args.matches, args.seconds, args.host, args.port))
+    realtime = stats["ticks_per_second"] / 60.0
+    print(
+        f"{stats['matches']} live matches ({stats['matches_finished']} finished), "
+        f"{stats['ticks_per_second']:.0f} ticks/s = {realtime:.0f} real-time matches, "
+        f"lag mean {stats['lag_mean']:.1f} max {stats['lag_max']} ticks"
+    )
+
+
+if __name__ == "__main__":
+    main()
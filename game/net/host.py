@@ -0,0 +1,270 @@
+# game/net/host.py
+"""
+Asyncio match host: many headless Worlds in one process.
+
+All matches share one tick scheduler. The scheduler works out how many
+ticks each match is due from wall-clock time (`tick_rate` per second since
+the match was created) and then steps matches round-robin, one tick per
+match per pass, so a slow pass delays every match a little instead of
+starving a few. After `slice_seconds` of stepping it yields to the event
+loop so socket I/O keeps flowing; when every match is caught up it sleeps
+until the next tick boundary.
+
+Each match reports its tick lag (ticks due minus ticks simulated) in the
+STATUS messages it sends every `status_every` ticks and in `stats()`.
+
+Clients talk to the host over a local TCP socket using game/net/protocol.py.
+Run a host with:
+
+    python -m game.net.host --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from game.core.actions import PlayCardAction
+from game.core.world import FIXED_DT, TICK_RATE, World
+from game.net import protocol
+from game.net.protocol import ProtocolError
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 450, 750  # same arena as main.py
+
+
+class _Connection:
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.match_ids: List[int] = []
+
+    def send(self, data: bytes) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+
+@dataclass
+class HostedMatch:
+    match_id: int
+    world: World
+    owner: _Connection
+    start_tick: int  # scheduler tick when the match was created
+    pending: Deque[Tuple[str, PlayCardAction]] = field(default_factory=deque)
+    lag: int = 0
+    max_lag: int = 0
+
+
+class MatchHost:
+    def __init__(
+        self,
+        tick_rate: int = TICK_RATE,
+        status_every: int = 30,
+        slice_seconds: float = 0.004,
+    ) -> None:
+        self.tick_rate = tick_rate
+        self.dt = FIXED_DT if tick_rate == TICK_RATE else 1.0 / tick_rate
+        self.status_every = status_every
+        self.slice_seconds = slice_seconds
+
+        self.clock_tick = 0
+        self.ticks_simulated = 0
+        self.matches_finished = 0
+        self._matches: Dict[int, HostedMatch] = {}
+        self._next_match_id = 1
+        self._round_robin = 0
+        self._epoch = 0.0
+        self._started = time.perf_counter()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._scheduler: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Listen on host:port (0 = any free port) and return the bound port."""
+        loop = asyncio.get_running_loop()
+        self._epoch = loop.time()
+        self._started = time.perf_counter()
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._scheduler = asyncio.create_task(self._run_scheduler())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            try:
+                await self._scheduler
+            except asyncio.CancelledError:
+                pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # ------------------------------------------------------------------
+    # Matches
+    # ------------------------------------------------------------------
+    def create_match(self, owner: _Connection, builtin_ai: bool = True) -> HostedMatch:
+        world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+        if not builtin_ai:
+            world.ai_policy = None
+        match = HostedMatch(self._next_match_id, world, owner, start_tick=self.clock_tick)
+        self._next_match_id += 1
+        self._matches[match.match_id] = match
+        owner.match_ids.append(match.match_id)
+        return match
+
+    def end_match(self, match_id: int) -> None:
+        match = self._matches.pop(match_id, None)
+        if match is not None and match_id in match.owner.match_ids:
+            match.owner.match_ids.remove(match_id)
+
+    def _step_match(self, match: HostedMatch) -> None:
+        world = match.world
+        while match.pending:
+            team, action = match.pending.popleft()
+            if team == "player":
+                world.apply_player_action(action)
+            else:
+                world.apply_ai_action(action)
+
+        world.step(self.dt)
+        self.ticks_simulated += 1
+
+        if world.game_over:
+            match.owner.send(protocol.encode_match_over(match.match_id, world._tick, world.winner))
+            self.end_match(match.match_id)
+            self.matches_finished += 1
+        elif world._tick % self.status_every == 0:
+            match.owner.send(
+                protocol.encode_status(
+                    match.match_id, world._tick, world.player_coins, world.ai_coins, match.lag
+                )
+            )
+
+    # ------------------------------------------------------------------
+    # Scheduler
+    # ------------------------------------------------------------------
+    async def _run_scheduler(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            self.clock_tick = int((now - self._epoch) * self.tick_rate)
+            slice_end = now + self.slice_seconds
+
+            behind = True
+            while behind and loop.time() < slice_end:
+                behind = False
+                matches = list(self._matches.values())
+                if not matches:
+                    break
+                # Rotate the starting match so a pass cut short by the time
+                # slice does not always favour the same matches.
+                start = self._round_robin % len(matches)
+                self._round_robin += 1
+                for match in matches[start:] + matches[:start]:
+                    if match.world._tick < self.clock_tick - match.start_tick:
+                        self._step_match(match)
+                        behind = True
+
+            for match in self._matches.values():
+                match.lag = max(0, self.clock_tick - match.start_tick - match.world._tick)
+                match.max_lag = max(match.max_lag, match.lag)
+
+            if behind:
+                await asyncio.sleep(0)
+            else:
+                next_tick_at = self._epoch + (self.clock_tick + 1) / self.tick_rate
+                await asyncio.sleep(max(0.0, next_tick_at - loop.time()))
+
+    def stats(self) -> dict:
+        lags = [m.lag for m in self._matches.values()]
+        uptime = time.perf_counter() - self._started
+        return {
+            "matches": len(self._matches),
+            "matches_finished": self.matches_finished,
+            "ticks_simulated": self.ticks_simulated,
+            "uptime": uptime,
+            "ticks_per_second": self.ticks_simulated / uptime if uptime > 0 else 0.0,
+            "lag_mean": sum(lags) / len(lags) if lags else 0.0,
+            "lag_max": max(lags, default=0),
+            "lag_per_match": {
+                str(m.match_id): {"lag": m.lag, "max_lag": m.max_lag}
+                for m in self._matches.values()
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+    def _dispatch(self, conn: _Connection, msg_type: int, payload: bytes) -> None:
+        if msg_type == protocol.NEW_MATCH:
+            tag, builtin_ai = protocol.decode_new_match(payload)
+            match = self.create_match(conn, builtin_ai)
+            conn.send(protocol.encode_match_created(tag, match.match_id))
+        elif msg_type == protocol.PLAY:
+            match_id, team, lane, card_id = protocol.decode_play(payload)
+            match = self._matches.get(match_id)
+            if match is None or match.owner is not conn:
+                conn.send(protocol.frame(protocol.ERROR, f"no match {match_id}".encode("utf-8")))
+                return
+            match.pending.append((team, PlayCardAction(card_id=card_id, lane_index=lane)))
+        elif msg_type == protocol.END_MATCH:
+            match_id = protocol.decode_match_id(payload)
+            if match_id in conn.match_ids:
+                self.end_match(match_id)
+        elif msg_type == protocol.GET_STATS:
+            conn.send(protocol.frame(protocol.STATS, json.dumps(self.stats()).encode("utf-8")))
+        else:
+            raise ProtocolError(f"unknown message type {msg_type}")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = _Connection(writer)
+        try:
+            while True:
+                msg_type, payload = await protocol.read_frame(reader)
+                self._dispatch(conn, msg_type, payload)
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ProtocolError, ValueError) as exc:
+            conn.send(protocol.frame(protocol.ERROR, str(exc).encode("utf-8")))
+        finally:
+            for match_id in list(conn.match_ids):
+                self.end_match(match_id)
+            writer.close()
+
+
+async def _serve(host: str, port: int) -> None:
+    match_host = MatchHost()
+    bound = await match_host.start(host, port)
+    print(f"match host listening on {host}:{bound}")
+    try:
+        while True:
+            await asyncio.sleep(5.0)
+            s = match_host.stats()
+            print(
+                f"{s['matches']} matches, {s['ticks_per_second']:.0f} ticks/s, "
+                f"lag mean {s['lag_mean']:.1f} max {s['lag_max']}"
+            )
+    finally:
+        await match_host.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host many headless matches in one process.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
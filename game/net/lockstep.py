@@ -0,0 +1,392 @@
+# game/net/lockstep.py
+"""
+Deterministic lockstep for two human players.
+
+Both peers run their own World with the built-in AI disabled; the host
+plays the bottom side ("player"), the guest the top side ("ai"). Only
+tick-stamped card plays cross the wire:
+
+- a local play is scheduled `input_delay` ticks in the future, which
+  hides the round trip as long as the peer's inputs arrive in time,
+- a tick is simulated only once both peers' inputs for it are known
+  (otherwise `step()` returns False and the caller just waits),
+- every `hash_interval` ticks each peer sends its 8-byte state hash; a
+  mismatch raises DesyncError.
+
+Packets (all little-endian):
+
+    HELLO  <B8sBB        type, catalog fingerprint prefix, input delay,
+                         protocol version
+    INPUT  <BIIB + n*<IBB type, inputs final through tick, ack (peer
+                         tick we have through), n, then (tick, card, lane)
+    HASH   <BI8s          type, tick, state hash prefix
+
+Every INPUT repeats all of our plays the peer has not acknowledged yet, so
+the UDP transport needs no separate retransmission: a lost packet is
+covered by the next one. A peer sends INPUTs only once it has checked our
+HELLO, and drops any that arrive before it has checked the peer's, so we
+repeat our HELLO every poll until the first INPUT comes back. Idle traffic is one 10-byte INPUT per tick; a
+card play adds 6 bytes until acknowledged.
+
+Transports: `LoopbackTransport.pair()` (in-process, optional packet loss,
+for tests), `UdpTransport` and `TcpTransport`.
+"""
+
+from __future__ import annotations
+
+import errno
+import select
+import socket
+import struct
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from game.core.actions import PlayCardAction
+from game.core.savestate import state_hash
+from game.core.world import FIXED_DT, World
+from game.data.catalog import get_catalog
+
+LOCKSTEP_VERSION = 1
+
+HELLO = 1
+INPUT = 2
+HASH = 3
+
+_HELLO = struct.Struct("<B8sBB")
+_INPUT = struct.Struct("<BIIB")
+_PLAY = struct.Struct("<IBB")
+_HASH = struct.Struct("<BI8s")
+
+TEAMS = ("player", "ai")
+
+
+class LockstepError(RuntimeError):
+    """The peers cannot play together (different data or settings)."""
+
+
+class DesyncError(LockstepError):
+    """The two simulations diverged."""
+
+    def __init__(self, tick: int) -> None:
+        super().__init__(f"state hash mismatch at tick {tick}")
+        self.tick = tick
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+class Transport:
+    """Unreliable-or-better datagram pipe; `receive()` never blocks."""
+
+    def __init__(self) -> None:
+        self.bytes_sent = 0
+        self.packets_sent = 0
+
+    def send(self, data: bytes) -> None:
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        self._send(data)
+
+    def _send(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    def receive(self) -> List[bytes]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LoopbackTransport(Transport):
+    """In-process transport; drops every `drop_every`-th packet if set."""
+
+    def __init__(self, drop_every: int = 0) -> None:
+        super().__init__()
+        self.drop_every = drop_every
+        self.inbox: Deque[bytes] = deque()
+        self.peer: Optional["LoopbackTransport"] = None
+
+    @classmethod
+    def pair(cls, drop_every: int = 0) -> Tuple["LoopbackTransport", "LoopbackTransport"]:
+        a, b = cls(drop_every), cls(drop_every)
+        a.peer, b.peer = b, a
+        return a, b
+
+    def _send(self, data: bytes) -> None:
+        if self.drop_every and self.packets_sent % self.drop_every == 0:
+            return
+        self.peer.inbox.append(bytes(data))
+
+    def receive(self) -> List[bytes]:
+        packets = list(self.inbox)
+        self.inbox.clear()
+        return packets
+
+
+class UdpTransport(Transport):
+    def __init__(self, bind: Tuple[str, int], peer: Tuple[str, int]) -> None:
+        super().__init__()
+        self.peer = peer
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+
+    def _send(self, data: bytes) -> None:
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError as exc:
+            # The peer may not be listening yet; lockstep resends anyway.
+            if exc.errno not in (errno.ECONNREFUSED, errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
+
+    def receive(self) -> List[bytes]:
+        packets: List[bytes] = []
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, ConnectionRefusedError):
+                return packets
+            if addr == self.peer:
+                packets.append(data)
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class TcpTransport(Transport):
+    """Reliable stream with u16 length framing."""
+
+    _LEN = struct.Struct("<H")
+
+    def __init__(self, sock: socket.socket) -> None:
+        super().__init__()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        self.sock = sock
+        self._buffer = bytearray()
+
+    @classmethod
+    def listen(cls, port: int, host: str = "127.0.0.1", timeout: Optional[float] = None) -> "TcpTransport":
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host, port))
+        server.listen(1)
+        server.settimeout(timeout)
+        try:
+            conn, _ = server.accept()
+        finally:
+            server.close()
+        return cls(conn)
+
+    @classmethod
+    def connect(cls, host: str, port: int, timeout: float = 10.0) -> "TcpTransport":
+        return cls(socket.create_connection((host, port), timeout=timeout))
+
+    def _send(self, data: bytes) -> None:
+        frame = self._LEN.pack(len(data)) + data
+        self.sock.setblocking(True)
+        try:
+            self.sock.sendall(frame)
+        finally:
+            self.sock.setblocking(False)
+
+    def receive(self) -> List[bytes]:
+        while select.select([self.sock], [], [], 0)[0]:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise LockstepError("peer closed the connection")
+            self._buffer += chunk
+
+        packets: List[bytes] = []
+        size = self._LEN.size
+        while len(self._buffer) >= size:
+            (length,) = self._LEN.unpack_from(self._buffer)
+            if len(self._buffer) < size + length:
+                break
+            packets.append(bytes(self._buffer[size : size + length]))
+            del self._buffer[: size + length]
+        return packets
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+# ---------------------------------------------------------------------------
+# Session
+# ---------------------------------------------------------------------------
+
+class LockstepSession:
+    """
+    One peer's side of a lockstep match.
+
+        session = LockstepSession(World(450, 750), transport, team="player")
+        session.queue_local(PlayCardAction("mario", 1))   # on click
+        session.poll()                                    # every frame
+        while behind_wall_clock and session.step(): ...
+    """
+
+    def __init__(
+        self,
+        world: World,
+        transport: Transport,
+        team: str,
+        input_delay: int = 4,
+        hash_interval: int = 60,
+        dt: float = FIXED_DT,
+    ) -> None:
+        if team not in TEAMS:
+            raise ValueError(f"Unknown team {team!r}; expected one of {TEAMS}.")
+        if input_delay < 1:
+            raise ValueError("input_delay must be at least 1 tick.")
+
+        self.world = world
+        world.ai_policy = None  # both sides are human
+        self.transport = transport
+        self.team = team
+        self.peer_team = TEAMS[1 - TEAMS.index(team)]
+        self.input_delay = input_delay
+        self.hash_interval = hash_interval
+        self.dt = dt
+
+        catalog = get_catalog()
+        self._cards: List[str] = sorted(catalog.cards)
+        self._fingerprint = bytes.fromhex(catalog.fingerprint)[:8]
+
+        # Scheduled plays per tick, for each side
+        self._local: Dict[int, List[Tuple[int, int]]] = {}
+        self._remote: Dict[int, List[Tuple[int, int]]] = {}
+        self._unacked: Deque[Tuple[int, int, int]] = deque()  # (tick, card, lane)
+
+        self.peer_through = -1  # peer inputs known for every tick <= this
+        self.peer_ack = -1  # peer has our inputs through this tick
+        self._peer_hello = False  # we have checked the peer's HELLO
+        self._hello_seen = False  # the peer has checked ours (it sends INPUTs)
+
+        self._local_hashes: Dict[int, bytes] = {}
+        self._remote_hashes: Dict[int, bytes] = {}
+        self.desync_tick: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    @property
+    def tick(self) -> int:
+        return self.world._tick
+
+    @property
+    def local_through(self) -> int:
+        """Our inputs are final for every tick up to this one."""
+        return self.world._tick + self.input_delay - 1
+
+    def queue_local(self, action: PlayCardAction) -> None:
+        """Schedule a local play `input_delay` ticks ahead."""
+        if action.card_id not in self._cards:
+            return
+        play = (self._cards.index(action.card_id), max(0, min(2, int(action.lane_index))))
+        tick = self.world._tick + self.input_delay
+        self._local.setdefault(tick, []).append(play)
+        self._unacked.append((tick, *play))
+
+    def can_step(self) -> bool:
+        return self.peer_through >= self.world._tick and not self.world.game_over
+
+    # ------------------------------------------------------------------
+    def poll(self) -> None:
+        """Receive peer packets and send our inputs (call once per frame)."""
+        for packet in self.transport.receive():
+            self._on_packet(packet)
+        self._send_input()
+
+    def step(self) -> bool:
+        """Simulate one tick if both sides' inputs are known."""
+        if not self.can_step():
+            return False
+
+        world = self.world
+        tick = world._tick
+        # Fixed order on both peers: bottom side first, then top side.
+        by_team = {self.team: self._local.pop(tick, ()), self.peer_team: self._remote.pop(tick, ())}
+        for team in TEAMS:
+            for card, lane in by_team[team]:
+                action = PlayCardAction(card_id=self._cards[card], lane_index=lane)
+                if team == "player":
+                    world.apply_player_action(action)
+                else:
+                    world.apply_ai_action(action)
+
+        world.step(self.dt)
+
+        if world._tick % self.hash_interval == 0:
+            digest = state_hash(world)[:8]
+            self._local_hashes[world._tick] = digest
+            self.transport.send(_HASH.pack(HASH, world._tick, digest))
+            self._check_hash(world._tick)
+        return True
+
+    # ------------------------------------------------------------------
+    def _send_input(self) -> None:
+        if not self._hello_seen:
+            self.transport.send(
+                _HELLO.pack(HELLO, self._fingerprint, self.input_delay, LOCKSTEP_VERSION)
+            )
+        if not self._peer_hello:
+            return
+
+        while self._unacked and self._unacked[0][0] <= self.peer_ack:
+            self._unacked.popleft()
+        through = self.local_through
+        plays = [play for play in self._unacked if play[0] <= through]
+        if len(plays) > 255:
+            # Too many pending plays for one packet; only confirm what we send.
+            plays = plays[:255]
+            through = plays[-1][0] - 1
+
+        packet = bytearray(_INPUT.pack(INPUT, through, self.peer_through & 0xFFFFFFFF, len(plays)))
+        for play in plays:
+            packet += _PLAY.pack(*play)
+        self.transport.send(bytes(packet))
+
+    def _on_packet(self, packet: bytes) -> None:
+        kind = packet[0]
+        if kind == HELLO:
+            _, fingerprint, delay, version = _HELLO.unpack(packet)
+            if version != LOCKSTEP_VERSION:
+                raise LockstepError(f"peer speaks lockstep v{version}, we speak v{LOCKSTEP_VERSION}")
+            if fingerprint != self._fingerprint:
+                raise LockstepError("peer has different game data")
+            if delay != self.input_delay:
+                raise LockstepError(f"peer uses input delay {delay}, we use {self.input_delay}")
+            self._peer_hello = True
+        elif kind == INPUT:
+            self._hello_seen = True
+            if not self._peer_hello:
+                # Its HELLO was lost or is late; the peer repeats these plays.
+                return
+            _, through, ack, count = _INPUT.unpack_from(packet)
+            if ack != 0xFFFFFFFF:
+                self.peer_ack = max(self.peer_ack, ack)
+            for tick, card, lane in _PLAY.iter_unpack(packet[_INPUT.size : _INPUT.size + count * _PLAY.size]):
+                # Plays at or below peer_through were already taken from an
+                # earlier packet; resends repeat them until acknowledged.
+                if self.peer_through < tick <= through:
+                    self._remote.setdefault(tick, []).append((card, lane))
+            self.peer_through = max(self.peer_through, through)
+        elif kind == HASH:
+            _, tick, digest = _HASH.unpack(packet)
+            self._remote_hashes[tick] = digest
+            self._check_hash(tick)
+
+    def _check_hash(self, tick: int) -> None:
+        local = self._local_hashes.get(tick)
+        remote = self._remote_hashes.get(tick)
+        if local is None or remote is None:
+            # Hashes whose counterpart was lost in transit are never checked.
+            stale = tick - 8 * self.hash_interval
+            for old in [t for t in self._local_hashes if t < stale]:
+                del self._local_hashes[old]
+            for old in [t for t in self._remote_hashes if t < stale]:
+                del self._remote_hashes[old]
+            return
+        del self._local_hashes[tick], self._remote_hashes[tick]
+        if local != remote:
+            self.desync_tick = tick
+            raise DesyncError(tick)
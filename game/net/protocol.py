@@ -0,0 +1,148 @@
+# game/net/protocol.py
+"""
+Message protocol between the match host and its clients.
+
+Every message is a frame:
+
+    <I  payload length
+    <B  message type
+    ... payload (layout per type below)
+
+Client -> host
+- NEW_MATCH    <IB   request tag, flags (bit0: built-in AI plays the top side)
+- PLAY         <IBB  match id, team (0 player, 1 ai), lane + card id (utf-8)
+- END_MATCH    <I    match id
+- GET_STATS          (empty)
+
+Host -> client
+- MATCH_CREATED <II      request tag, match id
+- STATUS        <IIBBH   match id, tick, player coins, ai coins, tick lag
+- MATCH_OVER    <IIB     match id, tick, winner (0 none, 1 player, 2 ai)
+- STATS                  utf-8 JSON (see MatchHost.stats())
+- ERROR                  utf-8 message
+
+A PLAY is a handful of bytes; the host applies it before the match's next
+tick.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from typing import Tuple
+
+# Message types
+NEW_MATCH = 1
+PLAY = 2
+END_MATCH = 3
+GET_STATS = 4
+MATCH_CREATED = 64
+STATUS = 65
+MATCH_OVER = 66
+STATS = 67
+ERROR = 68
+
+FLAG_BUILTIN_AI = 1
+
+TEAMS = ("player", "ai")
+WINNERS = (None, "player", "ai")
+
+MAX_PAYLOAD = 1 << 20
+
+_FRAME = struct.Struct("<IB")
+_NEW_MATCH = struct.Struct("<IB")
+_PLAY = struct.Struct("<IBB")
+_MATCH_ID = struct.Struct("<I")
+_MATCH_CREATED = struct.Struct("<II")
+_STATUS = struct.Struct("<IIBBH")
+_MATCH_OVER = struct.Struct("<IIB")
+
+
+class ProtocolError(ValueError):
+    """A peer sent a frame that does not follow the protocol."""
+
+
+def _unpack(layout: struct.Struct, payload: bytes, name: str) -> tuple:
+    """`layout.unpack(payload)`, raising ProtocolError on a wrong-sized payload."""
+    if len(payload) != layout.size:
+        raise ProtocolError(f"{name} payload is {len(payload)} bytes, expected {layout.size}")
+    return layout.unpack(payload)
+
+
+def frame(msg_type: int, payload: bytes = b"") -> bytes:
+    return _FRAME.pack(len(payload), msg_type) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    """Read one frame; raises asyncio.IncompleteReadError on EOF."""
+    length, msg_type = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"frame of {length} bytes exceeds {MAX_PAYLOAD}")
+    payload = await reader.readexactly(length) if length else b""
+    return msg_type, payload
+
+
+# ---------------------------------------------------------------------------
+# Encoders / decoders
+# ---------------------------------------------------------------------------
+
+def encode_new_match(tag: int, builtin_ai: bool = True) -> bytes:
+    return frame(NEW_MATCH, _NEW_MATCH.pack(tag, FLAG_BUILTIN_AI if builtin_ai else 0))
+
+
+def decode_new_match(payload: bytes) -> Tuple[int, bool]:
+    tag, flags = _unpack(_NEW_MATCH, payload, "NEW_MATCH")
+    return tag, bool(flags & FLAG_BUILTIN_AI)
+
+
+def encode_play(match_id: int, team: str, lane_index: int, card_id: str) -> bytes:
+    return frame(
+        PLAY, _PLAY.pack(match_id, TEAMS.index(team), lane_index) + card_id.encode("utf-8")
+    )
+
+
+def decode_play(payload: bytes) -> Tuple[int, str, int, str]:
+    if len(payload) < _PLAY.size:
+        raise ProtocolError("short PLAY message")
+    match_id, team, lane = _PLAY.unpack_from(payload)
+    if team >= len(TEAMS):
+        raise ProtocolError(f"unknown team {team}")
+    return match_id, TEAMS[team], lane, payload[_PLAY.size :].decode("utf-8")
+
+
+def encode_match_id(msg_type: int, match_id: int) -> bytes:
+    return frame(msg_type, _MATCH_ID.pack(match_id))
+
+
+def decode_match_id(payload: bytes) -> int:
+    return _unpack(_MATCH_ID, payload, "match id")[0]
+
+
+def encode_match_created(tag: int, match_id: int) -> bytes:
+    return frame(MATCH_CREATED, _MATCH_CREATED.pack(tag, match_id))
+
+
+def decode_match_created(payload: bytes) -> Tuple[int, int]:
+    return _unpack(_MATCH_CREATED, payload, "MATCH_CREATED")
+
+
+def encode_status(match_id: int, tick: int, player_coins: float, ai_coins: float, lag: int) -> bytes:
+    return frame(
+        STATUS,
+        _STATUS.pack(match_id, tick, int(player_coins), int(ai_coins), min(lag, 0xFFFF)),
+    )
+
+
+def decode_status(payload: bytes) -> Tuple[int, int, int, int, int]:
+    return _unpack(_STATUS, payload, "STATUS")
+
+
+def encode_match_over(match_id: int, tick: int, winner) -> bytes:
+    return frame(MATCH_OVER, _MATCH_OVER.pack(match_id, tick, WINNERS.index(winner)))
+
+
+def decode_match_over(payload: bytes) -> Tuple[int, int, object]:
+    match_id, tick, winner = _unpack(_MATCH_OVER, payload, "MATCH_OVER")
+    if winner >= len(WINNERS):
+        raise ProtocolError(f"unknown winner {winner}")
+    return match_id, tick, WINNERS[winner]
@@ -0,0 +1,231 @@
+# game/net/shared_state.py
+"""
+Live match state in shared memory for out-of-process readers.
+
+The writer owns a `multiprocessing.shared_memory` block holding two slots
+(double buffer). Each tick it fills the slot readers are *not* pointed at,
+then flips `latest` to it, so a reader normally has a full tick to finish
+with a slot before it is reused. Each slot also carries a seqlock counter
+(odd while being written); readers check it before and after reading and
+retry if the slot was rewritten underneath them.
+
+Block layout (little-endian, offsets in bytes):
+
+    0   block header  <IHHI4x   magic "SRSM", version, capacity, latest slot
+    16  slot 0, then slot 1, each:
+        <QIIffffBBH4x  seq, tick, entity count, player coins, ai coins,
+                       player king hp, ai king hp, game_over, winner
+                       (0 none, 1 player, 2 ai), dropped entities
+        x      float32[capacity]
+        y      float32[capacity]
+        hp     float32[capacity]
+        uid    uint32[capacity]
+        team   uint8[capacity]    0 player, 1 ai
+        type   uint8[capacity]    troop stats_idx, or 64 + is_king for towers
+        lane   uint8[capacity]    troop lane, 255 for towers
+
+Readers get typed memoryviews straight onto the block (no copies; wrap
+them with numpy.frombuffer if convenient):
+
+    reader = SharedStateReader("smash_match_1")
+    total_hp = reader.read(lambda f: sum(f.hp[: f.count]))
+
+Attach a writer with `world.state_export = SharedStateWriter("smash_match_1")`.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, List, Optional, Set, TypeVar
+
+SHM_MAGIC = 0x4D535253  # "SRSM"
+SHM_VERSION = 1
+TOWER_TYPE = 64
+NO_LANE = 255
+
+TEAMS = ("player", "ai")
+WINNERS = (None, "player", "ai")
+
+_BLOCK = struct.Struct("<IHHI4x")
+_SLOT = struct.Struct("<QIIffffBBH4x")
+_SEQ = struct.Struct("<Q")
+
+T = TypeVar("T")
+
+_OWNED: Set[str] = set()  # blocks created by writers in this process
+
+
+def _slot_size(capacity: int) -> int:
+    size = _SLOT.size + capacity * (4 * 4 + 3)
+    return (size + 7) & ~7
+
+
+def block_size(capacity: int) -> int:
+    return _BLOCK.size + 2 * _slot_size(capacity)
+
+
+class SharedFrame:
+    """Zero-copy views of one slot."""
+
+    def __init__(self, buf: memoryview, offset: int, capacity: int) -> None:
+        self._buf = buf
+        self._offset = offset
+        header = offset + _SLOT.size
+        n = capacity
+        self.x = buf[header : header + 4 * n].cast("f")
+        self.y = buf[header + 4 * n : header + 8 * n].cast("f")
+        self.hp = buf[header + 8 * n : header + 12 * n].cast("f")
+        self.uid = buf[header + 12 * n : header + 16 * n].cast("I")
+        self.team = buf[header + 16 * n : header + 17 * n]
+        self.type = buf[header + 17 * n : header + 18 * n]
+        self.lane = buf[header + 18 * n : header + 19 * n]
+        self._load_header()
+
+    def _load_header(self) -> None:
+        (
+            self.seq,
+            self.tick,
+            self.count,
+            self.player_coins,
+            self.ai_coins,
+            self.player_king_hp,
+            self.ai_king_hp,
+            game_over,
+            winner,
+            self.dropped,
+        ) = _SLOT.unpack_from(self._buf, self._offset)
+        self.game_over = bool(game_over)
+        self.winner = WINNERS[winner] if winner < len(WINNERS) else None
+
+    def current_seq(self) -> int:
+        return _SEQ.unpack_from(self._buf, self._offset)[0]
+
+    def release(self) -> None:
+        for view in (self.x, self.y, self.hp, self.uid, self.team, self.type, self.lane):
+            view.release()
+
+
+class SharedStateWriter:
+    """Publishes World state each tick (assign to `world.state_export`)."""
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 256) -> None:
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=block_size(capacity))
+        self.name = self.shm.name
+        _OWNED.add(self.name)
+        self._buf = self.shm.buf
+        _BLOCK.pack_into(self._buf, 0, SHM_MAGIC, SHM_VERSION, capacity, 0)
+        self._frames: List[SharedFrame] = [
+            SharedFrame(self._buf, _BLOCK.size + i * _slot_size(capacity), capacity) for i in range(2)
+        ]
+        self._latest = 0
+        self._seq = [0, 0]
+
+    def publish(self, world) -> None:
+        slot = 1 - self._latest
+        frame = self._frames[slot]
+        offset = _BLOCK.size + slot * _slot_size(self.capacity)
+
+        # Seqlock: odd while writing.
+        self._seq[slot] += 1
+        _SEQ.pack_into(self._buf, offset, self._seq[slot])
+
+        x, y, hp, uid, team, kind, lane = (
+            frame.x, frame.y, frame.hp, frame.uid, frame.team, frame.type, frame.lane,
+        )
+        capacity = self.capacity
+        i = 0
+        for tower in world.towers:
+            if i >= capacity:
+                break
+            x[i], y[i], hp[i], uid[i] = tower.x, tower.y, tower.hp, tower.uid
+            team[i] = 0 if tower.team == "player" else 1
+            kind[i] = TOWER_TYPE + int(tower.is_king)
+            lane[i] = NO_LANE
+            i += 1
+        for troop in world.troops:
+            if i >= capacity:
+                break
+            x[i], y[i], hp[i], uid[i] = troop.x, troop.y, troop.hp, troop.uid
+            team[i] = 0 if troop.team == "player" else 1
+            kind[i] = troop.stats_idx
+            lane[i] = troop.lane_index
+            i += 1
+        total = len(world.towers) + len(world.troops)
+
+        self._seq[slot] += 1
+        _SLOT.pack_into(
+            self._buf,
+            offset,
+            self._seq[slot],
+            world._tick,
+            i,
+            world.player_coins,
+            world.ai_coins,
+            world.player_king_tower.hp,
+            world.ai_king_tower.hp,
+            world.game_over,
+            WINNERS.index(world.winner),
+            min(0xFFFF, total - i),
+        )
+        self._latest = slot
+        _BLOCK.pack_into(self._buf, 0, SHM_MAGIC, SHM_VERSION, capacity, slot)
+
+    def close(self) -> None:
+        for frame in self._frames:
+            frame.release()
+        self._frames = []
+        self._buf = None
+        self.shm.close()
+        self.shm.unlink()
+        _OWNED.discard(self.name)
+
+
+class SharedStateReader:
+    def __init__(self, name: str) -> None:
+        # The writer owns the block. Before Python 3.13 attaching also
+        # registers it with this process's resource tracker, which would
+        # unlink it when the reader exits; undo that, unless the writer
+        # lives in this process and the registration is its own.
+        if sys.version_info >= (3, 13):
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if self.shm.name not in _OWNED:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+        self._buf = self.shm.buf
+        magic, version, capacity, _ = _BLOCK.unpack_from(self._buf, 0)
+        if magic != SHM_MAGIC or version != SHM_VERSION:
+            self.shm.close()
+            raise ValueError(f"{name!r} is not a shared match state block")
+        self.capacity = capacity
+        self._frames = [
+            SharedFrame(self._buf, _BLOCK.size + i * _slot_size(capacity), capacity) for i in range(2)
+        ]
+
+    def read(self, fn: Callable[[SharedFrame], T], retries: int = 100) -> T:
+        """
+        Call `fn` with a consistent frame and return its result.
+
+        `fn` reads straight from shared memory; if the writer lapped the
+        slot meanwhile, the result is discarded and `fn` runs again.
+        """
+        for _ in range(retries):
+            latest = _BLOCK.unpack_from(self._buf, 0)[3]
+            frame = self._frames[latest]
+            frame._load_header()
+            if frame.seq & 1:
+                continue
+            result = fn(frame)
+            if frame.current_seq() == frame.seq:
+                return result
+        raise RuntimeError("could not read a consistent frame; writer too fast")
+
+    def close(self) -> None:
+        for frame in self._frames:
+            frame.release()
+        self._frames = []
+        self._buf = None
+        self.shm.close()
@@ -0,0 +1,470 @@
+# game/profile.py
+"""
+Profile a headless match or stress scenario.
+
+    python -m game.profile match --ticks 3000
+    python -m game.profile clustered --units 1000 --ticks 300 --mode sampling
+    python -m game.profile recorded.replay --out profiles/
+
+The scenario is one of:
+
+- `match`: an AI-vs-AI match (the bottom side plays the built-in policy
+  too; `--seed` staggers its decisions so seeds play out differently),
+- `spread` / `clustered`: a stress battle from game/core/scenarios.py
+  with `--units` troops placed from `--seed`,
+- a path to a replay recorded with `python -m game.main --record`.
+
+Nothing but the simulation runs: no window, no frame clock. Two profilers
+are available:
+
+- `deterministic` (default) hooks every Python and C function call with
+  `sys.setprofile` and charges the time between events to the current
+  call stack. Exact call stacks, but the hook slows the run down
+  several times over, which inflates cheap, frequently called functions.
+- `sampling` records the main thread's stack every `--interval` ms from
+  a background thread. Much lower overhead; short runs are noisy.
+
+Both produce:
+
+- `<out>/<name>.folded`: collapsed stacks ("root;caller;callee weight",
+  weight in microseconds), the input format of flamegraph.pl, speedscope
+  and inferno;
+- a top-N report of the hottest functions by self and total time;
+- time per World phase. A stack belongs to the innermost phase method on
+  it (`PHASES`): regen (coin timers), towers, troops, projectiles,
+  cleanup (dead removal, crowd separation, win check), ai (either side's
+  policy), and tick for the rest of `World.step`.
+
+Comparing the phase table (or diffing two .folded files) between two
+commits answers "what got slower".
+
+`--mode alloc` runs the scenario under tracemalloc instead
+(`AllocationTracker`) and reports, per tick, the bytes and blocks left
+allocated at the end of the tick, the peak of temporary memory during
+it, and gen-0 garbage collections, plus the call sites that kept the
+most. tracemalloc only sees memory that is still allocated when a
+snapshot is taken, so temporaries freed within a tick show up in the
+peak, not under their call site. tests/test_alloc_budget.py holds
+steady-state ticks to a budget on these numbers.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from game.core.world import FIXED_DT, TICK_RATE, World
+
+Stack = Tuple[str, ...]
+
+# World methods (by qualified name) -> phase their time is charged to.
+PHASES: Dict[str, str] = {
+    "World.step": "tick",
+    "World._regen_coins": "regen",
+    "World._update_towers": "towers",
+    "World._update_troops": "troops",
+    "World._update_projectiles": "projectiles",
+    "World._cleanup": "cleanup",
+    "World._run_ai_policy": "ai",
+    "play_bottom_side": "ai",
+}
+PHASE_ORDER = ("regen", "towers", "troops", "projectiles", "cleanup", "ai", "tick", "other")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _code_label(code: CodeType) -> str:
+    path = code.co_filename
+    if path.startswith(_ROOT):
+        path = os.path.relpath(path, _ROOT)
+    else:
+        path = os.path.basename(path)
+    return f"{code.co_qualname} ({path}:{code.co_firstlineno})"
+
+
+def _c_label(func) -> str:
+    module = getattr(func, "__module__", None) or type(getattr(func, "__self__", None)).__name__
+    return f"{module}.{func.__qualname__} (C)" if module else f"{func.__qualname__} (C)"
+
+
+def _phase_label(label: str) -> str:
+    return label.split(" (", 1)[0]
+
+
+# ---------------------------------------------------------------------------
+# Profilers
+# ---------------------------------------------------------------------------
+
+class DeterministicProfiler:
+    """Charges wall time between profile events to the current call stack."""
+
+    def __init__(self) -> None:
+        self.weights: Counter = Counter()  # stack -> ns
+        self._stack: Stack = ()
+        self._last = 0
+        self._labels: Dict[object, str] = {}
+
+    def _hook(self, frame: FrameType, event: str, arg) -> None:
+        now = time.perf_counter_ns()
+        stack = self._stack
+        if stack:
+            self.weights[stack] += now - self._last
+        if event == "call":
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _code_label(code)
+            self._stack = stack + (label,)
+        elif event == "c_call":
+            label = self._labels.get(arg)
+            if label is None:
+                label = self._labels[arg] = _c_label(arg)
+            self._stack = stack + (label,)
+        elif stack:  # return, c_return, c_exception
+            self._stack = stack[:-1]
+        self._last = time.perf_counter_ns()
+
+    def start(self) -> None:
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._hook)
+
+    def stop(self) -> None:
+        sys.setprofile(None)
+
+    def stacks(self) -> Dict[Stack, float]:
+        """Stack -> microseconds."""
+        return {stack: ns / 1000.0 for stack, ns in self.weights.items()}
+
+
+class SamplingProfiler:
+    """Samples the profiled thread's stack every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.samples: Counter = Counter()  # stack -> samples
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._switch = sys.getswitchinterval()
+        self._labels: Dict[CodeType, str] = {}
+        self._elapsed = 0.0
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self._thread_id)
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _code_label(code)
+            labels.append(label)
+            frame = frame.f_back
+        if labels:
+            self.samples[tuple(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        # Let the sampler get the GIL about as often as it asks for it.
+        sys.setswitchinterval(min(self._switch, self.interval / 2))
+        self._sampler = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._elapsed = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._elapsed = time.perf_counter() - self._elapsed
+        if self._sampler is not None:
+            self._sampler.join()
+        sys.setswitchinterval(self._switch)
+
+    def stacks(self) -> Dict[Stack, float]:
+        """
+        Stack -> microseconds. Samples come late when the profiled thread
+        holds the GIL, so the run's wall time is split by sample share
+        rather than counting `interval` per sample.
+        """
+        total = sum(self.samples.values())
+        us = self._elapsed * 1e6 / total if total else 0.0
+        return {stack: n * us for stack, n in self.samples.items()}
+
+
+# ---------------------------------------------------------------------------
+# Allocations
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TickAllocations:
+    net_bytes: int  # still allocated at the end of the tick
+    net_blocks: Optional[int]  # None unless tracking call sites
+    peak_bytes: int  # highest temporary use above the start of the tick
+    collections: int  # gen-0 garbage collections during the tick
+
+
+class AllocationTracker:
+    """
+    Steps a World under tracemalloc, one `TickAllocations` per tick.
+
+        with AllocationTracker() as tracker:
+            for _ in range(600):
+                tracker.step(world)
+        tracker.sites.most_common(10)  # (file, line) -> net bytes
+
+    Only memory allocated while tracing is seen, so build the world (and
+    let lazily built caches fill) before starting. Call sites need two
+    snapshots per tick; `by_site=False` skips them and only measures
+    byte totals, which is much faster.
+    """
+
+    def __init__(self, frames: int = 1, by_site: bool = True) -> None:
+        self.frames = frames
+        self.by_site = by_site
+        self.ticks: List[TickAllocations] = []
+        self.sites: Counter = Counter()  # (filename, lineno) -> net bytes
+        self.site_blocks: Counter = Counter()
+        # The tracker's own bookkeeping is not the tick's
+        self._ignore = {tracemalloc.__file__, __file__}
+        self._started = False
+
+    def __enter__(self) -> "AllocationTracker":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def step(self, world: World, dt: float = FIXED_DT) -> TickAllocations:
+        return self.measure(lambda: world.step(dt))
+
+    def measure(self, tick: Callable[[], object]) -> TickAllocations:
+        """Run one tick's worth of work, `tick()`, and record what it allocated."""
+        before = tracemalloc.take_snapshot() if self.by_site else None
+        collections = gc.get_stats()[0]["collections"]
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        tick()
+        current, peak = tracemalloc.get_traced_memory()
+        collections = gc.get_stats()[0]["collections"] - collections
+        if before is None:
+            result = TickAllocations(current - start, None, peak - start, collections)
+            self.ticks.append(result)
+            return result
+
+        after = tracemalloc.take_snapshot()
+
+        net_bytes = net_blocks = 0
+        for stat in after.compare_to(before, "lineno"):
+            frame = stat.traceback[0]
+            if (stat.size_diff or stat.count_diff) and frame.filename not in self._ignore:
+                self.sites[(frame.filename, frame.lineno)] += stat.size_diff
+                self.site_blocks[(frame.filename, frame.lineno)] += stat.count_diff
+                net_bytes += stat.size_diff
+                net_blocks += stat.count_diff
+        result = TickAllocations(net_bytes, net_blocks, peak - start, collections)
+        self.ticks.append(result)
+        return result
+
+
+def print_alloc_report(tracker: AllocationTracker, top: int) -> None:
+    ticks = tracker.ticks
+    if not ticks:
+        return
+    print(f"\n{'per tick':<14} {'mean':>10} {'max':>10} {'total':>10}")
+    for name in ("net_bytes", "net_blocks", "peak_bytes", "collections"):
+        values = [getattr(t, name) for t in ticks]
+        if None in values:
+            continue
+        print(f"{name:<14} {statistics.fmean(values):>10.1f} {max(values):>10} {sum(values):>10}")
+
+    print(f"\n{'net bytes':>10} {'blocks':>8}  call site")
+    sites = sorted(tracker.sites.items(), key=lambda kv: (-abs(kv[1]), kv[0]))
+    for site, size in sites[:top]:
+        filename, lineno = site
+        if filename.startswith(_ROOT):
+            filename = os.path.relpath(filename, _ROOT)
+        print(f"{size:>10} {tracker.site_blocks[site]:>8}  {filename}:{lineno}")
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+def write_folded(stacks: Dict[Stack, float], path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        for stack, us in sorted(stacks.items()):
+            weight = int(round(us))
+            if weight > 0:
+                fh.write(";".join(label.replace(";", ",") for label in stack) + f" {weight}\n")
+
+
+def hot_functions(stacks: Dict[Stack, float]) -> List[Tuple[str, float, float]]:
+    """(function, self us, total us), hottest self time first."""
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, us in stacks.items():
+        own[stack[-1]] += us
+        for label in set(stack):  # recursion counts once
+            total[label] += us
+    return sorted(((f, own[f], total[f]) for f in total), key=lambda row: (-row[1], -row[2], row[0]))
+
+
+def phase_times(stacks: Dict[Stack, float]) -> Dict[str, float]:
+    """Phase -> microseconds, by the innermost phase method on each stack."""
+    phases: Counter = Counter()
+    for stack, us in stacks.items():
+        phase = "other"
+        for label in reversed(stack):
+            found = PHASES.get(_phase_label(label))
+            if found is not None:
+                phase = found
+                break
+        phases[phase] += us
+    return dict(phases)
+
+
+def print_report(stacks: Dict[Stack, float], ticks: int, top: int) -> None:
+    total = sum(stacks.values()) or 1.0
+    print(f"\n{'phase':<12} {'ms':>10} {'%':>6} {'us/tick':>9}")
+    phases = phase_times(stacks)
+    for phase in PHASE_ORDER:
+        us = phases.get(phase, 0.0)
+        print(f"{phase:<12} {us / 1e3:>10.1f} {us / total:>6.1%} {us / max(ticks, 1):>9.1f}")
+
+    print(f"\n{'self ms':>9} {'self %':>7} {'total ms':>9}  function")
+    for label, own, cumulative in hot_functions(stacks)[:top]:
+        print(f"{own / 1e3:>9.1f} {own / total:>7.1%} {cumulative / 1e3:>9.1f}  {label}")
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def _match(seed: int, ticks: int) -> Iterator[World]:
+    from game.core.scenarios import play_bottom_side
+
+    world = World(450, 750)
+    for _ in range(ticks):
+        play_bottom_side(world, seed)
+        world.step(FIXED_DT)
+        yield world
+        if world.game_over:
+            return
+
+
+def _stress(layout: str, units: int, seed: int, ticks: int) -> Iterator[World]:
+    from game.core.scenarios import Scenario, build_world
+
+    world = build_world(Scenario(units=units, layout=layout, seed=seed, builtin_ai=True))
+    for _ in range(ticks):
+        world.step(FIXED_DT)
+        yield world
+        if world.game_over:
+            return
+
+
+def _replay(path: str, ticks: int) -> Iterator[World]:
+    from game.core.replay import Replay, ReplayPlayer
+
+    player = ReplayPlayer(Replay.load(path))
+    for _ in range(ticks):
+        if player.finished:
+            return
+        player.step()
+        yield player.world
+
+
+def scenario_runner(scenario: str, units: int, seed: int, ticks: int) -> Callable[[], Iterator[World]]:
+    from game.core.scenarios import LAYOUTS
+
+    if scenario == "match":
+        return lambda: _match(seed, ticks)
+    if scenario in LAYOUTS:
+        return lambda: _stress(scenario, units, seed, ticks)
+    if os.path.exists(scenario):
+        return lambda: _replay(scenario, ticks)
+    raise ValueError(
+        f"Unknown scenario {scenario!r}; expected 'match', one of {LAYOUTS}, or a replay path."
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile a headless match or stress scenario.")
+    parser.add_argument("scenario", help="'match', 'spread', 'clustered' or a replay path")
+    parser.add_argument("--ticks", type=int, default=60 * TICK_RATE, help="tick limit")
+    parser.add_argument("--units", type=int, default=500, help="troops in a stress scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--mode", choices=("deterministic", "sampling", "alloc"), default="deterministic"
+    )
+    parser.add_argument("--interval", type=float, default=1.0, help="sampling interval in ms")
+    parser.add_argument("--top", type=int, default=25, help="functions in the hot list")
+    parser.add_argument("--out", default=".", help="directory for the .folded file")
+    args = parser.parse_args()
+
+    try:
+        run = scenario_runner(args.scenario, args.units, args.seed, args.ticks)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    # The first tick builds the world and loads game data; it is not
+    # profiled. numpy is otherwise imported on the first ranged shot.
+    ticks = run()
+    world = next(ticks)
+    import numpy  # noqa: F401
+
+    if args.mode == "alloc":
+        with AllocationTracker() as tracker:
+            try:
+                while True:
+                    tracker.measure(lambda: next(ticks))
+            except StopIteration:
+                pass  # the match ended
+        print(f"{args.scenario}: {len(tracker.ticks)} ticks under tracemalloc")
+        print_alloc_report(tracker, args.top)
+        return
+
+    profiler = (
+        DeterministicProfiler() if args.mode == "deterministic"
+        else SamplingProfiler(args.interval / 1000.0)
+    )
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        count = sum(1 for _ in ticks)
+    finally:
+        profiler.stop()
+    elapsed = time.perf_counter() - start
+
+    stacks = profiler.stacks()
+    name = args.scenario if not os.path.exists(args.scenario) else Path(args.scenario).stem
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    folded = out / f"{name}-{args.mode}.folded"
+    write_folded(stacks, folded)
+
+    print(
+        f"{args.scenario}: {count} ticks in {elapsed:.2f} s ({args.mode}), "
+        f"winner {world.winner or '-'}; wrote {folded}"
+    )
+    print_report(stacks, count, args.top)
+
+
+if __name__ == "__main__":
+    main()
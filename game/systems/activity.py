@@ -0,0 +1,150 @@
+# game/systems/activity.py
+"""
+Sleeping idle towers and troops.
+
+Most of a big fight is entities waiting: towers with nobody in range and
+troops standing on a locked target while their attack cooldown runs. The
+World only updates the awake ones:
+
+- a tower sleeps while it is cooling down, and while no enemy troop is
+  inside its wake band: the horizontal strip its range disc spans. The
+  band is fixed per tower, and each tick costs one min/max over the enemy
+  team's y positions instead of a distance check per enemy per tower.
+  Troops outside the band cannot be in range, so this never changes what
+  a tower does.
+- a troop sleeps after attacking while its target is still alive. It
+  wakes when its cooldown timer fires (see game/systems/timers.py), or
+  as soon as its target dies, so it can pick a new one. A sleeper does
+  not re-check its range, so if crowd pushes carry the target out of
+  reach it only steps after it (or retargets) on waking; matches
+  therefore differ slightly from `Activity(enabled=False)`.
+
+Sleep state follows from the saved entity state (cooldowns and target
+locks), so `reset()` rebuilds it after a save state is loaded.
+`counts` holds this tick's awake / asleep totals for profiling.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from game.entities.tower import Tower
+    from game.entities.troop import Troop
+
+
+@dataclass
+class ActivityCounts:
+    towers_awake: int = 0
+    towers_asleep: int = 0
+    troops_awake: int = 0
+    troops_asleep: int = 0
+
+
+def wake_band(tower: "Tower") -> Tuple[float, float]:
+    """y range an enemy troop must be in to be within `tower`'s range."""
+    _, cy = tower.get_center()
+    # Troop centres are truncated to whole pixels, hence the extra pixel.
+    reach = tower.range + 1.0
+    return (cy - reach, cy + reach)
+
+
+def y_extent(troops: Sequence["Troop"]) -> Optional[Tuple[float, float]]:
+    """(min y, max y) over `troops`, or None when there are none."""
+    if not troops:
+        return None
+    ys = [t.y for t in troops]
+    return (min(ys), max(ys))
+
+
+def _target_alive(troop: "Troop") -> bool:
+    target = troop.current_target
+    return target is not None and target.hp > 0 and not getattr(target, "dead", False)
+
+
+class Activity:
+    """
+    Which towers and troops need an update this tick.
+
+    `enabled=False` keeps every troop awake (towers still skip their
+    cooldowns), for measuring what sleeping saves.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.counts = ActivityCounts()
+        # target uid -> (target, {sleeper uid: sleeper}) for death wake-ups
+        self._watchers: Dict[int, Tuple[object, Dict[int, "Troop"]]] = {}
+
+    def clear(self) -> None:
+        self._watchers.clear()
+
+    # ------------------------------------------------------------------
+    # Towers
+    # ------------------------------------------------------------------
+    def awake_towers(
+        self, towers: Sequence["Tower"], enemy_extent: Optional[Tuple[float, float]]
+    ) -> list:
+        """Towers that are off cooldown with an enemy troop inside their wake band."""
+        awake = []
+        for tower in towers:
+            if tower.cooling or enemy_extent is None:
+                tower.asleep = True
+            else:
+                low, high = wake_band(tower)
+                tower.asleep = enemy_extent[1] < low or enemy_extent[0] > high
+            if not tower.asleep:
+                awake.append(tower)
+        return awake
+
+    # ------------------------------------------------------------------
+    # Troops
+    # ------------------------------------------------------------------
+    def settle(self, troop: "Troop") -> None:
+        """After `troop` updated: put it to sleep if it only waits for its cooldown."""
+        if not (self.enabled and troop.cooling and _target_alive(troop)):
+            return
+        troop.asleep = True
+        target = troop.current_target
+        entry = self._watchers.get(target.uid)
+        if entry is None:
+            entry = self._watchers[target.uid] = (target, {})
+        entry[1][troop.uid] = troop
+
+    def wake(self, entity) -> None:
+        """Cooldown over: `entity` may attack again."""
+        entity.cooling = False
+        if not entity.asleep:
+            return
+        entity.asleep = False
+        target = getattr(entity, "current_target", None)
+        if target is not None:
+            entry = self._watchers.get(target.uid)
+            if entry is not None:
+                entry[1].pop(entity.uid, None)
+                if not entry[1]:
+                    del self._watchers[target.uid]
+
+    def wake_orphans(self) -> None:
+        """Wake every sleeper whose target died this tick."""
+        watchers = self._watchers
+        if not watchers:
+            return
+        fallen = [
+            uid for uid, (target, _) in watchers.items()
+            if target.hp <= 0 or getattr(target, "dead", False)
+        ]
+        for uid in fallen:
+            _, sleepers = watchers.pop(uid)
+            for troop in sleepers.values():
+                troop.asleep = False
+
+    def reset(self, towers: Iterable["Tower"], troops: Iterable["Troop"]) -> None:
+        """Rebuild sleep state from cooldowns and target locks (after loading)."""
+        self._watchers.clear()
+        for tower in towers:
+            tower.asleep = False
+        for troop in troops:
+            troop.asleep = False
+            self.settle(troop)
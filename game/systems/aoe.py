@@ -0,0 +1,134 @@
+# game/systems/aoe.py
+"""
+Data-driven area damage.
+
+A troop's `splash` block in troops.json (see `SplashDef` in
+game/data/catalog.py) describes the area hit that follows each of its
+matching main hits:
+
+    "splash": {"radius": 45, "damage_ratio": 0.4, "falloff": 0.0, "trigger": "building"}
+
+Victims come from a radius query on the enemy team's `UnitIndex`
+(game/systems/spatial.py), so a splash costs the troops near the impact
+rather than a scan over the whole enemy team. Callers without an index
+(unit tests, micro-benchmarks) can pass the enemy list instead and get the
+same victims from a linear scan.
+
+Spells or any other area effect can reuse `troops_within` and
+`apply_area_damage` the same way.
+
+With `fixed_point` (see game/systems/fixed.py) the radius test compares
+squared distances and falloff damage is worked out in integer steps.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, List, Optional, Sequence, Union
+
+from game.systems import fixed
+from game.systems.telemetry import SPLASH, record_hit
+
+if TYPE_CHECKING:
+    from game.data.catalog import SplashDef
+    from game.entities.troop import Troop
+    from game.systems.spatial import UnitIndex
+    from game.systems.telemetry import EventBus
+
+Enemies = Union["UnitIndex", Sequence["Troop"]]
+
+
+def triggers(splash: "SplashDef", target) -> bool:
+    """True if a main hit on `target` should set off `splash`."""
+    if splash.trigger == "any":
+        return True
+    is_building = hasattr(target, "is_king")
+    return is_building if splash.trigger == "building" else not is_building
+
+
+def troops_within(
+    enemies: Enemies, x: float, y: float, radius: float, fixed_point: bool = False
+) -> List["Troop"]:
+    """Live enemy troops strictly closer than `radius` to (x, y)."""
+    if hasattr(enemies, "within"):
+        return enemies.within(x, y, radius, fixed_point)
+    hits = []
+    radius_sq = radius * radius
+    for e in enemies:
+        if e.hp > 0 and not getattr(e, "dead", False):
+            ex, ey = e.get_center()
+            if fixed_point:
+                inside = (ex - x) * (ex - x) + (ey - y) * (ey - y) < radius_sq
+            else:
+                inside = math.hypot(ex - x, ey - y) < radius
+            if inside:
+                hits.append(e)
+    return hits
+
+
+def apply_area_damage(
+    source,
+    x: float,
+    y: float,
+    radius: float,
+    damage: float,
+    falloff: float,
+    enemies: Enemies,
+    events: Optional["EventBus"] = None,
+    fixed_point: bool = False,
+    exclude=None,
+) -> int:
+    """Damage every enemy troop around (x, y) but `exclude`; returns how many were hit."""
+    victims = troops_within(enemies, x, y, radius, fixed_point)
+    if exclude is not None:
+        victims = [e for e in victims if e is not exclude]
+    if fixed_point:
+        damage = fixed.quantize(damage)
+        steps = fixed.to_steps(damage)
+        falloff_steps = fixed.to_steps(falloff)
+        per_step = fixed.to_steps(radius) << fixed.SHIFT
+    for e in victims:
+        amount = damage
+        if falloff:
+            ex, ey = e.get_center()
+            if fixed_point:
+                lost = steps * falloff_steps * fixed.length(ex - x, ey - y)
+                amount = (steps - fixed.div_round(lost, per_step)) / fixed.SCALE
+            else:
+                amount = damage * (1.0 - falloff * math.hypot(ex - x, ey - y) / radius)
+        e.hp -= amount
+        if e.hp <= 0:
+            e.dead = True
+        if events is not None:
+            record_hit(events, SPLASH, source, e, amount)
+    return len(victims)
+
+
+def apply_splash(
+    source,
+    splash: "SplashDef",
+    target,
+    enemies: Enemies,
+    events: Optional["EventBus"] = None,
+    fixed_point: bool = False,
+) -> int:
+    """
+    Resolve `source`'s splash around the main `target`, if the hit
+    triggers it. The target itself already took the main hit and is
+    spared.
+    """
+    if not triggers(splash, target):
+        return 0
+    tx, ty = target.get_center()
+    return apply_area_damage(
+        source,
+        tx,
+        ty,
+        splash.radius,
+        source.damage * splash.damage_ratio,
+        splash.falloff,
+        enemies,
+        events,
+        fixed_point,
+        target,
+    )
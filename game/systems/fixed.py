@@ -0,0 +1,71 @@
+# game/systems/fixed.py
+"""
+Fixed-point arithmetic for the bit-exact simulation mode.
+
+`World(..., fixed_point=True)` keeps positions, hit points, damage, speeds
+and ranges on a grid of 1/SCALE units and does its geometry in integers:
+
+- values on the grid are still stored as Python floats, so renderers,
+  save states and AI views read pixels and hit points as before. A float
+  holds a multiple of 1/SCALE exactly, and `to_steps()` turns it back
+  into its integer step count with no rounding;
+- range checks compare squared integer distances against squared ranges;
+- where a length is needed (the nearest target, a movement step) it is
+  `math.isqrt` of an integer, and divisions round to the nearest step.
+
+The float path relies on `math.hypot`, `** 0.5` and numpy's vectorised
+`hypot`, which are not required to round the same way on every platform
+or Python build. Integer arithmetic is, so a fixed-point match produces
+the same state hash on any machine.
+"""
+
+from __future__ import annotations
+
+from math import isqrt
+from typing import Tuple
+
+SHIFT = 8
+SCALE = 1 << SHIFT  # steps per pixel / per hit point
+
+
+def quantize(value: float) -> float:
+    """`value` rounded to the nearest step."""
+    return round(value * SCALE) / SCALE
+
+
+def to_steps(value: float) -> int:
+    """Integer step count of `value` (exact for values on the grid)."""
+    return round(value * SCALE)
+
+
+def div_round(n: int, d: int) -> int:
+    """n / d for d > 0, rounded to the nearest integer (ties round up)."""
+    return (2 * n + d) // (2 * d)
+
+
+def length(dx: int, dy: int) -> int:
+    """Length of the integer vector (dx, dy), in steps of its unit, rounded down."""
+    return isqrt((dx * dx + dy * dy) << (2 * SHIFT))
+
+
+def distance(dx: int, dy: int) -> float:
+    """`math.hypot` of an integer vector, rounded down to a step."""
+    return isqrt((dx * dx + dy * dy) << (2 * SHIFT)) / SCALE
+
+
+def unit(dx: int, dy: int) -> Tuple[int, int]:
+    """Unit vector along the non-zero integer vector (dx, dy), in steps."""
+    n = length(dx, dy)
+    return (div_round(dx << (2 * SHIFT), n), div_round(dy << (2 * SHIFT), n))
+
+
+def step_toward(x: float, y: float, dx: int, dy: int, speed: float) -> Tuple[float, float]:
+    """(x, y) moved `speed` pixels along the integer offset (dx, dy), to the nearest step."""
+    n = isqrt((dx * dx + dy * dy) << (2 * SHIFT))
+    if not n:
+        return x, y
+    s = 2 * round(speed * SCALE) << SHIFT
+    twice = 2 * n
+    # Adding whole steps to a value on the grid is exact, so x need not be converted.
+    return x + (dx * s + n) // twice / SCALE, y + (dy * s + n) // twice / SCALE
+
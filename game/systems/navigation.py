@@ -0,0 +1,196 @@
+# game/systems/navigation.py
+"""
+Flow fields that route ground troops over the bridges.
+
+The river (game/core/arena.py) can only be crossed on a bridge. Rather
+than pathfinding per troop, each destination gets a `FlowField`: a grid
+over the battlefield that stores, per cell, the heading a ground unit in
+that cell should walk:
+
+- cells on the destination's bank are marked "direct": the unit walks
+  straight at its target as before;
+- cells lined up with a bridge, on it or just before it, head straight
+  across, as do river cells on the destination's half of the river (the
+  quickest way out of the water);
+- every other cell heads for the entry of the bridge that gives the
+  shortest walk (to the entry, over the bridge, then on to the
+  destination).
+
+Destinations are enemy towers, keyed by position, plus one "far bank"
+field per side of the river for troops chasing other troops, whose
+positions are not known in advance. Fields are built on first use and
+cached per arena layout, so they are only rebuilt when the arena or a
+tower position changes. A move then costs one grid lookup and a step.
+Walking straight never steps from dry ground into the water either
+(`walkable`): a unit chasing a target at the river's edge stops on the
+bank. Flying troops ignore all this and fly straight.
+
+Fixed-point worlds (see game/systems/fixed.py) get their own fields, with
+route costs and headings worked out in integers and headings on the grid.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+
+from game.core.arena import ArenaLayout, arena_layout
+from game.systems import fixed
+
+CELL_SIZE = 10  # px per flow-field cell
+APPROACH = 12  # px before a bank where units line up with the bridge
+
+NORTH, SOUTH = -1, 1  # side of the river, also the y direction of a crossing
+RIVER = 0
+
+Heading = Tuple[float, float]
+FieldKey = Union[int, Tuple[int, int]]  # far-bank side, or a tower centre
+
+
+class FlowField:
+    """Per-cell headings toward one destination (see the module docstring)."""
+
+    __slots__ = ("cols", "rows", "heading_x", "heading_y", "direct")
+
+    def __init__(self, cols: int, rows: int) -> None:
+        self.cols = cols
+        self.rows = rows
+        n = cols * rows
+        # Flat arrays rather than lists: a few blocks per field instead of
+        # one float object per cell.
+        self.heading_x = array("d", bytes(8 * n))
+        self.heading_y = array("d", bytes(8 * n))
+        self.direct = bytearray(n)
+
+    def heading(self, x: float, y: float) -> Optional[Heading]:
+        """Unit heading at (x, y), or None to walk straight at the target."""
+        col = min(max(int(x // CELL_SIZE), 0), self.cols - 1)
+        row = min(max(int(y // CELL_SIZE), 0), self.rows - 1)
+        i = row * self.cols + col
+        if self.direct[i]:
+            return None
+        return (self.heading_x[i], self.heading_y[i])
+
+
+def _side(layout: ArenaLayout, y: float) -> int:
+    """Half of the battlefield `y` is in."""
+    return NORTH if y < layout.river_mid else SOUTH
+
+
+def _bank(layout: ArenaLayout, y: float) -> int:
+    """Bank `y` is on, or RIVER between the banks."""
+    if y < layout.river_top:
+        return NORTH
+    if y > layout.river_bottom:
+        return SOUTH
+    return RIVER
+
+
+def _fixed_hypot(dx: float, dy: float) -> float:
+    """`math.hypot` of a half-pixel offset, in integers (see game/systems/fixed.py)."""
+    return fixed.length(int(2 * dx), int(2 * dy)) / (2 * fixed.SCALE)
+
+
+def build_field(
+    layout: ArenaLayout,
+    side: int,
+    goal: Optional[Tuple[float, float]],
+    fixed_point: bool = False,
+) -> FlowField:
+    """Flow field toward `side` of the river, ending at `goal` if given."""
+    hypot = _fixed_hypot if fixed_point else math.hypot
+    cols = -(-layout.width // CELL_SIZE)
+    rows = -(-layout.play_height // CELL_SIZE)
+    field = FlowField(cols, rows)
+
+    # Units start on the other side: they enter at the near bank and leave
+    # at the far one.
+    near_y = layout.river_bottom + APPROACH if side == NORTH else layout.river_top - APPROACH
+    far_y = layout.river_top - APPROACH if side == NORTH else layout.river_bottom + APPROACH
+    routes = []
+    for bx, _, bw, _ in layout.bridges:
+        centre = bx + bw / 2.0
+        tail = hypot(goal[0] - centre, goal[1] - far_y) if goal is not None else 0.0
+        routes.append((bx, bx + bw, centre, tail))
+
+    i = 0
+    for row in range(rows):
+        cy = (row + 0.5) * CELL_SIZE
+        bank = _bank(layout, cy)
+        across = bank == RIVER and _side(layout, cy) == side
+        near_bank = bank == RIVER or near_y - APPROACH <= cy <= near_y + APPROACH
+        for col in range(cols):
+            cx = (col + 0.5) * CELL_SIZE
+            if bank == side:
+                field.direct[i] = 1
+                i += 1
+                continue
+
+            hx, hy = 0.0, float(side)  # straight across
+            if not across and not (
+                near_bank and any(left <= cx <= right for left, right, _, _ in routes)
+            ):
+                best = None
+                for _, _, centre, tail in routes:
+                    cost = hypot(centre - cx, near_y - cy) + tail
+                    if best is None or cost < best[0]:
+                        best = (cost, centre)
+                dx, dy = best[1] - cx, near_y - cy
+                if fixed_point:
+                    if dx or dy:
+                        hx, hy = fixed.unit(int(2 * dx), int(2 * dy))
+                        hx, hy = hx / fixed.SCALE, hy / fixed.SCALE
+                else:
+                    dist = math.hypot(dx, dy)
+                    if dist > 0:
+                        hx, hy = dx / dist, dy / dist
+            field.heading_x[i] = hx
+            field.heading_y[i] = hy
+            i += 1
+    return field
+
+
+class Navigator:
+    """Flow fields for one arena layout, built on first use."""
+
+    def __init__(self, layout: ArenaLayout, fixed_point: bool = False) -> None:
+        self.layout = layout
+        self.fixed_point = fixed_point
+        self._fields: Dict[FieldKey, FlowField] = {}
+
+    def field(self, key: FieldKey) -> FlowField:
+        field = self._fields.get(key)
+        if field is None:
+            if isinstance(key, tuple):  # a tower centre
+                field = build_field(self.layout, _side(self.layout, key[1]), key, self.fixed_point)
+            else:
+                field = build_field(self.layout, key, None, self.fixed_point)
+            self._fields[key] = field
+        return field
+
+    def walkable(self, x: float, y: float) -> bool:
+        """True unless (x, y) is in the river off the bridges."""
+        layout = self.layout
+        if not layout.river_top <= y <= layout.river_bottom:
+            return True
+        return any(bx <= x <= bx + bw for bx, _, bw, _ in layout.bridges)
+
+    def steer(self, x: float, y: float, target) -> Optional[Heading]:
+        """
+        Heading for a ground unit at (x, y) walking to `target` (a tower or
+        troop), or None when it can walk straight.
+        """
+        tx, ty = target.get_center()
+        side = _side(self.layout, ty)
+        if _bank(self.layout, y) == side:
+            return None
+        key: FieldKey = (tx, ty) if hasattr(target, "is_king") else side
+        return self.field(key).heading(x, y)
+
+
+@lru_cache(maxsize=None)
+def navigator_for(width: int, play_height: int, fixed_point: bool = False) -> Navigator:
+    """Shared Navigator (and its cached fields) for an arena size and number mode."""
+    return Navigator(arena_layout(width, play_height), fixed_point)
@@ -0,0 +1,237 @@
+# game/systems/projectiles.py
+"""
+Array-backed projectile pool for ranged troops and towers.
+
+Shots are rows in a set of preallocated numpy arrays rather than Python
+objects. The live projectiles are always packed at the front, in firing
+order, in `[0, count)`:
+
+    x, y        current position
+    tx, ty      aim point: the target's position at launch, refreshed
+                every tick for homing shots
+    speed       pixels per tick
+    damage      applied on impact
+    target      uid of the entity the shot was fired at
+    source      uid of the shooter (telemetry only)
+    homing      follows the target until impact
+    team        0 player shot, 1 ai shot (drawing only)
+
+`fire()` only queues a row. `update()` runs once per tick, after every
+unit has acted. It appends the queued rows, refreshes homing aim points,
+advances every shot in a single vectorised pass and resolves the impacts:
+- homing shots always hit a target that is still alive;
+- fixed shots fly to the launch point and only hit if the target is still
+  within its radius of that point.
+Shots whose target died in flight carry on to the last known point and
+vanish. Finished rows are dropped by one order-preserving compaction, so
+the simulation stays deterministic. A `fixed_point` pool (see
+game/systems/fixed.py) moves shots in int64 steps instead of with
+`np.hypot`, so flight paths are bit-exact on any machine.
+
+numpy is imported on first use, so simulation-only tools that never fire a
+ranged shot do not pay for it at startup.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from game.systems import fixed
+from game.systems.telemetry import ATTACK, record_hit_by
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from game.systems.telemetry import EventBus
+
+# Row layout used by fire() / rows() / load(): the order of _FIELDS.
+Row = Tuple[float, float, float, float, float, float, int, int, bool, int]
+
+_FIELDS = ("x", "y", "tx", "ty", "speed", "damage", "target", "source", "homing", "team")
+_DTYPES = ("f8", "f8", "f8", "f8", "f8", "f8", "i8", "i8", "?", "u1")
+
+
+def _advance_fixed(x, y, tx, ty, speed) -> "np.ndarray":
+    """Move shots toward their aim points in whole grid steps; returns `arrived`."""
+    import numpy as np
+
+    # Everything below is a whole number of steps held in float64, which is
+    # exact far beyond the board's ~2**36 squared steps: products, sums and
+    # floor division of such values never round.
+    scale = fixed.SCALE
+    dx = (tx - x) * scale
+    dy = (ty - y) * scale
+    # IEEE sqrt is correctly rounded, and below 2**52 that never lifts a
+    # non-square up to the next whole number, so floor() is the exact isqrt.
+    dist = np.floor(np.sqrt(dx * dx + dy * dy))
+    step = np.rint(speed * scale)
+    arrived = dist <= step
+    d = np.where(arrived, 1.0, dist)
+    step[arrived] = 0.0
+    # fixed.div_round(dx * step, d) for every shot at once.
+    x += np.floor_divide(2 * dx * step + d, 2 * d) / scale
+    y += np.floor_divide(2 * dy * step + d, 2 * d) / scale
+    return arrived
+
+
+class ProjectilePool:
+    def __init__(self, capacity: int = 1024, fixed_point: bool = False) -> None:
+        self.capacity = capacity
+        self.fixed_point = fixed_point
+        self.count = 0
+        self.fired = 0  # lifetime totals, for benchmarks / debugging
+        self.hits = 0
+        self._pending: List[Row] = []
+        self._arrays: Optional[dict] = None
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _allocate(self, capacity: int) -> None:
+        import numpy as np
+
+        old = self._arrays
+        self._arrays = {
+            name: np.zeros(capacity, dtype=dtype) for name, dtype in zip(_FIELDS, _DTYPES)
+        }
+        if old is not None:
+            for name in _FIELDS:
+                self._arrays[name][: self.count] = old[name][: self.count]
+        self.capacity = capacity
+
+    @property
+    def active(self) -> bool:
+        """True while shots are queued or in flight (`update()` has work to do)."""
+        return bool(self.count or self._pending)
+
+    def view(self, name: str) -> "np.ndarray":
+        """Live slice of one field (length `count`); empty before the first shot."""
+        if self._arrays is None:
+            return ()  # type: ignore[return-value]
+        return self._arrays[name][: self.count]
+
+    def clear(self) -> None:
+        self.count = 0
+        self._pending.clear()
+
+    def rows(self) -> List[Row]:
+        """Live projectiles as plain tuples (for save states)."""
+        if not self.count:
+            return []
+        columns = [self._arrays[name][: self.count].tolist() for name in _FIELDS]
+        return list(zip(*columns))
+
+    def load(self, rows: Sequence[Row]) -> None:
+        """Replace the live projectiles with `rows` (see `rows()`)."""
+        self.clear()
+        self._store(rows)
+
+    def _store(self, rows: Sequence[Row]) -> None:
+        n = len(rows)
+        if not n:
+            return
+        if self._arrays is None or self.count + n > self.capacity:
+            capacity = max(self.capacity, 16)
+            while capacity < self.count + n:
+                capacity *= 2
+            self._allocate(capacity)
+        start, end = self.count, self.count + n
+        columns = list(zip(*rows))
+        for name, column in zip(_FIELDS, columns):
+            self._arrays[name][start:end] = column
+        self.count = end
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+    def fire(self, source, target, damage: float, speed: float, homing: bool = True) -> None:
+        """Queue a shot from `source`'s centre at `target` (both need uid/team)."""
+        sx, sy = source.get_center()
+        tx, ty = target.get_center()
+        self._pending.append(
+            (sx, sy, tx, ty, speed, damage, target.uid, source.uid, homing, source.team != "player")
+        )
+        self.fired += 1
+
+    def update(self, entities: Sequence[object], events: Optional["EventBus"] = None) -> None:
+        """
+        Advance all shots one tick and apply impacts to `entities`.
+
+        `entities` is every tower and troop that can be hit; only those
+        with hp > 0 count as alive.
+        """
+        if self._pending:
+            self._store(self._pending)
+            self._pending.clear()
+        n = self.count
+        if not n:
+            return
+
+        import numpy as np
+
+        a = self._arrays
+        x, y = a["x"][:n], a["y"][:n]
+        tx, ty = a["tx"][:n], a["ty"][:n]
+        speed, target, homing = a["speed"][:n], a["target"][:n], a["homing"][:n]
+
+        # uid -> position of every live entity, sorted by uid.
+        alive = [e for e in entities if e.hp > 0]
+        if alive:
+            uids = np.fromiter((e.uid for e in alive), dtype=np.int64, count=len(alive))
+            order = np.argsort(uids, kind="stable")
+            uids = uids[order]
+            ex = np.fromiter((e.x for e in alive), dtype=np.float64, count=len(alive))[order]
+            ey = np.fromiter((e.y for e in alive), dtype=np.float64, count=len(alive))[order]
+            slot = np.minimum(np.searchsorted(uids, target), len(uids) - 1)
+            found = uids[slot] == target
+        else:
+            order = slot = None
+            found = np.zeros(n, dtype=bool)
+
+        # Homing shots re-aim at their target's current position.
+        follow = homing & found
+        if follow.any():
+            tx[follow] = np.floor(ex[slot[follow]])
+            ty[follow] = np.floor(ey[slot[follow]])
+
+        if self.fixed_point:
+            arrived = _advance_fixed(x, y, tx, ty, speed)
+            moving = ~arrived
+        else:
+            dx = tx - x
+            dy = ty - y
+            dist = np.hypot(dx, dy)
+            arrived = dist <= speed
+            moving = ~arrived
+            step = np.where(moving, speed / np.where(moving, dist, 1.0), 0.0)
+            x += dx * step
+            y += dy * step
+        x[arrived] = tx[arrived]
+        y[arrived] = ty[arrived]
+
+        if arrived.any():
+            hit_idx = np.flatnonzero(arrived & found)
+            if len(hit_idx):
+                damage, source = a["damage"][:n], a["source"][:n]
+                for i in hit_idx.tolist():
+                    entity = alive[int(order[slot[i]])]
+                    if not homing[i]:
+                        cx, cy = entity.get_center()
+                        if (cx - tx[i]) ** 2 + (cy - ty[i]) ** 2 > entity.radius ** 2:
+                            continue
+                    if entity.hp <= 0:
+                        continue  # an earlier shot this tick already killed it
+                    amount = float(damage[i])
+                    entity.hp -= amount
+                    if entity.hp <= 0:
+                        entity.dead = True
+                    self.hits += 1
+                    if events is not None:
+                        record_hit_by(events, ATTACK, int(source[i]), entity, amount)
+
+            keep = moving
+            kept = int(np.count_nonzero(keep))
+            for name in _FIELDS:
+                column = a[name]
+                column[:kept] = column[:n][keep]
+            self.count = kept
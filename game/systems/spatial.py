@@ -0,0 +1,361 @@
+# game/systems/spatial.py
+"""
+Uniform-grid spatial hash and crowd separation.
+
+`SpatialHash` buckets items by the grid cell their position falls into.
+With a cell at least as large as the biggest interaction distance, every
+pair of items that can interact lies in the same or in adjacent cells, so
+neighbour search only needs the 3x3 block around a cell and costs
+O(n * local density) instead of O(n^2).
+
+`UnitIndex` wraps one for "troops within radius" queries during combat
+(area damage, see game/systems/aoe.py).
+
+`separate()` uses it to keep troops from stacking on one pixel:
+- separation steering: units closer than SEPARATION_RANGE times their
+  combined radii drift apart, more strongly the closer they get;
+- soft collision: overlapping units are pushed apart by a fraction of the
+  overlap each tick (rather than all at once, which would jitter).
+
+Flying and ground units live on separate layers and never push each other.
+Pushes are accumulated for all pairs first and applied afterwards, so the
+result does not depend on which unit of a pair is visited first, and the
+grid is walked in insertion order, keeping the simulation deterministic.
+`separate_fixed()` is the same pass in integer steps, for the fixed-point
+simulation mode (see game/systems/fixed.py).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import (
+    TYPE_CHECKING, Callable, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar,
+)
+
+from game.systems import fixed
+
+if TYPE_CHECKING:
+    from game.entities.troop import Troop
+
+T = TypeVar("T")
+
+SEPARATION_RANGE = 1.25  # personal space, in multiples of the combined radii
+SEPARATION_PUSH = 0.35  # px per tick at zero distance from steering alone
+COLLISION_STIFFNESS = 0.25  # fraction of the overlap resolved per tick (per unit)
+MAX_PUSH_FRACTION = 0.5  # a unit moves at most this share of its radius per tick
+
+# The same constants in fixed-point steps (ratios scaled by fixed.SCALE)
+_RANGE_STEPS = fixed.to_steps(SEPARATION_RANGE)
+_PUSH_STEPS = fixed.to_steps(SEPARATION_PUSH)
+_STIFFNESS_STEPS = fixed.to_steps(COLLISION_STIFFNESS)
+_MAX_PUSH_STEPS = fixed.to_steps(MAX_PUSH_FRACTION)
+
+# Forward half of the 3x3 neighbourhood: each pair of cells is visited once.
+_FORWARD = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class SpatialHash(Generic[T]):
+    """
+    Items bucketed by grid cell; rebuilt from scratch every tick.
+
+        grid = SpatialHash(cell_size=64)
+        grid.insert(item, x, y)
+        for other in grid.query(x, y): ...
+    """
+
+    def __init__(self, cell_size: float) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self.cells: Dict[Tuple[int, int], List[T]] = {}
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        size = self.cell_size
+        return (int(x // size), int(y // size))
+
+    def insert(self, item: T, x: float, y: float) -> None:
+        key = self.cell_of(x, y)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+
+    def query(self, x: float, y: float) -> Iterator[T]:
+        """Items in the 3x3 block of cells around (x, y); callers filter by distance."""
+        cx, cy = self.cell_of(x, y)
+        cells = self.cells
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    yield from bucket
+
+    def query_radius(self, x: float, y: float, radius: float) -> Iterator[T]:
+        """Items in every cell touched by the circle's bounding box; callers filter by distance."""
+        x0, y0 = self.cell_of(x - radius, y - radius)
+        x1, y1 = self.cell_of(x + radius, y + radius)
+        cells = self.cells
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                bucket = cells.get((gx, gy))
+                if bucket:
+                    yield from bucket
+
+    def candidate_pairs(self) -> Iterator[Tuple[T, T]]:
+        """Every unordered pair of items in the same or adjacent cells, once."""
+        cells = self.cells
+        for (cx, cy), bucket in cells.items():
+            n = len(bucket)
+            for i in range(n):
+                a = bucket[i]
+                for j in range(i + 1, n):
+                    yield a, bucket[j]
+            for dx, dy in _FORWARD:
+                other = cells.get((cx + dx, cy + dy))
+                if other:
+                    for a in bucket:
+                        for b in other:
+                            yield a, b
+
+
+class UnitIndex:
+    """
+    One team's troops bucketed by position, for radius queries within a tick.
+
+    `reset()` is cheap; the grid is only built on the first query after it,
+    so ticks without area damage pay nothing. Positions are indexed as of
+    that first query, and troops can still move a little afterwards in the
+    same tick, so candidates come from a radius widened by `slack` (the
+    most a troop moves per tick) and are then checked exactly against
+    their current positions.
+    """
+
+    def __init__(self, cell_size: float, slack: float) -> None:
+        self.grid: SpatialHash["Troop"] = SpatialHash(cell_size)
+        self.slack = slack
+        self._troops: Sequence["Troop"] = ()
+        self._built = False
+
+    def reset(self, troops: Sequence["Troop"]) -> None:
+        self._troops = troops
+        self._built = False
+
+    def within(
+        self, x: float, y: float, radius: float, fixed_point: bool = False
+    ) -> List["Troop"]:
+        """
+        Live troops whose centre is strictly closer than `radius` to (x, y);
+        with `fixed_point`, by squared distance (see game/systems/fixed.py).
+        """
+        grid = self.grid
+        if not self._built:
+            grid.clear()
+            for troop in self._troops:
+                grid.insert(troop, troop.x, troop.y)
+            self._built = True
+
+        hits = []
+        radius_sq = radius * radius
+        for troop in grid.query_radius(x, y, radius + self.slack):
+            if troop.hp <= 0 or getattr(troop, "dead", False):
+                continue
+            cx, cy = troop.get_center()
+            if fixed_point:
+                inside = (cx - x) * (cx - x) + (cy - y) * (cy - y) < radius_sq
+            else:
+                inside = math.hypot(cx - x, cy - y) < radius
+            if inside:
+                hits.append(troop)
+        return hits
+
+
+def crowd_cell_size(max_radius: float) -> float:
+    """Smallest cell that keeps every separating pair in adjacent cells."""
+    return 2.0 * max_radius * SEPARATION_RANGE
+
+
+def separate(
+    troops: Sequence["Troop"],
+    grid: SpatialHash[int],
+    width: float,
+    height: float,
+    walkable: Optional[Callable[[float, float], bool]] = None,
+) -> None:
+    """
+    Push overlapping / crowding troops apart in place.
+
+    `grid` is cleared and refilled with indices into `troops`; positions are
+    clamped to the 0..width x 0..height battlefield afterwards. With
+    `walkable` (see game/systems/navigation.py), ground troops are never
+    pushed from walkable ground onto ground that is not: they slide along
+    the edge or stay put.
+    """
+    n = len(troops)
+    if n < 2:
+        return
+
+    grid.clear()
+    xs = [0.0] * n
+    ys = [0.0] * n
+    for i, troop in enumerate(troops):
+        xs[i] = troop.x
+        ys[i] = troop.y
+        grid.insert(i, troop.x, troop.y)
+
+    radii = [troop.radius for troop in troops]
+    flying = [troop.is_flying for troop in troops]
+    push_x = [0.0] * n
+    push_y = [0.0] * n
+
+    for i, j in grid.candidate_pairs():
+        if flying[i] != flying[j]:
+            continue
+        dx = xs[j] - xs[i]
+        dy = ys[j] - ys[i]
+        spacing = radii[i] + radii[j]
+        personal = spacing * SEPARATION_RANGE
+        dist_sq = dx * dx + dy * dy
+        if dist_sq >= personal * personal:
+            continue
+
+        if dist_sq > 1e-12:
+            dist = dist_sq ** 0.5
+            ux, uy = dx / dist, dy / dist
+        else:
+            # Exactly stacked: split along x, lower index to the left.
+            dist = 0.0
+            ux, uy = 1.0, 0.0
+
+        push = SEPARATION_PUSH * (1.0 - dist / personal)
+        if dist < spacing:
+            push += COLLISION_STIFFNESS * (spacing - dist)
+
+        px, py = ux * push, uy * push
+        push_x[i] -= px
+        push_y[i] -= py
+        push_x[j] += px
+        push_y[j] += py
+
+    for i, troop in enumerate(troops):
+        px, py = push_x[i], push_y[i]
+        if px == 0.0 and py == 0.0:
+            continue
+        limit = radii[i] * MAX_PUSH_FRACTION
+        mag_sq = px * px + py * py
+        if mag_sq > limit * limit:
+            scale = limit / mag_sq ** 0.5
+            px *= scale
+            py *= scale
+        x = min(max(xs[i] + px, 0.0), width)
+        y = min(max(ys[i] + py, 0.0), height)
+        if walkable is not None and not flying[i] and not walkable(x, y) and walkable(xs[i], ys[i]):
+            y = ys[i]
+            if not walkable(x, y):
+                continue
+        troop.x = x
+        troop.y = y
+
+
+def separate_fixed(
+    troops: Sequence["Troop"],
+    grid: SpatialHash[int],
+    width: float,
+    height: float,
+    walkable: Optional[Callable[[float, float], bool]] = None,
+) -> None:
+    """
+    `separate()` on the fixed-point grid: distances and pushes are integer
+    steps, lengths come from `math.isqrt` and divisions round to the
+    nearest step.
+
+    Most candidate pairs are too far apart to push. That test runs on the
+    stored floats, which is exact: positions, radii and SEPARATION_RANGE
+    are multiples of 1/SCALE well below 2**20, so their differences, squares and sums need
+    far fewer than a double's 53 bits. Pairs that pass are redone in ints.
+    """
+    n = len(troops)
+    if n < 2:
+        return
+
+    isqrt = math.isqrt
+    shift = fixed.SHIFT
+    scale = fixed.SCALE
+    grid.clear()
+    xs = [0.0] * n
+    ys = [0.0] * n
+    xi = [0] * n
+    yi = [0] * n
+    for i, troop in enumerate(troops):
+        x, y = troop.x, troop.y
+        xs[i] = x
+        ys[i] = y
+        # On the grid, x * scale is a whole number: int() is exact.
+        xi[i] = int(x * scale)
+        yi[i] = int(y * scale)
+        grid.insert(i, x, y)
+
+    radii = [troop.radius for troop in troops]  # whole pixels
+    flying = [troop.is_flying for troop in troops]
+    push_x = [0] * n
+    push_y = [0] * n
+    range_steps = _RANGE_STEPS
+    push_steps = _PUSH_STEPS
+    stiffness = _STIFFNESS_STEPS
+
+    for i, j in grid.candidate_pairs():
+        if flying[i] != flying[j]:
+            continue
+        dx = xs[j] - xs[i]
+        dy = ys[j] - ys[i]
+        radius_sum = radii[i] + radii[j]
+        personal = radius_sum * SEPARATION_RANGE
+        if dx * dx + dy * dy >= personal * personal:
+            continue
+
+        dx = xi[j] - xi[i]
+        dy = yi[j] - yi[i]
+        personal = radius_sum * range_steps
+        spacing = radius_sum << shift
+        dist = isqrt(dx * dx + dy * dy)
+        push = push_steps * (personal - dist) // personal
+        if dist < spacing:
+            push += (stiffness * (spacing - dist)) >> shift
+
+        if dist:
+            # dx * push / dist, rounded to the nearest step (fixed.div_round)
+            twice = 2 * dist
+            push *= 2
+            px = (dx * push + dist) // twice
+            py = (dy * push + dist) // twice
+        else:
+            # Exactly stacked: split along x, lower index to the left.
+            px, py = push, 0
+        push_x[i] -= px
+        push_y[i] -= py
+        push_x[j] += px
+        push_y[j] += py
+
+    max_x = fixed.to_steps(width)
+    max_y = fixed.to_steps(height)
+    for i, troop in enumerate(troops):
+        px, py = push_x[i], push_y[i]
+        if not px and not py:
+            continue
+        limit = radii[i] * _MAX_PUSH_STEPS
+        mag_sq = px * px + py * py
+        if mag_sq > limit * limit:
+            mag = isqrt(mag_sq)
+            px = fixed.div_round(px * limit, mag)
+            py = fixed.div_round(py * limit, mag)
+        x = min(max(xi[i] + px, 0), max_x) / scale
+        y = min(max(yi[i] + py, 0), max_y) / scale
+        if walkable is not None and not flying[i] and not walkable(x, y) and walkable(xs[i], ys[i]):
+            y = ys[i]
+            if not walkable(x, y):
+                continue
+        troop.x = x
+        troop.y = y
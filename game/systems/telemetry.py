@@ -0,0 +1,232 @@
+# game/systems/telemetry.py
+"""
+Per-tick combat telemetry.
+
+The simulation emits small `Event` tuples (spawns, attacks, splash hits,
+target switches, troop deaths, tower destruction) into an `EventBus`:
+
+    bus = EventBus(capacity=8192)
+    world.events = bus
+
+Consumers attach in one of two ways:
+- callbacks: `bus.subscribe(fn)`; at the end of every `World.step` the
+  tick's events are handed to each subscriber in order,
+- a generator: with no subscribers, events stay in the bounded ring buffer
+  and `bus.drain()` yields (and removes) them whenever the consumer pulls.
+  If the consumer falls behind, the oldest events are overwritten and
+  counted in `bus.dropped`.
+
+`JsonlWriter` and `BinaryEventWriter` are ready-made subscribers that
+buffer events and write them out in batches.
+
+When `world.events` is None (the default) the simulation only pays for a
+few `is not None` checks per attack.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from collections import deque
+from typing import BinaryIO, Callable, Deque, Iterator, List, NamedTuple, Optional, TextIO
+
+# Event kinds
+SPAWN = 0  # source = spawned troop, value = stats_idx
+ATTACK = 1  # source hits target for `value` damage
+SPLASH = 2  # area damage from source onto target
+TARGET = 3  # source locked onto a new target
+DEATH = 4  # source killed troop `target`
+TOWER_DESTROYED = 5  # source destroyed tower `target`
+
+KIND_NAMES = ("spawn", "attack", "splash", "target", "death", "tower_destroyed")
+
+NO_ENTITY = 0  # uid used when an event has no source/target
+
+
+class Event(NamedTuple):
+    tick: int
+    kind: int
+    source: int  # entity uid
+    target: int  # entity uid or NO_ENTITY
+    value: float
+    x: float  # where it happened (target position for hits)
+    y: float
+
+
+Subscriber = Callable[[Event], None]
+
+
+class EventBus:
+    """Bounded ring buffer of Events plus end-of-tick dispatch."""
+
+    def __init__(self, capacity: int = 8192) -> None:
+        if capacity <= 0:
+            raise ValueError("EventBus capacity must be positive.")
+        self.capacity = capacity
+        self.tick = 0
+        self.dropped = 0
+        self._buffer: Deque[Event] = deque(maxlen=capacity)
+        self._subscribers: List[Subscriber] = []
+
+    def emit(self, kind: int, source: int, target: int, value: float, x: float, y: float) -> None:
+        if len(self._buffer) == self.capacity:
+            self.dropped += 1
+        self._buffer.append(Event(self.tick, kind, source, target, float(value), float(x), float(y)))
+
+    def subscribe(self, callback: Subscriber) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        self._subscribers.remove(callback)
+
+    def end_tick(self) -> None:
+        """Deliver buffered events to subscribers (called by World.step)."""
+        if not self._subscribers:
+            return
+        buffer = self._buffer
+        subscribers = self._subscribers
+        while buffer:
+            event = buffer.popleft()
+            for callback in subscribers:
+                callback(event)
+
+    def drain(self) -> Iterator[Event]:
+        """Yield and remove every buffered event, oldest first."""
+        buffer = self._buffer
+        while buffer:
+            yield buffer.popleft()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+
+def record_hit(events: EventBus, kind: int, source, target, amount: float) -> None:
+    """Emit a hit of `kind` plus the death / destruction it caused, if any."""
+    record_hit_by(events, kind, source.uid, target, amount)
+
+
+def record_hit_by(events: EventBus, kind: int, source_uid: int, target, amount: float) -> None:
+    """`record_hit` for sources known only by uid (e.g. projectiles in flight)."""
+    events.emit(kind, source_uid, target.uid, amount, target.x, target.y)
+    if getattr(target, "dead", False):
+        died = TOWER_DESTROYED if hasattr(target, "is_king") else DEATH
+        events.emit(died, source_uid, target.uid, 0.0, target.x, target.y)
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+class JsonlWriter:
+    """Subscriber writing one JSON object per line, `batch_size` lines at a time."""
+
+    def __init__(self, f: TextIO, batch_size: int = 512) -> None:
+        self._file = f
+        self.batch_size = batch_size
+        self._pending: List[str] = []
+
+    def __call__(self, event: Event) -> None:
+        self._pending.append(
+            json.dumps(
+                {
+                    "tick": event.tick,
+                    "kind": KIND_NAMES[event.kind],
+                    "source": event.source,
+                    "target": event.target,
+                    "value": event.value,
+                    "x": event.x,
+                    "y": event.y,
+                },
+                separators=(",", ":"),
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+EVENTS_MAGIC = b"SREV"
+EVENTS_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sH")
+# tick, kind, source, target, value, x, y
+_RECORD = struct.Struct("<IBIIfff")
+
+
+class BinaryEventWriter:
+    """Subscriber writing fixed-size little-endian records (see `read_events`)."""
+
+    def __init__(self, f: BinaryIO, batch_size: int = 4096) -> None:
+        self._file = f
+        self.batch_size = batch_size
+        self._pending = bytearray()
+        self._count = 0
+        f.write(_FILE_HEADER.pack(EVENTS_MAGIC, EVENTS_VERSION))
+
+    def __call__(self, event: Event) -> None:
+        self._pending += _RECORD.pack(*event)
+        self._count += 1
+        if self._count >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending = bytearray()
+            self._count = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def read_events(f: BinaryIO) -> Iterator[Event]:
+    """Iterate the events in a file written by BinaryEventWriter."""
+    header = b""
+    while len(header) < _FILE_HEADER.size:
+        chunk = f.read(_FILE_HEADER.size - len(header))
+        if not chunk:
+            return
+        header += chunk
+    magic, version = _FILE_HEADER.unpack(header)
+    if magic != EVENTS_MAGIC or version != EVENTS_VERSION:
+        raise ValueError("not a telemetry event file")
+    # Reads from a pipe or a file still being written can end mid-record
+    # (or mid-header); the partial record is kept for the next read.
+    pending = b""
+    while True:
+        chunk = f.read(_RECORD.size * 1024)
+        if not chunk:
+            return
+        pending += chunk
+        whole = len(pending) - len(pending) % _RECORD.size
+        for record in _RECORD.iter_unpack(pending[:whole]):
+            yield Event(*record)
+        pending = pending[whole:]
+
+
+def stream(world, dt: float, max_ticks: Optional[int] = None, capacity: int = 8192) -> Iterator[Event]:
+    """
+    Generator consumer: step `world` and yield its events as they happen.
+
+        for event in stream(world, FIXED_DT, max_ticks=3600):
+            ...
+    """
+    bus = EventBus(capacity)
+    previous = world.events
+    world.events = bus
+    try:
+        ticks = 0
+        while not world.game_over and (max_ticks is None or ticks < max_ticks):
+            world.step(dt)
+            ticks += 1
+            yield from bus.drain()
+    finally:
+        world.events = previous
@@ -0,0 +1,66 @@
+# game/systems/timers.py
+"""
+Priority-queue timers for the simulation.
+
+Instead of every entity counting its own cooldown down each tick, the
+World schedules one entry per pending event and pops only the ones that
+are due:
+
+    timers = TimerQueue()
+    timers.schedule(tick + 30, tower)          # attack ready again
+    for due, tower in timers.pop_due(tick):
+        ...
+
+Entries come out ordered by (due, rank, insertion order). `rank` breaks
+ties between different kinds of timer that fall due together (e.g. coins
+before the AI decision), so the order never depends on when an entry was
+scheduled and a queue rebuilt from a save state pops in the same order.
+
+Time units are the caller's: the World keys entity cooldowns by tick and
+its own timers by simulation milliseconds.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Generic, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TimerQueue(Generic[T]):
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, int, T]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._seq = 0
+
+    def schedule(self, due: float, item: T, rank: int = 0) -> None:
+        """Fire `item` once the clock reaches `due`."""
+        heapq.heappush(self._heap, (due, rank, self._seq, item))
+        self._seq += 1
+
+    def next_due(self) -> float:
+        """Due time of the earliest entry (inf when empty)."""
+        return self._heap[0][0] if self._heap else float("inf")
+
+    def pop_due(self, now: float) -> Iterator[Tuple[float, T]]:
+        """
+        Remove and yield (due, item) for every entry due at or before `now`.
+
+        Entries scheduled while iterating are picked up too if they are
+        already due, so a repeating timer can catch up after a long step.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due, _, _, item = heapq.heappop(heap)
+            yield due, item
+
+    def entries(self) -> List[Tuple[float, T]]:
+        """Pending (due, item) pairs in firing order (for save states)."""
+        return [(due, item) for due, _, _, item in sorted(self._heap)]
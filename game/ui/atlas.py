@@ -0,0 +1,196 @@
+# game/ui/atlas.py
+"""
+Baked sprite atlas for all unit sprites.
+
+Every unit sprite variant (world sprite facing right, facing left, and the
+card-bar icon) is painted once from `PIXEL_GRIDS` into a single sheet:
+
+    assets/sprites/units_atlas.png   - the packed sheet
+    assets/sprites/units_atlas.json  - {source_hash, frames: {key: [x, y, w, h]}}
+
+`source_hash` covers the pixel grids, palettes, troop scales and icon size.
+When it no longer matches (grids edited, `troops.json` scale changed) the
+atlas is re-baked and, if the directory is writable, saved again. At
+runtime the sheet is loaded once per process, converted with
+`convert_alpha()` and shared by every World and Troop.
+
+Re-bake by hand with:
+    python -m game.ui.atlas
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+from game.data.catalog import Catalog, get_catalog
+from game.entities.troop import PIXEL_GRIDS, SPRITE_GRID_SIZE, UNIT_PALETTES, sprite_size
+
+ATLAS_DIR = Path(__file__).resolve().parents[2] / "assets" / "sprites"
+ATLAS_IMAGE = "units_atlas.png"
+ATLAS_INDEX = "units_atlas.json"
+
+ICON_SIZE = 40  # card bar icon edge length (see draw_card_bar)
+PADDING = 1  # transparent gap between frames to avoid filtering bleed
+ATLAS_VERSION = 1
+
+Rect = Tuple[int, int, int, int]
+
+
+def _source_hash(catalog: Catalog) -> str:
+    """Hash of everything that affects the baked pixels."""
+    source = {
+        "version": ATLAS_VERSION,
+        "icon_size": ICON_SIZE,
+        "grids": {str(k): v for k, v in sorted(PIXEL_GRIDS.items())},
+        "palettes": {
+            str(k): {str(c): list(rgb) for c, rgb in sorted(p.items())}
+            for k, p in sorted(UNIT_PALETTES.items())
+        },
+        "scales": {
+            str(idx): catalog.troops[idx].scale
+            for idx in sorted(PIXEL_GRIDS)
+            if idx in catalog.troops
+        },
+    }
+    blob = json.dumps(source, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+
+def frame_key(idx: int, variant: str) -> str:
+    return f"{idx}:{variant}"
+
+
+def _paint_unit(idx: int) -> pygame.Surface:
+    """Paint one 12x12 unit sprite from its pixel grid (bake time only)."""
+    surf = pygame.Surface((SPRITE_GRID_SIZE, SPRITE_GRID_SIZE), pygame.SRCALPHA)
+    palette = UNIT_PALETTES[idx]
+    for r, row in enumerate(PIXEL_GRIDS[idx]):
+        for c, val in enumerate(row):
+            if val > 0:
+                # Ensure fully opaque pixels
+                surf.set_at((c, r), (*palette[val], 255))
+    return surf
+
+
+def bake_atlas(catalog: Catalog) -> Tuple[pygame.Surface, Dict[str, Rect]]:
+    """
+    Render every variant and pack them left-to-right on one shelf.
+
+    Sprites are kept fully opaque and vibrant with distinct character
+    colours; team identity is drawn separately (base circles in Troop.draw).
+    """
+    frames: Dict[str, pygame.Surface] = {}
+    for idx in sorted(PIXEL_GRIDS):
+        if idx not in catalog.troops:
+            continue
+        base = _paint_unit(idx)
+        size = sprite_size(catalog.troops[idx].scale)
+        right = pygame.transform.scale(base, (size, size))
+        frames[frame_key(idx, "right")] = right
+        frames[frame_key(idx, "left")] = pygame.transform.flip(right, True, False)
+        frames[frame_key(idx, "icon")] = pygame.transform.scale(right, (ICON_SIZE, ICON_SIZE))
+
+    width = sum(s.get_width() + PADDING for s in frames.values()) or 1
+    height = max((s.get_height() for s in frames.values()), default=1)
+
+    sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    index: Dict[str, Rect] = {}
+    x = 0
+    for key, surf in frames.items():
+        sheet.blit(surf, (x, 0))
+        index[key] = (x, 0, surf.get_width(), surf.get_height())
+        x += surf.get_width() + PADDING
+    return sheet, index
+
+
+def _read_cached(expected_hash: str) -> Optional[Tuple[pygame.Surface, Dict[str, Rect]]]:
+    try:
+        with open(ATLAS_DIR / ATLAS_INDEX, "r") as f:
+            meta = json.load(f)
+        if meta.get("source_hash") != expected_hash:
+            return None
+        sheet = pygame.image.load(str(ATLAS_DIR / ATLAS_IMAGE))
+    except (OSError, ValueError, pygame.error):
+        return None
+    index = {key: tuple(rect) for key, rect in meta["frames"].items()}
+    return sheet, index  # type: ignore[return-value]
+
+
+def _write_cache(sheet: pygame.Surface, index: Dict[str, Rect], source_hash: str) -> None:
+    try:
+        ATLAS_DIR.mkdir(parents=True, exist_ok=True)
+        pygame.image.save(sheet, str(ATLAS_DIR / ATLAS_IMAGE))
+        frames = ",\n".join(
+            f"    {json.dumps(key)}: {json.dumps(list(rect))}" for key, rect in sorted(index.items())
+        )
+        with open(ATLAS_DIR / ATLAS_INDEX, "w") as f:
+            f.write(f'{{\n  "source_hash": {json.dumps(source_hash)},\n  "frames": {{\n{frames}\n  }}\n}}\n')
+    except (OSError, pygame.error):
+        # Read-only install: keep using the in-memory bake.
+        pass
+
+
+class SpriteAtlas:
+    """One loaded sheet plus subsurface views for every frame."""
+
+    def __init__(self, sheet: pygame.Surface, index: Dict[str, Rect], source_hash: str) -> None:
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        self.sheet = sheet
+        self.source_hash = source_hash
+        self._frames: Dict[str, pygame.Surface] = {
+            key: sheet.subsurface(pygame.Rect(rect)) for key, rect in index.items()
+        }
+
+    def unit(self, idx: int, facing_right: bool = True) -> Optional[pygame.Surface]:
+        return self._frames.get(frame_key(idx, "right" if facing_right else "left"))
+
+    def icon(self, idx: int) -> Optional[pygame.Surface]:
+        return self._frames.get(frame_key(idx, "icon"))
+
+
+_atlas: Optional[SpriteAtlas] = None
+
+
+def get_atlas() -> SpriteAtlas:
+    """
+    Return the shared atlas, loading (or re-baking) it when needed.
+
+    Requires pygame.init(); call after the display mode is set so the sheet
+    can be converted to the display's pixel format.
+    """
+    global _atlas
+
+    catalog = get_catalog()
+    source_hash = catalog.derive(_source_hash)
+    if _atlas is not None and _atlas.source_hash == source_hash:
+        return _atlas
+
+    cached = _read_cached(source_hash)
+    if cached is None:
+        sheet, index = bake_atlas(catalog)
+        _write_cache(sheet, index, source_hash)
+    else:
+        sheet, index = cached
+
+    _atlas = SpriteAtlas(sheet, index, source_hash)
+    return _atlas
+
+
+def main() -> None:
+    pygame.init()
+    catalog = get_catalog()
+    source_hash = _source_hash(catalog)
+    sheet, index = bake_atlas(catalog)
+    _write_cache(sheet, index, source_hash)
+    print(f"Baked {len(index)} frames into {ATLAS_DIR / ATLAS_IMAGE} ({sheet.get_width()}x{sheet.get_height()})")
+
+
+if __name__ == "__main__":
+    main()
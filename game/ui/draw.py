@@ -1,8 +1,12 @@
+from typing import Dict, Tuple
+
 import pygame
 
+from game.core.arena import arena_layout
 from game.core.world import WorldRenderInfo
-from game.core.world import World
-from game.entities.troop import SPRITE_ASSETS, UNIT_STATS
+from game.core.world import World, COINS_MAX
+from game.ui.atlas import ICON_SIZE, get_atlas
+from game.data.catalog import get_catalog
 
 
 # Colors copied from smash2.py for visual parity
@@ -13,6 +17,14 @@ WHITE = (255, 255, 255)
 PURPLE = (148, 0, 211)
 GOLD = (255, 215, 0)
 
+# Card bar order used by the game loop and the offline renderer.
+DEFAULT_CARD_ORDER = ["mario", "bowser", "dry_bones", "red_shell"]
+
+
+# Static arena backgrounds keyed by (width, height, play_height). The
+# checkerboard alone is ~900 rect fills, so it is painted once and blitted.
+_ARENA_CACHE: Dict[Tuple[int, int, int], pygame.Surface] = {}
+
 
 def draw_arena_with_bridges(
     screen: pygame.Surface,
@@ -27,6 +39,21 @@ def draw_arena_with_bridges(
     - Blue river strip across the middle with darker outline
     - Two wooden bridges at the sides with darker outline
     """
+    key = (width, height, play_height)
+    background = _ARENA_CACHE.get(key)
+    if background is None:
+        background = pygame.Surface((width, height))
+        _paint_arena(background, width, height, play_height)
+        _ARENA_CACHE[key] = background
+    screen.blit(background, (0, 0))
+
+
+def _paint_arena(
+    screen: pygame.Surface,
+    width: int,
+    height: int,
+    play_height: int,
+) -> None:
     screen.fill(BLACK)
 
     # Battlefield ground with subtle color variation (checkerboard pattern)
@@ -39,31 +66,27 @@ def draw_arena_with_bridges(
             color = grass_light if ((x // tile_size) + (y // tile_size)) % 2 == 0 else grass_dark
             pygame.draw.rect(screen, color, (x, y, tile_size, tile_size))
 
+    # River and bridges come from the same layout troops navigate on
+    # (game/core/arena.py)
+    layout = arena_layout(width, play_height)
+
     # River strip through the middle of the play area
-    river_y = play_height // 2 - 20
+    river_x, river_y, river_w, river_h = layout.river
     river_color = (30, 30, 150)
     river_outline = (15, 15, 100)
     
     # River outline (darker border)
-    pygame.draw.rect(screen, river_outline, (0, river_y - 1, width, 42))
+    pygame.draw.rect(screen, river_outline, (river_x, river_y - 1, river_w, river_h + 2))
     # River fill
-    pygame.draw.rect(screen, river_color, (0, river_y, width, 40))
+    pygame.draw.rect(screen, river_color, layout.river)
 
     # Wooden bridges (left and right), matching smash2 approximate positions
-    bridge_w, bridge_h = 40, 50
-    left_bridge_x = 60
-    right_bridge_x = width - 100
-    bridge_y = river_y - 5
     bridge_color = (120, 80, 40)
     bridge_outline = (80, 50, 20)
     
-    # Left bridge outline
-    pygame.draw.rect(screen, bridge_outline, (left_bridge_x - 1, bridge_y - 1, bridge_w + 2, bridge_h + 2))
-    pygame.draw.rect(screen, bridge_color, (left_bridge_x, bridge_y, bridge_w, bridge_h))
-    
-    # Right bridge outline
-    pygame.draw.rect(screen, bridge_outline, (right_bridge_x - 1, bridge_y - 1, bridge_w + 2, bridge_h + 2))
-    pygame.draw.rect(screen, bridge_color, (right_bridge_x, bridge_y, bridge_w, bridge_h))
+    for bridge_x, bridge_y, bridge_w, bridge_h in layout.bridges:
+        pygame.draw.rect(screen, bridge_outline, (bridge_x - 1, bridge_y - 1, bridge_w + 2, bridge_h + 2))
+        pygame.draw.rect(screen, bridge_color, (bridge_x, bridge_y, bridge_w, bridge_h))
 
 
 def draw_entities(
@@ -83,6 +106,46 @@ def draw_entities(
     for troop in world.troops:
         troop.draw(screen)
 
+    if world.projectiles is not None:
+        draw_projectiles(screen, world.projectiles)
+
+
+# Projectile sprites per team, centred on the shot position by PROJECTILE_OFFSET.
+PROJECTILE_SIZE = 8
+PROJECTILE_OFFSET = PROJECTILE_SIZE // 2
+_PROJECTILE_SPRITES: Dict[int, pygame.Surface] = {}
+
+
+def _projectile_sprite(team: int) -> pygame.Surface:
+    sprite = _PROJECTILE_SPRITES.get(team)
+    if sprite is None:
+        sprite = pygame.Surface((PROJECTILE_SIZE, PROJECTILE_SIZE), pygame.SRCALPHA)
+        core = (150, 210, 255) if team == 0 else (255, 170, 120)
+        center = (PROJECTILE_OFFSET, PROJECTILE_OFFSET)
+        pygame.draw.circle(sprite, BLACK, center, PROJECTILE_OFFSET)
+        pygame.draw.circle(sprite, core, center, PROJECTILE_OFFSET - 1)
+        pygame.draw.circle(sprite, WHITE, center, 1)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        _PROJECTILE_SPRITES[team] = sprite
+    return sprite
+
+
+def draw_projectiles(screen: pygame.Surface, projectiles) -> None:
+    """
+    Draw every shot in flight with a single `Surface.blits` call.
+
+    Positions come straight from the pool's arrays, so the cost is one
+    list build plus one C-level blit loop, however many shots are live.
+    """
+    if not projectiles.count:
+        return
+    sprites = (_projectile_sprite(0), _projectile_sprite(1))
+    xs = (projectiles.view("x") - PROJECTILE_OFFSET).astype(int).tolist()
+    ys = (projectiles.view("y") - PROJECTILE_OFFSET).astype(int).tolist()
+    teams = projectiles.view("team").tolist()
+    screen.blits([(sprites[t], (x, y)) for t, x, y in zip(teams, xs, ys)], doreturn=False)
+
 
 def draw_card_bar(
     screen: pygame.Surface,
@@ -101,11 +164,12 @@ def draw_card_bar(
     - Four card slots
     - Selected outline
     - Cost numbers and names
-    - Troop head sprites drawn from SPRITE_ASSETS
+    - Troop head sprites drawn from the sprite atlas
     """
     pygame.draw.rect(screen, (50, 30, 10), (0, play_height, screen_width, ui_height))
 
     card_w = screen_width // len(card_order)
+    atlas = get_atlas()
 
     for i, card_id in enumerate(card_order):
         x_pos = i * card_w
@@ -141,17 +205,16 @@ def draw_card_bar(
         cost_txt = font_large.render(str(cost), True, GOLD)
         screen.blit(cost_txt, (x_pos + 10, play_height + 10))
 
-        # Sprite icon (Mario/DK/Peach/Yoshi, tinted as player)
-        sprite = SPRITE_ASSETS.get("player", {}).get(stats_idx)
-        if sprite is not None:
-            ui_sprite = pygame.transform.scale(sprite, (40, 40))
-            screen.blit(ui_sprite, (x_pos + card_w // 2 - 20, play_height + 15))
+        # Sprite icon (Mario/DK/Peach/Yoshi), pre-scaled in the sprite atlas
+        ui_sprite = atlas.icon(stats_idx)
+        if ui_sprite is not None:
+            screen.blit(ui_sprite, (x_pos + card_w // 2 - ICON_SIZE // 2, play_height + 15))
 
-        # Name label (prefer UNIT_STATS name if available)
+        # Name label (prefer the troop's catalog name if available)
         unit_name = card_id.replace("_", " ").title()
-        stats = UNIT_STATS.get(stats_idx)
-        if stats is not None and "name" in stats:
-            unit_name = str(stats["name"])
+        stats = get_catalog().troops.get(stats_idx)
+        if stats is not None:
+            unit_name = stats.name
 
         name_txt = font_ui.render(unit_name, True, WHITE)
         screen.blit(
@@ -226,3 +289,53 @@ def draw_game_over_banner(
     screen.blit(win_msg, rect)
 
 
+def draw_frame(
+    screen: pygame.Surface,
+    world: World,
+    card_order,
+    selected_index: int,
+    screen_width: int,
+    screen_height: int,
+    ui_height: int,
+    font_large: pygame.font.Font,
+    font_ui: pygame.font.Font,
+    team: str = "player",
+) -> None:
+    """
+    Draw one complete frame (arena, entities and HUD) onto `screen`.
+
+    Shared by the interactive loop in main.py and the offline renderer so
+    recorded footage looks exactly like a live match. The coins bar shows
+    `team`'s coins (the lockstep guest plays "ai").
+    """
+    play_height = screen_height - ui_height
+    render_info = world.get_render_info(screen_height)
+
+    draw_arena_with_bridges(screen, screen_width, screen_height, play_height)
+    draw_entities(screen, world, render_info)
+    draw_card_bar(
+        screen,
+        world,
+        card_order,
+        selected_index,
+        screen_width,
+        ui_height,
+        play_height,
+        font_large,
+        font_ui,
+    )
+    draw_coins_bar(
+        screen,
+        world.ai_coins if team == "ai" else world.player_coins,
+        COINS_MAX,
+        play_height,
+        font_large,
+    )
+    draw_game_over_banner(
+        screen,
+        world.game_over,
+        world.winner,
+        screen_width,
+        screen_height,
+        font_large,
+    )
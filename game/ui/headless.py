@@ -0,0 +1,316 @@
+# game/ui/headless.py
+"""
+Offline match renderer.
+
+Replays a match against an off-screen surface using the SDL "dummy" video
+driver, so no window or display server is needed, and writes the frames
+either as a PNG sequence or as one raw RGB24 stream per match (the raw
+stream can be piped straight into ffmpeg:
+`ffmpeg -f rawvideo -pix_fmt rgb24 -s 450x750 -r 30 -i match.rgb match.mp4`).
+
+Matches are either AI-vs-AI / scripted runs or recorded replays (see
+game/core/replay.py). They run as fast as the CPU allows (fixed 60 Hz
+timestep, no frame clock) and can be fanned out over worker processes:
+
+    python -m game.ui.headless --out footage --matches 16 --workers 8
+    python -m game.ui.headless --out footage --replays match.replay
+"""
+
+from __future__ import annotations
+
+import os
+
+# Must be set before pygame initialises its video subsystem.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pygame
+
+from game.core.actions import PlayCardAction
+from game.core.replay import Replay, ReplayPlayer
+from game.core.scenarios import play_bottom_side
+from game.core.world import FIXED_DT, TICK_RATE, World
+from game.ui.draw import DEFAULT_CARD_ORDER, draw_frame
+
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 450, 750  # same window as main.py
+UI_HEIGHT = 100
+
+FRAME_FORMATS = ("png", "rgb")
+
+
+@dataclass
+class MatchSpec:
+    """
+    Everything needed to re-run a match offline.
+
+    - `player_actions` are scripted (tick, card_id, lane_index) plays for
+      the bottom side; they are applied just before that tick is simulated.
+    - With `autopilot` the bottom side is driven by the same heuristic
+      policy as the built-in AI, which gives AI-vs-AI footage. `seed`
+      staggers its once-a-second decisions (tick `seed % TICK_RATE` of
+      each second), so different seeds play out differently.
+    - With `replay` set, the recorded match at that path is re-simulated
+      instead and the other fields (except `max_ticks`) are ignored.
+    """
+
+    name: str
+    max_ticks: int = 180 * TICK_RATE
+    player_actions: List[Tuple[int, str, int]] = field(default_factory=list)
+    autopilot: bool = True
+    seed: int = 0
+    replay: Optional[str] = None
+
+
+@dataclass
+class RenderResult:
+    name: str
+    ticks: int
+    frames: int
+    seconds: float
+    winner: Optional[str]
+
+
+class PngSequenceWriter:
+    """Writes frame_000000.png, frame_000001.png, ... into a directory."""
+
+    def __init__(self, out_dir: Path, name: str) -> None:
+        self.directory = out_dir / name
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.frames = 0
+
+    def write(self, surface: pygame.Surface) -> None:
+        pygame.image.save(surface, str(self.directory / f"frame_{self.frames:06d}.png"))
+        self.frames += 1
+
+    def close(self) -> None:
+        pass
+
+
+class RawRgbWriter:
+    """Appends tightly packed RGB24 frames to `<name>.rgb`."""
+
+    def __init__(self, out_dir: Path, name: str) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.path = out_dir / f"{name}.rgb"
+        self._file = open(self.path, "wb")
+        self.frames = 0
+
+    def write(self, surface: pygame.Surface) -> None:
+        self._file.write(pygame.image.tobytes(surface, "RGB"))
+        self.frames += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _make_writer(fmt: str, out_dir: Path, name: str):
+    if fmt == "png":
+        return PngSequenceWriter(out_dir, name)
+    if fmt == "rgb":
+        return RawRgbWriter(out_dir, name)
+    raise ValueError(f"Unknown frame format {fmt!r}; expected one of {FRAME_FORMATS}.")
+
+
+_FONTS: Dict[str, pygame.font.Font] = {}
+
+
+def _init_headless() -> Tuple[pygame.font.Font, pygame.font.Font]:
+    """Initialise pygame once per process and return (font_large, font_ui)."""
+    if not pygame.get_init():
+        pygame.init()
+    if pygame.display.get_surface() is None:
+        # A tiny dummy display so surface conversions keep working.
+        pygame.display.set_mode((1, 1))
+    if not _FONTS:
+        # Same families/sizes as main.py so footage matches the live game.
+        _FONTS["large"] = pygame.font.SysFont("Arial bold", 24)
+        _FONTS["ui"] = pygame.font.Font(None, 20)
+    return _FONTS["large"], _FONTS["ui"]
+
+
+def _simulate_spec(spec: MatchSpec) -> Iterator[World]:
+    """Run a scripted / autopilot match, yielding the World after every tick."""
+    world = World(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    scripted: Dict[int, List[PlayCardAction]] = {}
+    for tick, card_id, lane_index in spec.player_actions:
+        scripted.setdefault(int(tick), []).append(PlayCardAction(card_id, int(lane_index)))
+
+    ticks = 0
+    while ticks < spec.max_ticks and not world.game_over:
+        for action in scripted.get(ticks, ()):
+            world.apply_player_action(action)
+        if spec.autopilot:
+            play_bottom_side(world, spec.seed)
+
+        world.step(FIXED_DT)
+        ticks += 1
+        yield world
+
+
+def _simulate_replay(spec: MatchSpec) -> Iterator[World]:
+    """Re-simulate a recorded replay (verifying keyframes) tick by tick."""
+    player = ReplayPlayer(Replay.load(spec.replay))
+    ticks = 0
+    while ticks < spec.max_ticks and not player.finished:
+        player.step()
+        ticks += 1
+        yield player.world
+
+
+def render_match(
+    spec: MatchSpec,
+    out_dir: Path,
+    fmt: str = "png",
+    frame_every: int = 2,
+) -> RenderResult:
+    """
+    Simulate `spec` at full speed and write every `frame_every`-th tick.
+
+    The default of 2 gives 30 FPS footage from the 60 Hz simulation. The
+    final tick (game over banner) is always written.
+    """
+    if frame_every < 1:
+        raise ValueError(f"frame_every must be at least 1, got {frame_every}.")
+    font_large, font_ui = _init_headless()
+    writer = _make_writer(fmt, Path(out_dir), spec.name)
+    card_order = list(DEFAULT_CARD_ORDER)
+    frames = _simulate_replay(spec) if spec.replay else _simulate_spec(spec)
+
+    surface: Optional[pygame.Surface] = None
+    world: Optional[World] = None
+    start = time.perf_counter()
+    ticks = 0
+    try:
+        for world in frames:
+            ticks += 1
+            if ticks % frame_every != 0 and not world.game_over:
+                continue
+
+            if surface is None:
+                surface = pygame.Surface((world.screen_width, world.screen_height))
+            draw_frame(
+                surface,
+                world,
+                card_order,
+                0,
+                world.screen_width,
+                world.screen_height,
+                UI_HEIGHT,
+                font_large,
+                font_ui,
+            )
+            writer.write(surface)
+    finally:
+        writer.close()
+
+    return RenderResult(
+        name=spec.name,
+        ticks=ticks,
+        frames=writer.frames,
+        seconds=time.perf_counter() - start,
+        winner=world.winner if world is not None else None,
+    )
+
+
+def _render_job(job: Tuple[MatchSpec, str, str, int]) -> RenderResult:
+    spec, out_dir, fmt, frame_every = job
+    return render_match(spec, Path(out_dir), fmt=fmt, frame_every=frame_every)
+
+
+def render_matches(
+    specs: Iterable[MatchSpec],
+    out_dir: Path,
+    fmt: str = "png",
+    frame_every: int = 2,
+    workers: Optional[int] = None,
+) -> List[RenderResult]:
+    """
+    Render many matches, one match per task, across worker processes.
+
+    `workers=1` renders in-process, which is handy for debugging.
+    """
+    jobs = [(spec, str(out_dir), fmt, frame_every) for spec in specs]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(jobs) <= 1:
+        return [_render_job(job) for job in jobs]
+
+    with multiprocessing.Pool(processes=min(workers, len(jobs))) as pool:
+        return list(pool.imap_unordered(_render_job, jobs))
+
+
+def _load_specs(path: Path) -> List[MatchSpec]:
+    """Load match specs from a JSON list of MatchSpec-shaped objects."""
+    with open(path, "r") as f:
+        raw = json.load(f)
+    return [
+        MatchSpec(
+            name=str(entry["name"]),
+            max_ticks=int(entry.get("max_ticks", 180 * TICK_RATE)),
+            player_actions=[tuple(a) for a in entry.get("player_actions", [])],
+            autopilot=bool(entry.get("autopilot", True)),
+            seed=int(entry.get("seed", 0)),
+            replay=entry.get("replay"),
+        )
+        for entry in raw
+    ]
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render matches to frames without a display.")
+    parser.add_argument("--out", type=Path, default=Path("footage"))
+    parser.add_argument("--specs", type=Path, help="JSON list of match specs")
+    parser.add_argument("--replays", type=Path, nargs="+", help="replay files to render")
+    parser.add_argument("--matches", type=int, default=1, help="AI-vs-AI matches when no --specs")
+    parser.add_argument("--format", choices=FRAME_FORMATS, default="png")
+    parser.add_argument("--frame-every", type=_positive_int, default=2)
+    parser.add_argument("--max-seconds", type=float, default=180.0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.replays:
+        specs = [
+            MatchSpec(name=path.stem, max_ticks=int(args.max_seconds * TICK_RATE), replay=str(path))
+            for path in args.replays
+        ]
+    elif args.specs is not None:
+        specs = _load_specs(args.specs)
+    else:
+        max_ticks = int(args.max_seconds * TICK_RATE)
+        specs = [
+            MatchSpec(name=f"match_{i:04d}", max_ticks=max_ticks, seed=i)
+            for i in range(args.matches)
+        ]
+
+    start = time.perf_counter()
+    results = render_matches(specs, args.out, args.format, args.frame_every, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for r in sorted(results, key=lambda r: r.name):
+        realtime = (r.ticks / TICK_RATE) / r.seconds if r.seconds > 0 else float("inf")
+        print(
+            f"{r.name}: {r.ticks} ticks, {r.frames} frames, "
+            f"{r.seconds:.2f}s ({realtime:.1f}x real time), winner={r.winner}"
+        )
+    print(f"{len(results)} matches in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
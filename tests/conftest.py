@@ -0,0 +1,21 @@
+# tests/conftest.py
+
+import pytest
+
+from game.core.actions import PlayCardAction
+from game.core.world import FIXED_DT, World
+
+
+@pytest.fixture
+def mid_match():
+    """Factory for a small match: Mario and Dry Bones played, then `ticks` steps."""
+
+    def make(fixed_point=False, ticks=240):
+        world = World(450, 750, fixed_point=fixed_point)
+        world.apply_player_action(PlayCardAction("mario", 1))
+        world.apply_player_action(PlayCardAction("dry_bones", 0))
+        for _ in range(ticks):
+            world.step(FIXED_DT)
+        return world
+
+    return make
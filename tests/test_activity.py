@@ -0,0 +1,53 @@
+# tests/test_activity.py
+
+from game.core.world import FIXED_DT, World
+from game.entities.troop import Troop
+
+MARIO, PEACH = 0, 2
+
+
+def _duel():
+    """A player Mario locked onto a sturdy Peach, with a second Peach nearby."""
+    world = World(450, 750)
+    world.ai_policy = None
+    lane = world.get_lane(1)
+    x = lane.x + lane.width / 2
+    mario = Troop(x, 420.0, "player", 1, MARIO, uid=world._new_uid())
+    target = Troop(x, 395.0, "ai", 1, PEACH, uid=world._new_uid())
+    other = Troop(x + 30, 380.0, "ai", 1, PEACH, uid=world._new_uid())
+    target.hp = other.hp = 1e6
+    world.player_troops.append(mario)
+    world.ai_troops += [target, other]
+    return world, mario, target, other
+
+
+def test_sleeping_troop_wakes_when_its_cooldown_fires():
+    world, mario, target, _ = _duel()
+    world.step(FIXED_DT)
+    assert mario.asleep and mario.current_target is target
+    for _ in range(3):
+        ready, hp = mario.ready_tick, target.hp
+        while world._tick < ready - 1:
+            world.step(FIXED_DT)
+            assert mario.asleep and target.hp == hp
+        world.step(FIXED_DT)
+        assert target.hp == hp - mario.damage
+        assert mario.ready_tick > ready
+
+
+def test_sleeping_troop_wakes_when_its_target_dies():
+    world, mario, target, other = _duel()
+    world.step(FIXED_DT)
+    assert mario.asleep
+
+    # Another player troop finishes the target off while Mario sleeps.
+    target.hp = 1.0
+    finisher = Troop(target.x - 20, target.y + 5, "player", 1, MARIO, uid=world._new_uid())
+    world.player_troops.append(finisher)
+    world.step(FIXED_DT)
+    assert target.dead and all(t is not target for t in world.ai_troops)
+    assert not mario.asleep and mario.cooling
+
+    world.step(FIXED_DT)
+    assert mario.current_target is other
+
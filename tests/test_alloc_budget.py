@@ -0,0 +1,56 @@
+# tests/test_alloc_budget.py
+
+from game.core.scenarios import Scenario, build_world
+from game.core.world import FIXED_DT
+from game.profile import AllocationTracker
+
+WARMUP_TICKS = 240  # lazily built caches (flow fields, projectile arrays) fill up
+MEASURED_TICKS = 120
+
+# Steady-state budgets, with headroom over what a tick uses today
+NET_BYTES_PER_TICK = 1024  # memory still held after the tick, on average
+PEAK_BYTES_BASE = 6 * 1024  # temporaries during a tick, on average ...
+PEAK_BYTES_PER_TROOP = 400  # ... growing with the troops on the board
+MAX_COLLECTIONS = 2  # gen-0 garbage collections over the whole window
+
+
+def _measure(world):
+    for _ in range(WARMUP_TICKS):
+        world.step(FIXED_DT)
+    assert world.projectiles.fired  # numpy and the shot arrays are loaded
+    troops = []
+    with AllocationTracker(by_site=False) as tracker:
+        for _ in range(MEASURED_TICKS):
+            troops.append(len(world.troops))
+            tracker.step(world)
+    assert not world.game_over
+    return tracker.ticks, sum(troops) / len(troops)
+
+
+def _assert_within_budget(ticks, mean_troops):
+    net = sum(t.net_bytes for t in ticks) / len(ticks)
+    peak = sum(t.peak_bytes for t in ticks) / len(ticks)
+    assert net <= NET_BYTES_PER_TICK
+    assert peak <= PEAK_BYTES_BASE + PEAK_BYTES_PER_TROOP * mean_troops
+    assert sum(t.collections for t in ticks) <= MAX_COLLECTIONS
+
+
+def test_match_ticks_stay_within_budget(mid_match):
+    _assert_within_budget(*_measure(mid_match(ticks=0)))
+
+
+def test_battle_ticks_stay_within_budget():
+    world = build_world(Scenario(units=100, layout="spread", seed=1))
+    ticks, mean_troops = _measure(world)
+    assert mean_troops > 30
+    _assert_within_budget(ticks, mean_troops)
+
+
+def test_tracker_finds_what_a_tick_keeps():
+    kept = []
+    with AllocationTracker() as tracker:
+        tick = tracker.measure(lambda: kept.append(bytearray(50_000)))
+    assert tick.net_bytes >= 50_000
+    assert tick.peak_bytes >= 50_000
+    (filename, _), size = tracker.sites.most_common(1)[0]
+    assert filename == __file__ and size >= 50_000
@@ -0,0 +1,21 @@
+# tests/test_aoe.py
+
+import pytest
+
+from game.data.catalog import SplashDef
+from game.entities.troop import Troop
+from game.systems.aoe import apply_splash
+
+BOWSER, MARIO = 1, 0
+
+
+@pytest.mark.parametrize("trigger", ["troop", "any"])
+def test_splash_spares_the_main_target(trigger):
+    source = Troop(100, 160, "player", 1, BOWSER)
+    target = Troop(100, 100, "ai", 1, MARIO)
+    neighbour = Troop(120, 100, "ai", 1, MARIO)
+    splash = SplashDef(radius=45, damage_ratio=0.4, trigger=trigger)
+
+    assert apply_splash(source, splash, target, [target, neighbour]) == 1
+    assert target.hp == target.max_hp
+    assert neighbour.hp == pytest.approx(neighbour.max_hp - 0.4 * source.damage)
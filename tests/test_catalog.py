@@ -0,0 +1,151 @@
+# tests/test_catalog.py
+
+import json
+import os
+import warnings
+
+import pytest
+
+from game.ai.policy import get_ai_card_pool
+from game.ai.policy_baseline import get_card_costs
+from game.data import catalog as catalog_mod
+from game.data.catalog import CARDS_FILE, TROOPS_FILE, CatalogError, parse_catalog
+from game.data.loader import DATA_DIR
+
+
+def _data():
+    cards = json.loads((DATA_DIR / CARDS_FILE).read_bytes())
+    troops = json.loads((DATA_DIR / TROOPS_FILE).read_bytes())
+    return cards, troops
+
+
+def _parse(cards, troops):
+    return parse_catalog(json.dumps(cards).encode(), json.dumps(troops).encode())
+
+
+def test_shipped_data_parses():
+    catalog = _parse(*_data())
+    assert catalog.troop_for_card("mario").key == "mario"
+
+
+def test_rejects_splash_on_projectile_troops():
+    cards, troops = _data()
+    peach = next(t for t in troops if t.get("projectile_speed"))
+    peach["splash"] = {"radius": 30, "damage_ratio": 0.5}
+    with pytest.raises(CatalogError, match="projectile_speed"):
+        _parse(cards, troops)
+
+
+@pytest.mark.parametrize("edit, message", [
+    (lambda cards, troops: troops[0].pop("hp"), "missing required field 'hp'"),
+    (lambda cards, troops: troops[0].update(speed="fast"), "'speed' must be a number"),
+    (lambda cards, troops: troops[0].update(target="air"), "'target' must be one of"),
+    (lambda cards, troops: troops.append(dict(troops[0])), "duplicate troop id"),
+    (lambda cards, troops: troops[0].update(attack_interval=0), "'attack_interval' must be positive"),
+    (lambda cards, troops: troops[0].update(attack_interval="slow"), "'attack_interval' must be a number"),
+    (lambda cards, troops: troops[0].update(scale="big"), "'scale' must be a number"),
+    (lambda cards, troops: troops[0].update(scale=0), "'scale' must be positive"),
+    (lambda cards, troops: troops[0].update(projectile_speed=[7]), "'projectile_speed' must be a number"),
+    (lambda cards, troops: troops[0].update(projectile_speed=-1), "'projectile_speed' must be >= 0"),
+    (lambda cards, troops: troops[0].update(homing="no"), "'homing' must be true/false"),
+    (lambda cards, troops: troops[0].update(splash={"radius": 0, "damage_ratio": 1}), "'radius' must be positive"),
+    (lambda cards, troops: troops[0].update(splash={"radius": 30, "damage_ratio": 1, "falloff": "x"}),
+     "'falloff' must be a number"),
+    (lambda cards, troops: troops[0].update(splash={"radius": 30, "damage_ratio": 1, "falloff": 2}),
+     "'falloff' must be between 0 and 1"),
+    (lambda cards, troops: cards[0].update(troop_id=99), "unknown troop 99"),
+    (lambda cards, troops: cards[0].update(coins_cost=0), "'coins_cost' must be positive"),
+    (lambda cards, troops: cards.append(dict(cards[0])), "duplicate card id"),
+])
+def test_rejects_invalid_data(edit, message):
+    cards, troops = _data()
+    edit(cards, troops)
+    with pytest.raises(CatalogError, match=message):
+        _parse(cards, troops)
+
+
+def test_optional_fields_keep_their_defaults():
+    cards, troops = _data()
+    for field in ("projectile_speed", "homing", "scale", "attack_interval"):
+        troops[0].pop(field, None)
+    troop = _parse(cards, troops).troops[troops[0]["id"]]
+    assert (troop.projectile_speed, troop.homing, troop.scale) == (0.0, True, 2.5)
+    assert troop.attack_interval == 1.0
+
+
+def test_rejects_invalid_json():
+    cards, troops = _data()
+    with pytest.raises(CatalogError, match="invalid JSON"):
+        parse_catalog(b"[{", json.dumps(troops).encode())
+
+
+def test_derived_lookups_are_read_only():
+    with pytest.raises(TypeError):
+        get_ai_card_pool()["mario"] = None
+    with pytest.raises(TypeError):
+        get_card_costs()["mario"] = 0.0
+
+
+def _isolate(monkeypatch, tmp_path):
+    cards, troops = _data()
+    (tmp_path / CARDS_FILE).write_text(json.dumps(cards))
+    (tmp_path / TROOPS_FILE).write_text(json.dumps(troops))
+    monkeypatch.setattr(catalog_mod, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(catalog_mod, "_catalog", None)
+    monkeypatch.setattr(catalog_mod, "_mtimes", (0, 0))
+    monkeypatch.setattr(catalog_mod, "_next_check", 0.0)
+    return cards, troops
+
+
+def _rewrite(path, text):
+    # Bump the mtime explicitly; coarse filesystem clocks may not.
+    before = path.stat().st_mtime_ns
+    path.write_text(text)
+    os.utime(path, ns=(before + 10**9, before + 10**9))
+    catalog_mod._next_check = 0.0
+
+
+def test_hot_reload_picks_up_edits(monkeypatch, tmp_path):
+    cards, _ = _isolate(monkeypatch, tmp_path)
+    first = catalog_mod.get_catalog()
+    cards[0]["coins_cost"] = 9
+    _rewrite(tmp_path / CARDS_FILE, json.dumps(cards))
+    second = catalog_mod.get_catalog()
+    assert second is not first
+    assert second.cards[cards[0]["id"]].cost == 9.0
+
+
+def test_hot_reload_keeps_previous_data_on_a_bad_file(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    first = catalog_mod.get_catalog()
+    _rewrite(tmp_path / TROOPS_FILE, "[{")
+    with pytest.warns(UserWarning, match="Keeping previous game data"):
+        assert catalog_mod.get_catalog() is first
+    # The broken file is not re-parsed until it changes again.
+    catalog_mod._next_check = 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert catalog_mod.get_catalog() is first
+
+
+@pytest.mark.parametrize("field, value", [
+    ("scale", "big"),
+    ("projectile_speed", [7]),
+    ("homing", "no"),
+    ("attack_interval", "slow"),
+    ("splash", {"radius": 30, "damage_ratio": 1, "falloff": [0.5]}),
+])
+def test_hot_reload_keeps_previous_data_on_a_mistyped_field(monkeypatch, tmp_path, field, value):
+    _, troops = _isolate(monkeypatch, tmp_path)
+    first = catalog_mod.get_catalog()
+    troops[0][field] = value
+    _rewrite(tmp_path / TROOPS_FILE, json.dumps(troops))
+    with pytest.warns(UserWarning, match=field):
+        assert catalog_mod.get_catalog() is first
+
+
+def test_first_load_of_a_bad_file_raises(monkeypatch, tmp_path):
+    _isolate(monkeypatch, tmp_path)
+    (tmp_path / CARDS_FILE).write_text("{}")
+    with pytest.raises(CatalogError):
+        catalog_mod.get_catalog()
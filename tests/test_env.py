@@ -0,0 +1,30 @@
+# tests/test_env.py
+
+import numpy as np
+
+from game.env import NUM_ACTIONS, OBS_SIZE, VectorEnv
+
+
+def test_worker_arrays_outlive_close():
+    with VectorEnv(4, workers=2, seed=3) as env:
+        first = env.reset(seed=3).copy()
+        obs, reward, done, infos = env.step([0, 1, 0, NUM_ACTIONS - 1])
+        expected = obs.copy()
+    # The shared block is gone; what step() handed out must still read.
+    assert obs.shape == (4, OBS_SIZE) and len(infos) == 4
+    assert np.array_equal(obs, expected)
+    assert np.isfinite(obs.sum() + reward.sum()) and not done.any()
+    assert not np.array_equal(first, obs)
+
+
+def test_workers_match_in_process_stepping():
+    actions = [[0, 3, 0, 5], [1, 0, 2, 0], [0, 0, 0, 0]]
+    results = []
+    for workers in (0, 2):
+        with VectorEnv(4, workers=workers, seed=1) as env:
+            env.reset(seed=1)
+            for batch in actions:
+                obs, reward, _, _ = env.step(batch)
+            results.append((obs.copy(), reward.copy()))
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.array_equal(results[0][1], results[1][1])
@@ -0,0 +1,60 @@
+# tests/test_fixed_point.py
+
+import pytest
+
+from game.core.actions import PlayCardAction
+from game.core.replay import ReplayPlayer, ReplayRecorder
+from game.core.savestate import SaveStateError, dumps, loads, state_hash
+from game.core.scenarios import Scenario, build_world
+from game.core.world import FIXED_DT, World
+from game.systems import fixed
+
+
+def _on_grid(value):
+    return value * fixed.SCALE == int(value * fixed.SCALE)
+
+
+def test_battle_stays_on_the_grid():
+    world = build_world(Scenario(units=60, layout="clustered", seed=3, fixed_point=True))
+    for _ in range(180):
+        world.step(FIXED_DT)
+        for troop in world.troops:
+            assert _on_grid(troop.x) and _on_grid(troop.y) and _on_grid(troop.hp)
+    assert world.projectiles.fired
+    assert all(_on_grid(v) for row in world.projectiles.rows() for v in row[:2])
+
+
+def test_state_hash_is_pinned():
+    # Integer geometry rounds the same way everywhere, so this digest must
+    # not change between machines or Python builds, only with game rules.
+    world = build_world(Scenario(units=40, layout="clustered", seed=7, fixed_point=True))
+    for _ in range(300):
+        world.step(FIXED_DT)
+    assert state_hash(world).hex() == "f6d43f63ec90dfba8ee8d4b03d6b5a94"
+
+
+def test_roundtrip_continues_identically(mid_match):
+    world = mid_match(fixed_point=True)
+    copy = loads(dumps(world))
+    assert copy.fixed_point
+    for _ in range(600):
+        world.step(FIXED_DT)
+        copy.step(FIXED_DT)
+    assert dumps(copy) == dumps(world)
+
+
+def test_loads_rejects_other_number_mode(mid_match):
+    with pytest.raises(SaveStateError):
+        loads(dumps(mid_match(fixed_point=True, ticks=30)), World(450, 750))
+
+
+def test_replay_plays_back_in_fixed_point():
+    world = World(450, 750, fixed_point=True)
+    recorder = ReplayRecorder(world, keyframe_seconds=5.0)
+    for _ in range(600):
+        if world._tick == 30:
+            world.apply_player_action(PlayCardAction("bowser", 1))
+        world.step(FIXED_DT)
+    end = ReplayPlayer(recorder.finish()).play_to_end()
+    assert end.fixed_point
+    assert state_hash(end) == state_hash(world)
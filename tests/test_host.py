@@ -0,0 +1,89 @@
+# tests/test_host.py
+
+import asyncio
+
+import pytest
+
+from game.net import protocol
+from game.net.client import HostClient
+from game.net.host import MatchHost
+from game.net.protocol import ProtocolError
+
+
+def _payload(data):
+    return data[protocol._FRAME.size :]
+
+
+def test_messages_roundtrip():
+    assert protocol.decode_new_match(_payload(protocol.encode_new_match(7, False))) == (7, False)
+    play = _payload(protocol.encode_play(3, "ai", 2, "mario"))
+    assert protocol.decode_play(play) == (3, "ai", 2, "mario")
+    assert protocol.decode_match_id(_payload(protocol.encode_match_id(protocol.END_MATCH, 9))) == 9
+    assert protocol.decode_match_created(_payload(protocol.encode_match_created(7, 3))) == (7, 3)
+    status = _payload(protocol.encode_status(3, 120, 4.5, 10.0, 2))
+    assert protocol.decode_status(status) == (3, 120, 4, 10, 2)
+    assert protocol.decode_match_over(_payload(protocol.encode_match_over(3, 900, "ai"))) == (3, 900, "ai")
+
+
+@pytest.mark.parametrize(
+    "decode",
+    [
+        protocol.decode_new_match,
+        protocol.decode_play,
+        protocol.decode_match_id,
+        protocol.decode_match_created,
+        protocol.decode_status,
+        protocol.decode_match_over,
+    ],
+)
+def test_short_payloads_raise_protocol_error(decode):
+    with pytest.raises(ProtocolError):
+        decode(b"\x01\x02")
+
+
+async def _with_host(body, **host_kwargs):
+    host = MatchHost(**host_kwargs)
+    port = await host.start("127.0.0.1", 0)
+    try:
+        return await asyncio.wait_for(body(host, port), timeout=20)
+    finally:
+        await host.close()
+
+
+def test_bad_frame_gets_an_error_reply():
+    async def body(host, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(protocol.frame(protocol.NEW_MATCH, b"\x01"))
+        msg_type, payload = await protocol.read_frame(reader)
+        writer.close()
+        return msg_type, payload.decode("utf-8")
+
+    msg_type, message = asyncio.run(_with_host(body))
+    assert msg_type == protocol.ERROR and "NEW_MATCH" in message
+
+
+def test_match_over_the_socket():
+    async def body(host, port):
+        client = await HostClient.connect("127.0.0.1", port)
+        statuses = []
+        client.on_status = lambda *status: statuses.append(status)
+        match_id = await client.new_match(builtin_ai=False)
+        client.play(match_id, "player", 1, "mario")
+        client.play(match_id + 100, "player", 1, "mario")  # not ours
+        while len(statuses) < 3:
+            await asyncio.sleep(0.02)
+        running = await client.stats()
+        troops = [t.team for t in host._matches[match_id].world.troops]
+        client.end_match(match_id)
+        await asyncio.sleep(0.05)
+        ended = await client.stats()
+        await client.close()
+        return match_id, statuses, troops, running, ended, client.errors
+
+    match_id, statuses, troops, running, ended, errors = asyncio.run(_with_host(body, status_every=5))
+    assert [s[0] for s in statuses] == [match_id] * len(statuses)
+    ticks = [s[1] for s in statuses]
+    assert ticks == sorted(ticks) and ticks[0] % 5 == 0
+    assert troops == ["player"]  # the play was applied; the AI is off
+    assert running["matches"] == 1 and ended["matches"] == 0
+    assert errors == [f"no match {match_id + 100}"]
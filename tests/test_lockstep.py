@@ -0,0 +1,78 @@
+# tests/test_lockstep.py
+
+import pytest
+
+from game.core.actions import PlayCardAction
+from game.core.savestate import state_hash
+from game.core.world import World
+from game.net.lockstep import HELLO, DesyncError, LockstepError, LockstepSession, LoopbackTransport
+
+PLAYS = {
+    "player": {10: ("mario", 1), 200: ("dry_bones", 0), 400: ("bowser", 2)},
+    "ai": {50: ("red_shell", 1), 260: ("mario", 0)},
+}
+
+
+def _sessions(drop_every=0):
+    a, b = LoopbackTransport.pair(drop_every=drop_every)
+    host = LockstepSession(World(450, 750), a, team="player", input_delay=3)
+    guest = LockstepSession(World(450, 750), b, team="ai", input_delay=3)
+    return host, guest
+
+
+def _run(host, guest, ticks):
+    queued = {"player": set(), "ai": set()}
+    frames = 0
+    while min(host.tick, guest.tick) < ticks:
+        frames += 1
+        assert frames < ticks * 10, "lockstep stalled"
+        for session in (host, guest):
+            play = PLAYS[session.team].get(session.tick)
+            if play is not None and session.tick not in queued[session.team]:
+                queued[session.team].add(session.tick)
+                session.queue_local(PlayCardAction(*play))
+            session.poll()
+            session.step()
+
+
+@pytest.mark.parametrize("drop_every", [0, 3])
+def test_peers_stay_in_sync(drop_every):
+    host, guest = _sessions(drop_every)
+    _run(host, guest, 600)
+    while guest.tick < host.tick:
+        guest.poll()
+        guest.step()
+    while host.tick < guest.tick:
+        host.poll()
+        host.step()
+
+    assert state_hash(host.world) == state_hash(guest.world)
+    assert len(host.world.troops) + len(host.world.towers) > 2
+
+    # Only inputs cross the wire: ~10 bytes per tick plus a few per play.
+    assert host.transport.bytes_sent < 20 * host.tick
+
+
+def test_desync_is_detected():
+    host, guest = _sessions()
+    _run(host, guest, 30)
+    guest.world.player_coins -= 1  # simulate a divergent rule
+    with pytest.raises(DesyncError):
+        _run(host, guest, 200)
+
+
+@pytest.mark.parametrize("guest_delay", [3, 5])
+def test_hello_is_checked_when_the_first_packet_is_lost(guest_delay):
+    a, b = LoopbackTransport.pair()
+    host = LockstepSession(World(450, 750), a, team="player", input_delay=3)
+    guest = LockstepSession(World(450, 750), b, team="ai", input_delay=guest_delay)
+    host.poll()
+    assert b.inbox.popleft()[0] == HELLO  # lost in transit
+    guest.poll()  # gets whatever the host sent after its HELLO
+
+    if guest_delay != host.input_delay:
+        with pytest.raises(LockstepError):
+            _run(host, guest, 60)
+    else:
+        _run(host, guest, 60)
+        assert host._peer_hello and guest._peer_hello
@@ -0,0 +1,57 @@
+# tests/test_navigation.py
+
+import pytest
+
+from game.core.world import FIXED_DT, HUD_HEIGHT, World
+from game.systems.navigation import navigator_for
+
+MARIO, YOSHI = 0, 3
+
+
+def _march(world, team, ticks=900):
+    """Send a Mario down each lane and a Yoshi down the middle; track their paths."""
+    world.ai_policy = None
+    for lane in range(3):
+        world._spawn_troop(lane, team, MARIO)
+    world._spawn_troop(1, team, YOSHI)
+    troops = list(world.troops)
+    paths = {id(t): [] for t in troops}
+    for _ in range(ticks):
+        world.step(FIXED_DT)
+        for troop in troops:
+            paths[id(troop)].append((troop.x, troop.y))
+    return troops, paths
+
+
+def _crossed(troop, path, layout):
+    if troop.team == "player":
+        return any(y < layout.river_top for _, y in path)
+    return any(y > layout.river_bottom for _, y in path)
+
+
+@pytest.mark.parametrize("team", ["player", "ai"])
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_ground_troops_cross_only_on_the_bridges(team, fixed_point):
+    world = World(450, 750, fixed_point=fixed_point)
+    layout = world.navigation.layout
+    walkable = world.navigation.walkable
+    troops, paths = _march(world, team)
+    for troop in troops:
+        path = paths[id(troop)]
+        assert _crossed(troop, path, layout)
+        if not troop.is_flying:
+            assert all(walkable(x, y) for x, y in path)
+    # Flying troops still go straight over the water.
+    assert any(
+        not walkable(x, y) for troop in troops if troop.is_flying for x, y in paths[id(troop)]
+    )
+
+
+def test_without_navigation_ground_troops_wade_through():
+    world = World(450, 750)
+    world.navigation = None
+    walkable = navigator_for(450, 750 - HUD_HEIGHT).walkable
+    troops, paths = _march(world, "player")
+    assert any(
+        not walkable(x, y) for troop in troops if not troop.is_flying for x, y in paths[id(troop)]
+    )
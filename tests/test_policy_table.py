@@ -0,0 +1,69 @@
+# tests/test_policy_table.py
+
+import json
+
+import pytest
+
+from game.ai import policy_table
+from game.ai.policy import choose_ai_action
+from game.ai.policy_table import MAX_COUNT, DecisionTable, _fingerprint, compiled_policy, sample_states
+from game.ai.state import GameState, LaneView, TroopView
+from game.data.catalog import CARDS_FILE, TROOPS_FILE, get_catalog, parse_catalog
+from game.data.loader import DATA_DIR
+
+
+@pytest.fixture(scope="module")
+def states():
+    return sample_states(2)
+
+
+def _edited_catalog():
+    cards = json.loads((DATA_DIR / CARDS_FILE).read_bytes())
+    cards[0]["coins_cost"] += 1
+    return parse_catalog(json.dumps(cards).encode(), (DATA_DIR / TROOPS_FILE).read_bytes())
+
+
+def _lanes(troops=()):
+    return [LaneView(index=i, troops=[t for t in troops if t.lane_index == i]) for i in range(3)]
+
+
+def test_agrees_with_the_live_policy(states):
+    table = DecisionTable.compile(states[0].max_coins)
+    assert all(table.covers(state) for state in states)
+    differ = sum(table.choose(state) != choose_ai_action(state) for state in states)
+    # Only the sampled pressure term is inexact (see the module docstring).
+    assert differ <= len(states) // 50
+    assert table.lookups == len(states) and table.fallbacks == 0
+
+
+def test_survives_a_json_roundtrip(states):
+    table = compiled_policy()
+    copy = DecisionTable.from_json(json.loads(json.dumps(table.to_json())))
+    assert [copy.choose(s) for s in states] == [table.choose(s) for s in states]
+
+
+def test_fingerprint_follows_the_catalog_it_is_given():
+    assert _fingerprint(_edited_catalog()) != _fingerprint(get_catalog())
+
+
+@pytest.mark.parametrize("state", [
+    GameState(player_coins=8.0),  # no lane info
+    GameState(player_coins=8.0, max_coins=12.0, lanes=_lanes()),
+    GameState(player_coins=8.0, lanes=_lanes()[:2]),
+    GameState(player_coins=8.0, lanes=_lanes(
+        [TroopView(owner="player", lane_index=0, y=600.0, troop_id="0")] * (MAX_COUNT + 1)
+    )),
+])
+def test_falls_back_outside_its_coverage(state):
+    table = DecisionTable.compile(10.0)
+    assert table.choose(state) == choose_ai_action(state)
+    assert table.fallbacks == 1 and table.lookups == 0
+
+
+def test_falls_back_when_the_card_data_changes(monkeypatch):
+    table = DecisionTable.compile(10.0)
+    state = GameState(player_coins=8.0, lanes=_lanes())
+    assert table.covers(state)
+    edited = _edited_catalog()
+    monkeypatch.setattr(policy_table, "get_catalog", lambda: edited)
+    assert not table.covers(state)
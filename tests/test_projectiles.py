@@ -0,0 +1,98 @@
+# tests/test_projectiles.py
+
+import pytest
+
+from game.entities.troop import Troop
+from game.systems.projectiles import ProjectilePool
+
+PEACH, MARIO = 2, 0
+
+
+def _pair(fixed_point=False):
+    shooter = Troop(100, 100, "player", 1, PEACH, uid=1, fixed_point=fixed_point)
+    target = Troop(100, 400, "ai", 1, MARIO, uid=2, fixed_point=fixed_point)
+    return shooter, target
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_shot_lands_after_its_travel_time(fixed_point):
+    shooter, target = _pair(fixed_point)
+    pool = ProjectilePool(fixed_point=fixed_point)
+    pool.fire(shooter, target, damage=45.0, speed=10.0)
+    for _ in range(29):  # 300 px at 10 px per tick
+        pool.update([shooter, target])
+        assert target.hp == target.max_hp and pool.count == 1
+    pool.update([shooter, target])
+    assert target.hp == target.max_hp - 45.0
+    assert pool.count == 0 and pool.hits == 1
+
+
+def test_homing_shot_follows_a_moving_target():
+    shooter, target = _pair()
+    pool = ProjectilePool()
+    pool.fire(shooter, target, damage=45.0, speed=10.0, homing=True)
+    for _ in range(60):
+        target.x += 4.0
+        pool.update([shooter, target])
+        if not pool.count:
+            break
+    assert pool.count == 0
+    assert target.hp == target.max_hp - 45.0
+
+
+def test_fixed_shot_misses_a_target_that_moved_away():
+    shooter, target = _pair()
+    pool = ProjectilePool()
+    pool.fire(shooter, target, damage=45.0, speed=10.0, homing=False)
+    pool.update([shooter, target])
+    target.x += 3 * target.radius
+    for _ in range(40):
+        pool.update([shooter, target])
+    assert pool.count == 0 and pool.hits == 0
+    assert target.hp == target.max_hp
+
+
+def test_fixed_shot_hits_a_target_still_near_the_aim_point():
+    shooter, target = _pair()
+    pool = ProjectilePool()
+    pool.fire(shooter, target, damage=45.0, speed=10.0, homing=False)
+    target.x += target.radius / 2
+    for _ in range(40):
+        pool.update([shooter, target])
+    assert pool.hits == 1 and target.hp == target.max_hp - 45.0
+
+
+def test_shot_at_a_dead_target_flies_on_and_vanishes():
+    shooter, target = _pair()
+    bystander = Troop(100, 400, "ai", 1, MARIO, uid=3)
+    pool = ProjectilePool()
+    pool.fire(shooter, target, damage=45.0, speed=10.0)
+    for _ in range(10):
+        pool.update([shooter, target, bystander])
+    x, y = pool.view("x")[0], pool.view("y")[0]
+    target.hp = 0
+    target.x += 50.0  # a dead target is no longer followed
+    for _ in range(19):
+        pool.update([shooter, target, bystander])
+        assert pool.count == 1
+    assert (pool.view("tx")[0], pool.view("ty")[0]) == (100, 400)
+    assert pool.view("y")[0] > y and pool.view("x")[0] == x
+    pool.update([shooter, target, bystander])
+    assert pool.count == 0 and pool.hits == 0
+    assert bystander.hp == bystander.max_hp
+
+
+def test_pool_grows_past_its_capacity_in_firing_order():
+    shooter, target = _pair()
+    pool = ProjectilePool(capacity=4)
+    for damage in range(1, 11):
+        pool.fire(shooter, target, damage=float(damage), speed=1.0)
+    pool.update([shooter, target])
+    assert pool.count == 10 and pool.capacity >= 10
+    assert list(pool.view("damage")) == [float(d) for d in range(1, 11)]
+
+    # Loading more rows than fit grows the storage too.
+    rows = pool.rows() * 3
+    pool.load(rows)
+    assert pool.count == 30 and pool.capacity >= 30
+    assert pool.rows() == rows
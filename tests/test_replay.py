@@ -0,0 +1,97 @@
+# tests/test_replay.py
+
+import io
+import json
+import struct
+
+import pytest
+
+from game.core.actions import PlayCardAction
+from game.core.replay import Replay, ReplayDesyncError, ReplayError, ReplayPlayer, ReplayRecorder
+from game.core.savestate import state_hash
+from game.core.world import FIXED_DT, World
+
+
+def _record(ticks=1500):
+    world = World(450, 750)
+    recorder = ReplayRecorder(world, keyframe_seconds=5.0)
+    plays = {30: ("mario", 0), 200: ("bowser", 1), 420: ("dry_bones", 2)}
+    for _ in range(ticks):
+        if world._tick in plays:
+            card_id, lane = plays[world._tick]
+            world.apply_player_action(PlayCardAction(card_id, lane))
+        world.step(FIXED_DT)
+        if world.game_over:
+            break
+    return world, recorder.finish()
+
+
+def _roundtrip(replay):
+    buf = io.BytesIO()
+    replay.write(buf)
+    buf.seek(0)
+    return Replay.read(buf)
+
+
+def test_playback_reproduces_final_state():
+    world, replay = _record()
+    player = ReplayPlayer(_roundtrip(replay))
+    end = player.play_to_end()
+    assert end._tick == world._tick
+    assert state_hash(end) == state_hash(world)
+
+
+def test_seek_matches_linear_playback():
+    _, replay = _record()
+    linear = ReplayPlayer(replay)
+    linear.seek(400)
+    expected = state_hash(linear.world)
+
+    player = ReplayPlayer(replay)
+    player.seek(replay.end_tick)
+    player.seek(400)  # backwards: restores the keyframe at 300
+    assert state_hash(player.world) == expected
+
+
+def test_tampered_action_is_detected():
+    _, replay = _record()
+    first = next(a for a in replay.actions if not a.in_step)
+    replay.actions[replay.actions.index(first)] = type(first)(
+        first.tick, first.team, first.card_id, (first.lane_index + 1) % 3, first.in_step
+    )
+    with pytest.raises(ReplayDesyncError):
+        ReplayPlayer(replay).play_to_end()
+
+
+def _blob(replay):
+    buf = io.BytesIO()
+    replay.write(buf)
+    return buf.getvalue()
+
+
+def _with_header(blob, header_bytes):
+    magic, version, size = struct.unpack_from("<4sHI", blob)
+    return struct.pack("<4sHI", magic, version, len(header_bytes)) + header_bytes + blob[10 + size:]
+
+
+@pytest.mark.parametrize("header", [
+    b"{not json",
+    b"\xff\xfe",
+    b"[]",
+    json.dumps({"dt": 1 / 60}).encode(),
+    json.dumps({"screen_width": 450, "screen_height": 750, "dt": 1 / 60, "catalog": "", "cards": 3}).encode(),
+])
+def test_rejects_corrupt_header(header):
+    _, replay = _record(ticks=60)
+    with pytest.raises(ReplayError):
+        Replay.read(io.BytesIO(_with_header(_blob(replay), header)))
+
+
+def test_rejects_unknown_card_index():
+    _, replay = _record(ticks=60)
+    blob = bytearray(_blob(replay))
+    (size,) = struct.unpack_from("<I", blob, 6)
+    first_action = 10 + size + 4
+    blob[first_action + 5] = 250  # card index byte of the first action
+    with pytest.raises(ReplayError, match="unknown card"):
+        Replay.read(io.BytesIO(bytes(blob)))
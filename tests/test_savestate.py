@@ -0,0 +1,112 @@
+# tests/test_savestate.py
+
+import pytest
+
+from game.core import savestate
+from game.core.savestate import SaveStateError, dumps, loads, state_hash
+from game.core.scenarios import Scenario, build_world
+from game.core.world import FIXED_DT, World
+
+
+def test_roundtrip_continues_identically(mid_match):
+    world = mid_match()
+    copy = loads(dumps(world))
+    assert state_hash(copy) == state_hash(world)
+    assert any(t.current_target is not None for t in copy.troops)
+
+    for _ in range(600):
+        world.step(FIXED_DT)
+        copy.step(FIXED_DT)
+    assert dumps(copy) == dumps(world)
+
+
+def test_roundtrip_keeps_projectiles_in_flight(mid_match):
+    world = mid_match()
+    for _ in range(600):
+        if world.projectiles.count:
+            break
+        world.step(FIXED_DT)
+    assert world.projectiles.count
+
+    copy = loads(dumps(world))
+    assert copy.projectiles.rows() == world.projectiles.rows()
+    for _ in range(120):
+        world.step(FIXED_DT)
+        copy.step(FIXED_DT)
+    assert dumps(copy) == dumps(world)
+
+
+def test_loads_into_existing_world_keeps_hooks(mid_match):
+    world = mid_match()
+    target = World(450, 750)
+    target.ai_policy = None
+    assert loads(dumps(world), target) is target
+    assert target.ai_policy is None
+    assert target._tick == world._tick
+
+
+@pytest.mark.parametrize("damage", ["magic", "version", "truncated"])
+def test_rejects_bad_input(damage, mid_match):
+    blob = bytearray(dumps(mid_match()))
+    if damage == "magic":
+        blob[0:4] = b"XXXX"
+    elif damage == "version":
+        blob[4] = 99
+    else:
+        del blob[-3:]
+    with pytest.raises(SaveStateError):
+        loads(bytes(blob))
+
+
+def _repack(blob, layout, offset, field, value):
+    fields = list(layout.unpack_from(blob, offset))
+    fields[field] = value
+    blob = bytearray(blob)
+    layout.pack_into(blob, offset, *fields)
+    return bytes(blob)
+
+
+# _WORLD field positions: winner, player king index, ai king index
+@pytest.mark.parametrize("field, value", [(9, 3), (11, -1), (11, 99), (12, 99)])
+def test_rejects_corrupt_world_indices(field, value, mid_match):
+    blob = dumps(mid_match())
+    with pytest.raises(SaveStateError):
+        loads(_repack(blob, savestate._WORLD, savestate._HEADER.size, field, value))
+
+
+@pytest.mark.parametrize("value", [-2, 9999])
+def test_rejects_corrupt_target_index(value, mid_match):
+    blob = dumps(mid_match())
+    n_towers = savestate._WORLD.unpack_from(blob, savestate._HEADER.size)[13]
+    first_troop = savestate._HEADER.size + savestate._WORLD.size + n_towers * savestate._TOWER.size
+    with pytest.raises(SaveStateError):
+        loads(_repack(blob, savestate._TROOP, first_troop, 10, value))
+
+
+def test_roundtrip_keeps_locks_on_troops_that_just_died():
+    world = build_world(Scenario(units=80, layout="clustered", seed=11))
+    world.ai_policy = None
+    for _ in range(600):
+        world.step(FIXED_DT)
+        listed = {id(t) for t in world.troops + world.towers}
+        if any(t.current_target is not None and id(t.current_target) not in listed for t in world.troops):
+            break
+    else:
+        pytest.fail("no troop was locked onto a removed troop")
+
+    copy = loads(dumps(world))
+    copy.ai_policy = None
+    assert dumps(copy) == dumps(world)
+    for original, loaded in zip(world.troops, copy.troops):
+        target = original.current_target
+        if target is None:
+            assert loaded.current_target is None
+        else:
+            assert loaded.current_target.uid == target.uid
+            assert getattr(loaded.current_target, "dead", False) == getattr(target, "dead", False)
+    assert len(copy.troops) == len(world.troops)
+
+    for _ in range(120):
+        world.step(FIXED_DT)
+        copy.step(FIXED_DT)
+    assert dumps(copy) == dumps(world)
@@ -0,0 +1,63 @@
+# tests/test_separation.py
+
+import math
+
+import pytest
+
+from game.core.scenarios import Scenario, build_world
+from game.core.world import FIXED_DT, HUD_HEIGHT
+from game.entities.troop import Troop
+from game.systems.navigation import navigator_for
+from game.systems.spatial import SpatialHash, crowd_cell_size, separate, separate_fixed
+
+MARIO = 0
+WIDTH, HEIGHT = 450, 750 - HUD_HEIGHT
+
+
+def _bank_crowd():
+    # A tight pack on the bottom river bank, away from both bridges.
+    layout = navigator_for(WIDTH, HEIGHT).layout
+    y = layout.river_bottom + 2.0
+    return [Troop(200.0 + 3.0 * (i % 8), y + 3.0 * (i // 8), "player", 1, MARIO) for i in range(24)]
+
+
+def _run(separator, troops, walkable, ticks=60):
+    grid = SpatialHash(crowd_cell_size(max(t.radius for t in troops)))
+    for _ in range(ticks):
+        separator(troops, grid, WIDTH, HEIGHT, walkable)
+
+
+@pytest.mark.parametrize("separator", [separate, separate_fixed])
+def test_pushes_never_enter_the_river(separator):
+    walkable = navigator_for(WIDTH, HEIGHT).walkable
+    troops = _bank_crowd()
+    for _ in range(60):
+        _run(separator, troops, walkable, ticks=1)
+        assert all(walkable(t.x, t.y) for t in troops)
+
+
+def test_the_bank_crowd_would_otherwise_spill_into_the_river():
+    walkable = navigator_for(WIDTH, HEIGHT).walkable
+    troops = _bank_crowd()
+    _run(separate, troops, None)
+    assert not all(walkable(t.x, t.y) for t in troops)
+
+
+def test_stacked_troops_spread_out():
+    troops = [Troop(200.0, 500.0, "player", 1, MARIO) for _ in range(6)]
+    _run(separate, troops, None, ticks=120)
+    spacing = min(
+        math.hypot(a.x - b.x, a.y - b.y)
+        for i, a in enumerate(troops) for b in troops[i + 1:]
+    )
+    assert spacing > troops[0].radius
+
+
+@pytest.mark.parametrize("fixed_point", [False, True])
+def test_ground_troops_stay_on_walkable_ground_in_a_battle(fixed_point):
+    world = build_world(Scenario(units=120, layout="clustered", seed=5, fixed_point=fixed_point))
+    walkable = world.navigation.walkable
+    for _ in range(240):
+        world.step(FIXED_DT)
+        for troop in world.troops:
+            assert troop.is_flying or walkable(troop.x, troop.y)
@@ -0,0 +1,101 @@
+# tests/test_shared_state.py
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from game.core.world import FIXED_DT, World
+from game.net.shared_state import SharedStateReader, SharedStateWriter
+
+
+def _snapshot(frame):
+    n = frame.count
+    return frame.tick, list(frame.uid[:n]), list(frame.type[:n])
+
+
+def _run(code):
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+
+def test_reader_sees_published_ticks(mid_match):
+    world = mid_match(ticks=120)
+    writer = SharedStateWriter()
+    reader = SharedStateReader(writer.name)
+    try:
+        writer.publish(world)
+        tick, uids, types = reader.read(_snapshot)
+        assert tick == world._tick
+        assert uids == [e.uid for e in world.towers + world.troops]
+        assert types[-1] == world.troops[-1].stats_idx
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_read_retries_when_the_writer_laps_the_slot(mid_match):
+    world = mid_match(ticks=120)
+    writer = SharedStateWriter()
+    reader = SharedStateReader(writer.name)
+    calls = []
+
+    def read(frame):
+        calls.append(frame.tick)
+        if len(calls) == 1:
+            for _ in range(2):  # rewrites the slot being read
+                world.step(FIXED_DT)
+                writer.publish(world)
+        return frame.tick
+
+    try:
+        writer.publish(world)
+        assert reader.read(read) == world._tick
+        assert len(calls) == 2 and calls[0] == world._tick - 2
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_same_process_reader_leaves_the_writer_registration_alone():
+    result = _run(
+        """
+        from game.core.world import World
+        from game.net.shared_state import SharedStateReader, SharedStateWriter
+        writer = SharedStateWriter()
+        writer.publish(World(450, 750))
+        reader = SharedStateReader(writer.name)
+        reader.close()
+        writer.close()
+        """
+    )
+    assert "Traceback" not in result.stderr and "leaked" not in result.stderr
+
+
+def test_reader_in_another_process(mid_match):
+    world = mid_match(ticks=120)
+    writer = SharedStateWriter()
+    try:
+        writer.publish(world)
+        result = _run(
+            f"""
+            from game.net.shared_state import SharedStateReader
+            reader = SharedStateReader({writer.name!r})
+            print(reader.read(lambda f: (f.tick, f.count)))
+            reader.close()
+            """
+        )
+        assert result.stdout.strip() == str((world._tick, len(world.towers) + len(world.troops)))
+        assert "Traceback" not in result.stderr
+        # The reader exiting must not have unlinked the writer's block.
+        reader = SharedStateReader(writer.name)
+        reader.close()
+    finally:
+        writer.close()
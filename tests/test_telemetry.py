@@ -0,0 +1,62 @@
+# tests/test_telemetry.py
+
+import io
+import json
+
+import pytest
+
+from game.core.actions import PlayCardAction
+from game.core.world import FIXED_DT, World
+from game.systems.telemetry import (
+    KIND_NAMES,
+    BinaryEventWriter,
+    EventBus,
+    JsonlWriter,
+    read_events,
+)
+
+
+class _Trickle(io.RawIOBase):
+    """A pipe-like reader that returns at most `size` bytes per read."""
+
+    def __init__(self, data, size):
+        self._data = io.BytesIO(data)
+        self._size = size
+
+    def read(self, n=-1):
+        return self._data.read(self._size if n < 0 else min(n, self._size))
+
+
+def _record_match():
+    binary, text = io.BytesIO(), io.StringIO()
+    world = World(450, 750)
+    world.events = EventBus()
+    writers = [BinaryEventWriter(binary, batch_size=64), JsonlWriter(text, batch_size=64)]
+    for writer in writers:
+        world.events.subscribe(writer)
+    world.apply_player_action(PlayCardAction("bowser", 1))
+    world.apply_player_action(PlayCardAction("dry_bones", 0))
+    for _ in range(900):
+        world.step(FIXED_DT)
+    for writer in writers:
+        writer.close()
+    return binary.getvalue(), [json.loads(line) for line in text.getvalue().splitlines()]
+
+
+def test_writers_roundtrip_through_read_events():
+    data, lines = _record_match()
+    events = list(read_events(io.BytesIO(data)))
+    assert len(events) == len(lines) > 10
+    assert {KIND_NAMES[e.kind] for e in events} >= {"spawn", "attack", "target"}
+    for event, line in zip(events, lines):
+        assert (event.tick, KIND_NAMES[event.kind], event.source, event.target) == (
+            line["tick"], line["kind"], line["source"], line["target"]
+        )
+        assert event.value == pytest.approx(line["value"], rel=1e-6)  # stored as float32
+        assert (event.x, event.y) == pytest.approx((line["x"], line["y"]), rel=1e-6)
+
+
+@pytest.mark.parametrize("size", [1, 7, 100])
+def test_short_reads_lose_no_records(size):
+    data, _ = _record_match()
+    assert list(read_events(_Trickle(data, size))) == list(read_events(io.BytesIO(data)))
@@ -0,0 +1,31 @@
+# tests/test_timers.py
+
+import pytest
+
+from game.core.world import FIXED_DT, World
+from game.entities.troop import Troop
+
+BOWSER = 1
+
+
+@pytest.mark.parametrize("projectiles", [False, True])
+def test_king_tower_keeps_its_shot_cadence(projectiles):
+    # One shot, then max_cooldown idle ticks: the pre-timer-queue rhythm.
+    world = World(450, 750)
+    world.ai_policy = None
+    if not projectiles:
+        world.projectiles = None
+    king = world.ai_king_tower
+    cx, cy = king.get_center()
+    dummy = Troop(float(cx), float(cy + 60), "player", 1, BOWSER, uid=world._new_uid())
+    dummy.hp = dummy.max_hp = 1e9
+    dummy.speed = 0.0
+    world.player_troops.append(dummy)
+
+    shots = []
+    for _ in range(200):
+        world.step(FIXED_DT)
+        if king.ready_tick > world._tick and (not shots or shots[-1] != king.ready_tick):
+            shots.append(king.ready_tick)
+    assert len(shots) > 5
+    assert {b - a for a, b in zip(shots, shots[1:])} == {king.max_cooldown + 1}